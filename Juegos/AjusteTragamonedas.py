@@ -0,0 +1,129 @@
+import sys
+import os
+import time
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.Aleatorio import ServicioAleatorio
+from Juegos.AnalisisTragamonedas import analizar, analizar_lote
+from Juegos.TablaPremios import TABLA, guardar_tabla, ARCHIVO_PREMIOS
+from Juegos.Rodillos import RODILLOS, Rodillos, guardar_rodillos, ARCHIVO_RODILLOS
+
+POBLACION = 512         # candidatos por generación (se evalúan juntos con analizar_lote)
+PARADAS_MAXIMAS = 32    # paradas de un símbolo en una tira
+# Cuánto pesa cada desvío relativo en el puntaje (menor es mejor)
+PESO_RTP = 10.0
+PESO_ACIERTOS = 1.0
+PESO_DESVIACION = 1.0
+PESO_EXCESO = 100.0     # pasarse del premio máximo casi descarta al candidato
+
+
+class ResultadoAjuste:
+    """
+    Mejor configuración encontrada:
+      rodillos, tabla: listos para guardar_rodillos / guardar_tabla (o para MotorTragamonedas)
+      analisis:        AnalisisTragamonedas exacto de esa configuración
+      puntaje:         desvío ponderado respecto de los objetivos (0 = todos cumplidos)
+      evaluados:       candidatos analizados, en `duracion` segundos
+    """
+
+    def __init__(self, rodillos, tabla, analisis, puntaje, evaluados, duracion):
+        self.rodillos = rodillos
+        self.tabla = tabla
+        self.analisis = analisis
+        self.puntaje = puntaje
+        self.evaluados = evaluados
+        self.duracion = duracion
+
+
+def puntaje(lote, rtp, aciertos, premio_maximo, desviacion=None):
+    """Desvío de cada candidato de un AnalisisLote respecto de los objetivos (arreglo de largo K)"""
+    total = PESO_RTP * ((lote.rtp - rtp) / rtp) ** 2
+    total += PESO_ACIERTOS * ((lote.frecuencia_aciertos - aciertos) / aciertos) ** 2
+    total += PESO_EXCESO * (np.maximum(lote.premio_maximo - premio_maximo, 0) / premio_maximo) ** 2
+    if desviacion:
+        total += PESO_DESVIACION * ((np.sqrt(lote.varianza) - desviacion) / desviacion) ** 2
+    return total
+
+
+def ajustar(costo, rtp=0.95, aciertos=0.30, premio_maximo=500, desviacion=None, rodillos=RODILLOS,
+            tabla=TABLA, generaciones=200, poblacion=POBLACION, semilla=None, progreso=None):
+    """
+    Busca pesos de rodillos y montos de premios que se acerquen a:
+      rtp:           retorno al jugador (0.95 = la casa se queda con el 5%)
+      aciertos:      frecuencia de tiradas que pagan algo
+      premio_maximo: tope del mayor premio, en jugadas (exposición de la casa)
+      desviacion:    desviación del pago por tirada, en jugadas (volatilidad; None = libre)
+
+    Estrategia evolutiva sobre la configuración actual: cada generación
+    muta la mejor en `poblacion` candidatos y los evalúa juntos con el
+    análisis exacto (sin simular tiradas). Los montos se escalan para
+    caer en el RTP buscado (es lineal en los premios), se redondean a
+    décimos de la jugada y conservan el orden de la tabla: la regla que
+    más pagaba sigue siendo la que más paga.
+    """
+    inicio = time.perf_counter()
+    generador = ServicioAleatorio(semilla).generador()
+    paso = max(1, costo // 10)
+    mejores_pesos = np.array(rodillos.pesos, dtype=float)
+    mejores_premios = np.array([premio for _, premio in tabla.reglas], dtype=float)
+    orden = np.argsort(-mejores_premios, kind="stable")  # reglas de mayor a menor premio
+    mejor = puntaje(analizar_lote(costo, mejores_pesos[None], mejores_premios[None], tabla),
+                    rtp, aciertos, premio_maximo, desviacion)[0]
+    sigma = 0.3
+    evaluados = 1
+    for generacion in range(generaciones):
+        ruido = np.exp(sigma * generador.standard_normal((poblacion,) + mejores_pesos.shape))
+        pesos = np.clip(np.rint(mejores_pesos * ruido), 1, PARADAS_MAXIMAS)
+        premios = mejores_premios * np.exp(sigma * generador.standard_normal((poblacion, len(mejores_premios))))
+        # Mismo orden que la tabla original: el mayor monto a la regla que más pagaba, y así
+        premios[:, orden] = -np.sort(-premios, axis=1)
+        premios *= (rtp / analizar_lote(costo, pesos, premios, tabla).rtp)[:, None]
+        premios = np.maximum(paso, np.rint(premios / paso) * paso)
+        puntajes = puntaje(analizar_lote(costo, pesos, premios, tabla), rtp, aciertos, premio_maximo, desviacion)
+        evaluados += poblacion
+        i = int(np.argmin(puntajes))
+        if puntajes[i] < mejor:
+            mejor, mejores_pesos, mejores_premios = puntajes[i], pesos[i], premios[i]
+            sigma = min(sigma * 1.2, 1.0)
+        else:
+            sigma = max(sigma * 0.95, 0.02)
+        if progreso:
+            progreso(generacion + 1, generaciones, mejor)
+
+    nuevos_rodillos = Rodillos([{s: int(p) for s, p in zip(rodillos.simbolos, fila)} for fila in mejores_pesos],
+                               rodillos.simbolos)
+    nueva_tabla = tabla.con_premios(mejores_premios)
+    return ResultadoAjuste(nuevos_rodillos, nueva_tabla, analizar(costo, nuevos_rodillos.pesos, nueva_tabla),
+                           float(mejor), evaluados, time.perf_counter() - inicio)
+
+
+def main():
+    # Uso: python Juegos/AjusteTragamonedas.py [rtp] [aciertos] [premio_maximo] [generaciones] [semilla|-] [guardar]
+    from Juegos.Motor import COSTO_JUGADA
+    argumentos = [a for a in sys.argv[1:] if a != "guardar"]
+    rtp = float(argumentos[0]) if len(argumentos) > 0 else 0.95
+    aciertos = float(argumentos[1]) if len(argumentos) > 1 else 0.30
+    premio_maximo = float(argumentos[2]) if len(argumentos) > 2 else 500
+    generaciones = int(argumentos[3]) if len(argumentos) > 3 else 200
+    semilla = int(argumentos[4]) if len(argumentos) > 4 and argumentos[4] != "-" else None
+
+    print(f"🎯 Objetivo: RTP {rtp:.2%}, aciertos {aciertos:.2%}, premio máximo {premio_maximo:g} jugadas\n")
+    print(f"Actual:\n{analizar(COSTO_JUGADA, RODILLOS.pesos)}\n")
+    resultado = ajustar(COSTO_JUGADA, rtp, aciertos, premio_maximo, generaciones=generaciones, semilla=semilla)
+    print(f"⚡ {resultado.evaluados:,} candidatos en {resultado.duracion:.2f} s "
+          f"({resultado.evaluados / resultado.duracion:,.0f} por segundo), puntaje {resultado.puntaje:.6f}\n")
+    print(f"Ajustado:\n{resultado.analisis}\n")
+    for numero, pesos in enumerate(resultado.rodillos.pesos):
+        tira = "  ".join(f"{s}×{p}" for s, p in zip(resultado.rodillos.simbolos, pesos))
+        print(f"Rodillo {numero + 1} ({sum(pesos)} paradas): {tira}")
+
+    if "guardar" in sys.argv[1:]:
+        guardar_rodillos(resultado.rodillos)
+        guardar_tabla(resultado.tabla)
+        print(f"\n💾 Guardado en {ARCHIVO_RODILLOS} y {ARCHIVO_PREMIOS}")
+    else:
+        print("\n(agrega 'guardar' para que el juego use esta configuración)")
+
+
+if __name__ == "__main__":
+    main()
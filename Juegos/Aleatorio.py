@@ -0,0 +1,70 @@
+import os
+import random
+import threading
+import numpy as np
+
+# Si está definida, todas las mesas, sesiones y simulaciones salen de esta semilla (partidas reproducibles)
+VARIABLE_SEMILLA = "CASINO_SEMILLA"
+
+
+def random_desde(semilla):
+    """random.Random alimentado por una SeedSequence (256 bits de su estado)"""
+    return random.Random(int.from_bytes(semilla.generate_state(8).tobytes(), "little"))
+
+
+class ServicioAleatorio:
+    """
+    Reparte generadores independientes a partir de una sola semilla:
+    cada mesa, sesión o trabajador recibe un hijo de la SeedSequence
+    raíz (SeedSequence.spawn), así que sus números no se solapan ni
+    dependen del orden en que los demás los consumen.
+
+    Con la misma semilla, el n-ésimo flujo que se pide siempre es el mismo.
+    Sin semilla se usa entropía del sistema; `entropia` permite repetir la corrida.
+    """
+
+    def __init__(self, semilla=None):
+        self.raiz = semilla if isinstance(semilla, np.random.SeedSequence) else np.random.SeedSequence(semilla)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # El lock no se puede copiar a otro proceso: allá se crea uno nuevo
+        return {"raiz": self.raiz}
+
+    def __setstate__(self, estado):
+        self.raiz = estado["raiz"]
+        self._lock = threading.Lock()
+
+    @property
+    def entropia(self):
+        return self.raiz.entropy
+
+    def semillas(self, cantidad):
+        """`cantidad` SeedSequence hijas (p. ej. una por trabajador o por trozo de simulación)"""
+        with self._lock:
+            return self.raiz.spawn(cantidad)
+
+    def random(self):
+        """Flujo nuevo como random.Random (shuffle, choice...) para el zapato o los rodillos"""
+        return random_desde(self.semillas(1)[0])
+
+    def generador(self):
+        """Flujo nuevo como numpy.random.Generator para simulaciones vectorizadas"""
+        return np.random.default_rng(self.semillas(1)[0])
+
+
+def _semilla_entorno():
+    valor = os.environ.get(VARIABLE_SEMILLA, "").strip()
+    return int(valor) if valor else None
+
+
+# Servicio del proceso: las mesas y sesiones piden su flujo aquí
+servicio = ServicioAleatorio(_semilla_entorno())
+
+
+def nuevo_random():
+    return servicio.random()
+
+
+def nuevo_generador():
+    return servicio.generador()
@@ -0,0 +1,131 @@
+import math
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.TablaPremios import TABLA, SIN_REGLA
+
+
+class AporteRegla:
+    """Cuánto paga una regla de la tabla: probabilidad de que sea la que paga y su parte del RTP"""
+    __slots__ = ("regla", "premio", "probabilidad", "rtp")
+
+    def __init__(self, regla, premio, probabilidad, rtp):
+        self.regla = regla
+        self.premio = premio
+        self.probabilidad = probabilidad
+        self.rtp = rtp
+
+
+class AnalisisTragamonedas:
+    """
+    Resultado exacto de una tabla de premios con unos rodillos (por unidad apostada):
+      rtp:                 retorno al jugador = premio esperado / costo de la jugada
+      frecuencia_aciertos: probabilidad de que una tirada pague algo
+      varianza, desviacion: del pago de una tirada (en unidades del costo)
+      premio_maximo:       mayor premio posible (en unidades del costo) y su probabilidad
+      por_regla:           AporteRegla de cada regla, en el orden de la tabla
+    """
+
+    def __init__(self, costo, rtp, frecuencia_aciertos, varianza, premio_maximo, probabilidad_maximo, por_regla):
+        self.costo = costo
+        self.rtp = rtp
+        self.frecuencia_aciertos = frecuencia_aciertos
+        self.varianza = varianza
+        self.desviacion = math.sqrt(varianza)
+        self.premio_maximo = premio_maximo
+        self.probabilidad_maximo = probabilidad_maximo
+        self.por_regla = por_regla
+
+    def __str__(self):
+        aciertos = f"1 de cada {1 / self.frecuencia_aciertos:.1f}" if self.frecuencia_aciertos else "nunca"
+        lineas = [
+            f"Costo por jugada: ${self.costo:,}",
+            f"RTP (retorno al jugador): {self.rtp:.2%}  (ventaja de la casa {1 - self.rtp:+.2%})",
+            f"Frecuencia de aciertos: {self.frecuencia_aciertos:.2%}  ({aciertos} tiradas)",
+            f"Varianza por tirada: {self.varianza:.3f}  (desviación {self.desviacion:.3f} jugadas)",
+            f"Premio máximo: {self.premio_maximo:g}x la jugada, probabilidad {self.probabilidad_maximo:.4%}",
+            "",
+            f"{'REGLA':<18}{'PREMIO':>9}{'PROBABILIDAD':>14}{'RTP':>9}",
+        ]
+        for aporte in self.por_regla:
+            lineas.append(f"{' | '.join(aporte.regla):<18}{aporte.premio:>9,}{aporte.probabilidad:>14.4%}"
+                          f"{aporte.rtp:>9.2%}")
+        return "\n".join(lineas)
+
+
+def probabilidades_combinaciones(pesos, simbolos):
+    """
+    Probabilidad de cada combinación en el orden del arreglo de TablaPremios.
+    `pesos` es una lista de 3 secuencias (un peso por símbolo en cada rodillo);
+    None = rodillos uniformes.
+    """
+    n = len(simbolos)
+    if pesos is None:
+        return np.full(n ** 3, 1 / n ** 3)
+    rodillos = [np.asarray(p, dtype=float) for p in pesos]
+    if len(rodillos) != 3 or any(r.shape != (n,) for r in rodillos):
+        raise ValueError(f"Se necesitan 3 rodillos con {n} pesos cada uno")
+    if any((r < 0).any() or r.sum() <= 0 for r in rodillos):
+        raise ValueError("Los pesos deben ser no negativos y sumar más que 0")
+    a, b, c = (r / r.sum() for r in rodillos)
+    # La posición (a*n + b)*n + c del arreglo es justo el producto exterior aplanado
+    return np.multiply.outer(np.multiply.outer(a, b), c).ravel()
+
+
+def analizar(costo, pesos=None, tabla=TABLA):
+    """Enumera todas las combinaciones de los rodillos con su probabilidad y resume la tabla"""
+    probabilidad = probabilidades_combinaciones(pesos, tabla.simbolos)
+    pago = np.asarray(tabla.premios, dtype=float) / costo
+    rtp = float(probabilidad @ pago)
+    varianza = float(probabilidad @ pago ** 2) - rtp ** 2
+    maximo = pago.max()
+    # Probabilidad y aporte de cada regla (la posición 0 junta las combinaciones sin premio)
+    regla_de = np.asarray(tabla.regla_de) - SIN_REGLA
+    por_probabilidad = np.bincount(regla_de, weights=probabilidad, minlength=len(tabla.reglas) + 1)
+    por_rtp = np.bincount(regla_de, weights=probabilidad * pago, minlength=len(tabla.reglas) + 1)
+    por_regla = [AporteRegla(regla, premio, float(por_probabilidad[i + 1]), float(por_rtp[i + 1]))
+                 for i, (regla, premio) in enumerate(tabla.reglas)]
+    return AnalisisTragamonedas(costo, rtp, float(probabilidad[pago > 0].sum()), max(varianza, 0.0),
+                                float(maximo), float(probabilidad[pago == maximo].sum()), por_regla)
+
+
+class AnalisisLote:
+    """Lo mismo que AnalisisTragamonedas para K configuraciones a la vez: arreglos de largo K"""
+    __slots__ = ("rtp", "frecuencia_aciertos", "varianza", "premio_maximo")
+
+    def __init__(self, rtp, frecuencia_aciertos, varianza, premio_maximo):
+        self.rtp = rtp
+        self.frecuencia_aciertos = frecuencia_aciertos
+        self.varianza = varianza
+        self.premio_maximo = premio_maximo
+
+
+def analizar_lote(costo, pesos, premios, tabla=TABLA):
+    """
+    Analiza K configuraciones juntas, sin recorrerlas en Python:
+      pesos:   arreglo (K, 3, n) con los pesos de cada rodillo
+      premios: arreglo (K, reglas) con el monto de cada regla de `tabla`
+    Las reglas y su prioridad son las de `tabla`; solo cambian los montos.
+    """
+    pesos = np.asarray(pesos, dtype=float)
+    probabilidad_rodillo = pesos / pesos.sum(axis=2, keepdims=True)
+    a, b, c = probabilidad_rodillo[:, 0], probabilidad_rodillo[:, 1], probabilidad_rodillo[:, 2]
+    # (K, n, n, n) aplanado en el orden del arreglo de la tabla, como en probabilidades_combinaciones
+    probabilidad = (a[:, :, None, None] * b[:, None, :, None] * c[:, None, None, :]).reshape(len(pesos), -1)
+    # Columna extra en 0 para las combinaciones sin regla
+    montos = np.concatenate([np.asarray(premios, dtype=float), np.zeros((len(pesos), 1))], axis=1) / costo
+    regla_de = np.asarray(tabla.regla_de)
+    pago = montos[:, np.where(regla_de == SIN_REGLA, len(tabla.reglas), regla_de)]
+    rtp = (probabilidad * pago).sum(axis=1)
+    varianza = np.maximum((probabilidad * pago ** 2).sum(axis=1) - rtp ** 2, 0.0)
+    aciertos = (probabilidad * (pago > 0)).sum(axis=1)
+    return AnalisisLote(rtp, aciertos, varianza, pago.max(axis=1))
+
+
+if __name__ == "__main__":
+    from Juegos.Motor import COSTO_JUGADA
+    # Uso: python Juegos/AnalisisTragamonedas.py [costo_jugada]
+    costo = float(sys.argv[1]) if len(sys.argv) > 1 else COSTO_JUGADA
+    print("🎰 Análisis exacto del tragamonedas (rodillos uniformes)\n")
+    print(analizar(costo))
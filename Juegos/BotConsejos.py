@@ -1,9 +1,57 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from controller.jugador_controller import buscar_jugador, cargar_jugadores, guardar_jugadores
+from controller.jugador_controller import buscar_jugador, registrar_eventos, vaciar_pendientes
+from model.evento import Evento, SIMULACION, GANA, PIERDE, EMPATE
+from Juegos.EstrategiaBasica import ARCHIVO_ESTRATEGIA, PEDIR, leer_tabla, decision
 import copy
 
+
+class AsesorBlackjack:
+    """
+    Consejos de Blackjack (pedir o plantarse) con la estrategia básica
+    precalculada por Juegos/EstrategiaBasica.py. La tabla se lee del archivo
+    recién en la primera consulta y después cada consejo es una consulta O(1).
+    """
+
+    def __init__(self, archivo=ARCHIVO_ESTRATEGIA):
+        self.archivo = archivo
+        self.mazos = None
+        self._bits = None
+        self._cargada = False
+
+    def _cargar(self):
+        self._cargada = True
+        try:
+            self.mazos, self._bits = leer_tabla(self.archivo)
+        except (OSError, ValueError):
+            # Sin tabla no hay consejos; se genera con: python Juegos/EstrategiaBasica.py
+            self._bits = None
+
+    @property
+    def disponible(self):
+        if not self._cargada:
+            self._cargar()
+        return self._bits is not None
+
+    def aconsejar(self, puntaje, suave, carta_visible):
+        """PEDIR o PLANTARSE para la mano (puntaje, si es suave) contra la carta visible (valor 2-11)"""
+        if not self.disponible:
+            return None
+        return decision(self._bits, puntaje, suave, carta_visible)
+
+
+asesor_blackjack = AsesorBlackjack()
+
+
+def consejo_blackjack(mano, carta_visible):
+    """Texto del consejo para una Mano contra la carta visible del dealer, o None si no hay tabla"""
+    accion = asesor_blackjack.aconsejar(mano.puntaje, mano.es_suave, carta_visible)
+    if accion is None:
+        return None
+    return "pedir carta (h)" if accion == PEDIR else "plantarte (s)"
+
+
 class OptimizadorApuestas:
     """
     Clase que implementa backtracking para encontrar la mejor estrategia de apuestas
@@ -260,6 +308,7 @@ class OptimizadorApuestas:
         
         saldo_simulado = jugador.saldo_actual
         ganancia_total = 0
+        eventos = []
         
         print(f"\n🎯 Simulando estrategia óptima...")
         print("-" * 60)
@@ -283,7 +332,8 @@ class OptimizadorApuestas:
             print(f"💳 Nuevo saldo: ${saldo_simulado}")
             
             # Registrar en el historial del jugador
-            jugador.agregar_historial(f"[SIMULACIÓN] {nombre}: ${ganancia_teorica}")
+            resultado = GANA if ganancia_teorica > 0 else PIERDE if ganancia_teorica < 0 else EMPATE
+            eventos.append(Evento(SIMULACION, costo, costo + ganancia_teorica, resultado, nombre))
         
         print(f"\n🏁 SIMULACIÓN COMPLETADA")
         print(f"💰 Ganancia total simulada: ${ganancia_total}")
@@ -293,16 +343,9 @@ class OptimizadorApuestas:
         # En un casino real, esto se haría después de cada juego real
         actualizar = input("\n¿Actualizar el saldo del jugador con esta simulación? (s/n): ").lower().strip()
         if actualizar in ['s', 'si', 'yes', 'y']:
-            jugador.saldo_actual = saldo_simulado
-            jugador.agregar_historial(f"Simulación de estrategia optimizada completada")
-            
             # Guardar cambios
-            jugadores = cargar_jugadores()
-            for i, j in enumerate(jugadores):
-                if j.id == jugador.id:
-                    jugadores[i] = jugador
-                    break
-            guardar_jugadores(jugadores)
+            registrar_eventos(jugador.id, eventos)
+            vaciar_pendientes()
             print("✅ Saldo actualizado exitosamente.")
 
 def menu_optimizador():
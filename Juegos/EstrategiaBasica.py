@@ -0,0 +1,113 @@
+import sys
+import os
+import struct
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.Zapato import MAZOS_POR_ZAPATO
+from Juegos.ProbabilidadesBlackjack import VALORES_CLASE, composicion_inicial, quitar, evs_mano
+
+# Tabla de estrategia básica (pedir o plantarse) precalculada para las reglas de la mesa.
+# Se genera una vez con:  python Juegos/EstrategiaBasica.py [mazos]
+ARCHIVO_ESTRATEGIA = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data",
+                                                  "estrategia_blackjack.dat"))
+
+# Formato: cabecera (firma, mazos) y un bit por celda (1 = pedir), fila por fila
+MAGIA = b"EBJ1"
+CABECERA = struct.Struct("<4sB")
+DUROS = range(4, 22)    # puntajes duros posibles (4 = dos 2)
+SUAVES = range(12, 22)  # puntajes suaves posibles (12 = dos ases)
+COLUMNAS = len(VALORES_CLASE)  # carta visible del dealer: 2..10 y As (11)
+CELDAS = (len(DUROS) + len(SUAVES)) * COLUMNAS
+
+PEDIR = "pedir"
+PLANTARSE = "plantarse"
+
+
+def celda(puntaje, suave, carta_visible):
+    """Posición de la decisión en la tabla (fila del puntaje, columna de la carta visible)"""
+    fila = len(DUROS) + puntaje - SUAVES.start if suave else puntaje - DUROS.start
+    return fila * COLUMNAS + carta_visible - VALORES_CLASE[0]
+
+
+def mano_representativa(puntaje, suave):
+    """Dos cartas (valores) que suman ese puntaje; la estrategia se decide con esa mano"""
+    if suave:
+        return [11, puntaje - 11] if puntaje > 12 else [11, 11]
+    segunda = min(puntaje - 2, 10)
+    return [puntaje - segunda, segunda]
+
+
+def construir_tabla(mazos=MAZOS_POR_ZAPATO, progreso=None):
+    """
+    Decide pedir o plantarse en cada celda con las ganancias esperadas exactas
+    de Juegos/ProbabilidadesBlackjack.py, sacando del zapato completo la mano
+    representativa y la carta visible. Devuelve los bits de la tabla.
+    """
+    zapato = composicion_inicial(mazos)
+    bits = bytearray((CELDAS + 7) // 8)
+    # Primero los puntajes altos: sus cálculos quedan en la caché y los bajos los reutilizan
+    filas = [(p, True) for p in reversed(SUAVES)] + [(p, False) for p in reversed(DUROS)]
+    for puntaje, suave in filas:
+        if puntaje == 21:
+            continue  # con 21 siempre conviene plantarse
+        mano = mano_representativa(puntaje, suave)
+        resto = zapato
+        for valor in mano:
+            resto = quitar(resto, VALORES_CLASE.index(valor))
+        for clase, visible in enumerate(VALORES_CLASE):
+            plantarse, pedir = evs_mano(mano, visible, quitar(resto, clase))
+            if pedir > plantarse:
+                i = celda(puntaje, suave, visible)
+                bits[i >> 3] |= 1 << (i & 7)
+        if progreso:
+            progreso(puntaje, suave)
+    return bytes(bits)
+
+
+def guardar_tabla(bits, mazos=MAZOS_POR_ZAPATO, archivo=ARCHIVO_ESTRATEGIA):
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    temporal = archivo + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, mazos))
+        f.write(bits)
+    os.replace(temporal, archivo)
+
+
+def leer_tabla(archivo=ARCHIVO_ESTRATEGIA):
+    """Devuelve (mazos, bits) de una tabla guardada con guardar_tabla"""
+    with open(archivo, "rb") as f:
+        contenido = f.read()
+    magia, mazos = CABECERA.unpack_from(contenido)
+    bits = contenido[CABECERA.size:]
+    if magia != MAGIA or len(bits) != (CELDAS + 7) // 8:
+        raise ValueError(f"{archivo} no es una tabla de estrategia válida")
+    return mazos, bits
+
+
+def decision(bits, puntaje, suave, carta_visible):
+    """Consulta O(1) de una tabla de bits: PEDIR o PLANTARSE"""
+    if puntaje >= 21:
+        return PLANTARSE
+    i = celda(puntaje, suave, carta_visible)
+    return PEDIR if bits[i >> 3] >> (i & 7) & 1 else PLANTARSE
+
+
+def mostrar_tabla(bits):
+    print(f"{'':<8}" + "".join(f"{'A' if v == 11 else v:>4}" for v in VALORES_CLASE))
+    for suave, puntajes in ((False, DUROS), (True, SUAVES)):
+        for puntaje in puntajes:
+            fila = "".join(f"{'P' if decision(bits, puntaje, suave, v) == PEDIR else '-':>4}"
+                           for v in VALORES_CLASE)
+            print(f"{('S' if suave else 'D') + str(puntaje):<8}{fila}")
+    print("\nP = pedir, - = plantarse, D = duro, S = suave")
+
+
+if __name__ == "__main__":
+    mazos = int(sys.argv[1]) if len(sys.argv) > 1 else MAZOS_POR_ZAPATO
+    print(f"🧮 Calculando la estrategia básica para un zapato de {mazos} mazos...")
+    inicio = time.perf_counter()
+    bits = construir_tabla(mazos, lambda p, s: print(f"   {'suave' if s else 'duro'} {p} listo "
+                                                      f"({time.perf_counter() - inicio:.0f} s)"))
+    guardar_tabla(bits, mazos)
+    print(f"\n💾 Tabla guardada en {ARCHIVO_ESTRATEGIA} ({CABECERA.size + len(bits)} bytes)\n")
+    mostrar_tabla(bits)
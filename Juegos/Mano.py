@@ -0,0 +1,66 @@
+from Juegos.Zapato import VALORES
+
+VALOR_AS = 11
+
+
+def valor_duro(valor):
+    """Valor de una carta contando el As como 1 (sirve para enteros y arreglos de NumPy)"""
+    return valor - 10 * (valor == VALOR_AS)
+
+
+def puntaje(total_duro, ases):
+    """
+    Puntaje de una mano a partir de su total duro (ases como 1) y de si tiene
+    ases: un As vale 11 si así no se pasa de 21 (dos ases nunca pueden valer 11).
+    Da lo mismo que el cálculo recursivo anterior y, como no tiene ramas,
+    sirve igual para enteros que para arreglos de NumPy.
+    """
+    return total_duro + 10 * ((ases > 0) & (total_duro <= 11))
+
+
+class Mano:
+    """
+    Mano de Blackjack con el puntaje calculado al vuelo: cada carta que se
+    agrega actualiza el total duro y la cantidad de ases en O(1), y el
+    puntaje queda guardado, así que consultarlo no recorre la mano.
+    Las cartas son códigos de rango (ver Juegos/Zapato.py).
+    """
+    __slots__ = ("cartas", "total_duro", "ases", "puntaje")
+
+    def __init__(self, cartas=()):
+        self.cartas = []
+        self.total_duro = 0
+        self.ases = 0
+        self.puntaje = 0
+        for carta in cartas:
+            self.agregar(carta)
+
+    def agregar(self, carta):
+        valor = VALORES[carta]
+        self.cartas.append(carta)
+        self.total_duro += valor_duro(valor)
+        self.ases += valor == VALOR_AS
+        self.puntaje = puntaje(self.total_duro, self.ases)
+
+    @property
+    def es_suave(self):
+        """Hay un As contando 11 (la mano no se puede pasar con la próxima carta)"""
+        return self.puntaje != self.total_duro
+
+    @property
+    def es_blackjack(self):
+        """21 con las dos primeras cartas"""
+        return self.puntaje == 21 and len(self.cartas) == 2
+
+    @property
+    def se_paso(self):
+        return self.puntaje > 21
+
+    def __len__(self):
+        return len(self.cartas)
+
+    def __iter__(self):
+        return iter(self.cartas)
+
+    def __getitem__(self, indice):
+        return self.cartas[indice]
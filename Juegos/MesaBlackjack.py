@@ -0,0 +1,190 @@
+import asyncio
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from controller.jugador_controller import buscar_jugador, saldo_jugador, registrar_eventos_lote, vaciar_pendientes
+from Juegos.Mano import Mano
+from Juegos.Zapato import Zapato, VALORES
+from Juegos.Motor import ErrorJuego, liquidar_mano
+from Juegos.EstrategiaBasica import PEDIR, PLANTARSE
+from Juegos.BotConsejos import asesor_blackjack
+
+ASIENTOS = 7
+TIEMPO_LIMITE = 30.0  # segundos que tiene cada asiento para decidir; después se planta solo
+
+
+class Asiento:
+    """
+    Un lugar en la mesa. `decisor` es una corrutina decisor(mesa, asiento)
+    que devuelve PEDIR o PLANTARSE (un cliente de red, un bot, la consola...).
+    """
+    __slots__ = ("numero", "jugador", "decisor", "apuesta", "mano", "vencido")
+
+    def __init__(self, numero, jugador, decisor):
+        self.numero = numero
+        self.jugador = jugador
+        self.decisor = decisor
+        self.apuesta = 0
+        self.mano = Mano()
+        self.vencido = False  # se le acabó el tiempo (o falló su decisor) en esta ronda
+
+
+class ResultadoAsiento:
+    """Liquidación de un asiento en una ronda"""
+    __slots__ = ("numero", "id_jugador", "evento", "saldo", "vencido")
+
+    def __init__(self, numero, id_jugador, evento, saldo, vencido):
+        self.numero = numero
+        self.id_jugador = id_jugador
+        self.evento = evento
+        self.saldo = saldo
+        self.vencido = vencido
+
+
+class ResultadoRonda:
+    """
+    Lo que pasó en una ronda:
+      asientos:    ResultadoAsiento de cada asiento que jugó
+      omitidos:    {número de asiento: motivo} de los que no pudieron apostar
+      mano_dealer: mano final del dealer
+      barajado:    el zapato se barajó antes de repartir
+    """
+    __slots__ = ("asientos", "omitidos", "mano_dealer", "barajado")
+
+    def __init__(self, asientos, omitidos, mano_dealer, barajado):
+        self.asientos = asientos
+        self.omitidos = omitidos
+        self.mano_dealer = mano_dealer
+        self.barajado = barajado
+
+
+class MesaBlackjack:
+    """
+    Mesa de Blackjack de hasta `asientos` jugadores que comparten zapato y
+    mano del dealer. En cada ronda los asientos deciden a la vez (asyncio):
+    un asiento lento no frena a los demás y, si no decide dentro de
+    `tiempo_limite` segundos (o su decisor falla), se planta. Las reglas y los pagos son los de
+    MotorBlackjack (liquidar_mano).
+
+    Al final de la ronda todos los asientos se liquidan juntos: se suman a
+    la tabla de saldos y se guardan con una sola escritura al almacenamiento.
+    """
+
+    def __init__(self, asientos=ASIENTOS, zapato=None, tiempo_limite=TIEMPO_LIMITE):
+        self.cantidad_asientos = asientos
+        self.zapato = zapato or Zapato()
+        self.tiempo_limite = tiempo_limite
+        self.asientos = {}  # número -> Asiento
+        self.mano_dealer = Mano()
+
+    @property
+    def carta_visible(self):
+        """Código de la carta visible del dealer (la segunda; la primera va oculta)"""
+        return self.mano_dealer[1]
+
+    def sentar(self, numero, id_jugador, decisor):
+        if not 1 <= numero <= self.cantidad_asientos:
+            raise ErrorJuego(f"La mesa tiene asientos del 1 al {self.cantidad_asientos}.")
+        if numero in self.asientos:
+            raise ErrorJuego(f"El asiento {numero} está ocupado.")
+        jugador = buscar_jugador(id_jugador)
+        if jugador is None:
+            raise ErrorJuego("Jugador no encontrado.")
+        self.asientos[numero] = Asiento(numero, jugador, decisor)
+        return self.asientos[numero]
+
+    def levantar(self, numero):
+        return self.asientos.pop(numero, None) is not None
+
+    def _repartir(self, mano):
+        mano.agregar(self.zapato.repartir())
+
+    async def _turno(self, asiento):
+        """Pide decisiones al asiento hasta que se planta, se pasa o se le acaba el tiempo"""
+        while not asiento.mano.es_blackjack and asiento.mano.puntaje < 21:
+            try:
+                accion = await asyncio.wait_for(asiento.decisor(self, asiento), self.tiempo_limite)
+            except Exception:
+                # Se le acabó el tiempo o su decisor falló (un cliente que se desconectó...): se planta,
+                # y la ronda sigue para los demás y se liquida con lo apostado
+                asiento.vencido = True
+                return
+            if accion != PEDIR:
+                return
+            # Entre el await y esta carta no hay otro await: el zapato no se reparte a medias
+            self._repartir(asiento.mano)
+
+    async def jugar_ronda(self, apuestas):
+        """
+        Juega una ronda con {número de asiento: apuesta} y devuelve un ResultadoRonda.
+        Los asientos sin saldo suficiente quedan en `omitidos` y no reciben cartas.
+        """
+        omitidos = {}
+        jugando = []
+        comprometido = {}  # lo ya apostado por cada jugador en esta ronda (puede ocupar varios asientos)
+        for numero, apuesta in sorted(apuestas.items()):
+            asiento = self.asientos.get(numero)
+            if asiento is None:
+                omitidos[numero] = "Asiento vacío."
+                continue
+            id = asiento.jugador.id
+            saldo = saldo_jugador(id)
+            if saldo is not None:
+                saldo -= comprometido.get(id, 0)
+            if apuesta <= 0:
+                omitidos[numero] = "La apuesta debe ser mayor a $0"
+            elif saldo is None:
+                omitidos[numero] = "Jugador no encontrado."
+            elif saldo < apuesta:
+                omitidos[numero] = f"Saldo insuficiente. Saldo actual: ${saldo}"
+            else:
+                comprometido[id] = comprometido.get(id, 0) + apuesta
+                asiento.apuesta = apuesta
+                asiento.mano = Mano()
+                asiento.vencido = False
+                jugando.append(asiento)
+        if not jugando:
+            return ResultadoRonda([], omitidos, self.mano_dealer, False)
+
+        barajado = self.zapato.necesita_barajar
+        if barajado:
+            self.zapato.barajar()
+        # Una carta a cada asiento y al dealer (oculta), y otra vuelta (la del dealer, visible)
+        self.mano_dealer = Mano()
+        for _ in range(2):
+            for asiento in jugando:
+                self._repartir(asiento.mano)
+            self._repartir(self.mano_dealer)
+
+        await asyncio.gather(*(self._turno(asiento) for asiento in jugando))
+
+        # El dealer juega si queda algún asiento plantado (sin pasarse ni Blackjack)
+        if any(not a.mano.se_paso and not a.mano.es_blackjack for a in jugando):
+            while self.mano_dealer.puntaje < 17:
+                self._repartir(self.mano_dealer)
+        return ResultadoRonda(await self._liquidar(jugando), omitidos, self.mano_dealer, barajado)
+
+    async def _liquidar(self, jugando):
+        """Liquida todos los asientos juntos: una sola escritura al almacenamiento por ronda"""
+        eventos = {}
+        for asiento in jugando:
+            evento = liquidar_mano(asiento.mano, self.mano_dealer, asiento.apuesta)
+            eventos.setdefault(asiento.jugador.id, []).append((asiento, evento))
+        saldos = registrar_eventos_lote({id: [evento for _, evento in lista] for id, lista in eventos.items()})
+        # La escritura (con su bloqueo y fsync) va en otro hilo para no frenar las otras mesas del bucle
+        await asyncio.to_thread(vaciar_pendientes)
+        resultados = []
+        for id, lista in eventos.items():
+            for asiento, evento in lista:
+                resultados.append(ResultadoAsiento(asiento.numero, id, evento, saldos[id], asiento.vencido))
+        resultados.sort(key=lambda r: r.numero)
+        return resultados
+
+
+async def decisor_estrategia(mesa, asiento):
+    """Decisor que juega la estrategia básica (o pide con menos de 17 si no hay tabla)"""
+    accion = asesor_blackjack.aconsejar(asiento.mano.puntaje, asiento.mano.es_suave,
+                                        VALORES[mesa.carta_visible])
+    if accion is None:
+        accion = PEDIR if asiento.mano.puntaje < 17 else PLANTARSE
+    return accion
@@ -0,0 +1,514 @@
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from controller.jugador_controller import (buscar_jugador, saldo_jugador, registrar_eventos, vaciar_pendientes,
+                                           obtener_pozo)
+from persistencia.pozo_progresivo import marca_pago
+from model.evento import Evento, BLACKJACK, TRAGAMONEDAS, GANA, PIERDE, EMPATE
+from Juegos.Mano import Mano
+from Juegos.Zapato import Zapato
+from Juegos.Aleatorio import nuevo_random, nuevo_generador
+from Juegos.TablaPremios import TABLA
+from Juegos.Rodillos import RODILLOS
+from Juegos.TablaLineas import TABLA_LINEAS, TIRAS, COSTO_LINEA
+
+# Motores de los juegos: solo cambian el estado y devuelven objetos con lo que pasó.
+# No usan print ni input; la consola (Juegos/BlackJack.py, Juegos/Tragamonedas.py)
+# es una de las formas de mostrarlos, y también se pueden usar desde scripts o pruebas de carga.
+
+
+class ErrorJuego(Exception):
+    """Acción que no se puede hacer (jugador inexistente, saldo insuficiente, mano terminada...)"""
+
+
+# ---------------------------------------------------------------- Blackjack
+
+# Cómo terminó el turno de cada lado
+BLACKJACK_NATURAL = "blackjack"
+PASADO = "bust"
+PLANTADO = "stand"
+
+
+class Jugada:
+    """
+    Lo que pasó en una acción de MotorBlackjack.
+      cartas:            códigos de rango repartidos en esta acción (al jugador en iniciar/pedir,
+                         al dealer en plantarse)
+      resultado_jugador: BLACKJACK_NATURAL, PASADO, PLANTADO o None si sigue jugando
+      resultado_dealer:  PASADO, PLANTADO o None si el dealer no jugó
+      barajado:          el zapato se barajó antes de repartir
+    Cuando `terminada` es True solo queda liquidar la mano.
+    """
+    __slots__ = ("cartas", "resultado_jugador", "resultado_dealer", "barajado")
+
+    def __init__(self, cartas, resultado_jugador=None, resultado_dealer=None, barajado=False):
+        self.cartas = cartas
+        self.resultado_jugador = resultado_jugador
+        self.resultado_dealer = resultado_dealer
+        self.barajado = barajado
+
+    @property
+    def terminada(self):
+        return self.resultado_jugador is not None
+
+
+class ResultadoBlackjack:
+    """Liquidación de una mano: evento guardado y saldo del jugador después de pagarla"""
+    __slots__ = ("evento", "saldo", "puntaje_jugador", "puntaje_dealer")
+
+    def __init__(self, evento, saldo, puntaje_jugador, puntaje_dealer):
+        self.evento = evento
+        self.saldo = saldo
+        self.puntaje_jugador = puntaje_jugador
+        self.puntaje_dealer = puntaje_dealer
+
+    @property
+    def motivo(self):
+        return self.evento.detalle
+
+    @property
+    def resultado(self):
+        return self.evento.resultado
+
+    @property
+    def ganancia(self):
+        """Ganancia (positiva) o pérdida (negativa) de la mano"""
+        return self.evento.neto
+
+
+def liquidar_mano(mano_jugador, mano_dealer, apuesta):
+    """Evento con el pago de una mano terminada (mismas reglas y orden de casos de siempre)"""
+    if mano_jugador.es_blackjack and not mano_dealer.es_blackjack:
+        # Blackjack del jugador (paga 3:2)
+        return Evento(BLACKJACK, apuesta, apuesta + int(apuesta * 1.5), GANA, "blackjack")
+    if mano_jugador.se_paso:
+        return Evento(BLACKJACK, apuesta, 0, PIERDE, "bust")
+    if mano_dealer.se_paso:
+        return Evento(BLACKJACK, apuesta, 2 * apuesta, GANA, "dealer_bust")
+    if mano_jugador.es_blackjack and mano_dealer.es_blackjack:
+        return Evento(BLACKJACK, apuesta, apuesta, EMPATE, "doble_blackjack")
+    if mano_jugador.puntaje > mano_dealer.puntaje:
+        return Evento(BLACKJACK, apuesta, 2 * apuesta, GANA, "mayor_puntaje")
+    if mano_jugador.puntaje < mano_dealer.puntaje:
+        return Evento(BLACKJACK, apuesta, 0, PIERDE, "menor_puntaje")
+    return Evento(BLACKJACK, apuesta, apuesta, EMPATE, "mismo_puntaje")
+
+
+class MotorBlackjack:
+    """
+    Una mesa de Blackjack de un jugador contra el dealer:
+      iniciar(id, apuesta) -> Jugada   reparte las 4 cartas iniciales
+      pedir()              -> Jugada   una carta más para el jugador
+      plantarse()          -> Jugada   juega el dealer (pide con menos de 17)
+      liquidar()           -> ResultadoBlackjack  paga la mano y la guarda
+    El zapato se mantiene entre manos y solo se baraja al llegar a la carta de corte.
+    """
+
+    def __init__(self, zapato=None):
+        self.zapato = zapato or Zapato()
+        self.mano_jugador = Mano()
+        self.mano_dealer = Mano()
+        self.jugador = None
+        self.apuesta = 0
+        self._terminada = False
+        self._en_juego = False
+
+    @property
+    def carta_visible(self):
+        """Código de la carta del dealer que ve el jugador (la segunda; la primera va oculta)"""
+        return self.mano_dealer[1]
+
+    def iniciar(self, id_jugador, apuesta):
+        if self._en_juego:
+            raise ErrorJuego("Hay una mano sin liquidar.")
+        if apuesta <= 0:
+            raise ErrorJuego("La apuesta debe ser mayor a $0")
+        # Saldo desde la tabla compartida (al día con las otras mesas, sin leer el repositorio)
+        saldo = saldo_jugador(id_jugador)
+        if saldo is None:
+            raise ErrorJuego("Jugador no encontrado.")
+        # El resto de los datos del jugador se buscan una sola vez por sesión
+        if self.jugador is None or self.jugador.id != id_jugador:
+            self.jugador = buscar_jugador(id_jugador)
+        self.jugador.saldo_actual = saldo
+        if saldo < apuesta:
+            raise ErrorJuego(f"Saldo insuficiente. Saldo actual: ${saldo}")
+
+        self.apuesta = apuesta
+        self.mano_jugador = Mano()
+        self.mano_dealer = Mano()
+        barajado = self.zapato.necesita_barajar
+        if barajado:
+            self.zapato.barajar()
+        # Jugador, dealer (oculta), jugador, dealer (visible)
+        for _ in range(2):
+            self.mano_jugador.agregar(self.zapato.repartir())
+            self.mano_dealer.agregar(self.zapato.repartir())
+        self._en_juego = True
+        self._terminada = self.mano_jugador.es_blackjack
+        return Jugada(tuple(self.mano_jugador), BLACKJACK_NATURAL if self._terminada else None,
+                      barajado=barajado)
+
+    def _verificar_turno(self):
+        if not self._en_juego:
+            raise ErrorJuego("No hay una mano en juego.")
+        if self._terminada:
+            raise ErrorJuego("La mano ya terminó: falta liquidarla.")
+
+    def pedir(self):
+        self._verificar_turno()
+        carta = self.zapato.repartir()
+        self.mano_jugador.agregar(carta)
+        self._terminada = self.mano_jugador.se_paso
+        return Jugada((carta,), PASADO if self._terminada else None)
+
+    def plantarse(self):
+        self._verificar_turno()
+        cartas = []
+        while self.mano_dealer.puntaje < 17:
+            carta = self.zapato.repartir()
+            self.mano_dealer.agregar(carta)
+            cartas.append(carta)
+        self._terminada = True
+        return Jugada(tuple(cartas), PLANTADO, PASADO if self.mano_dealer.se_paso else PLANTADO)
+
+    def liquidar(self):
+        if not self._en_juego or not self._terminada:
+            raise ErrorJuego("No hay una mano terminada para liquidar.")
+        evento = liquidar_mano(self.mano_jugador, self.mano_dealer, self.apuesta)
+        # El resultado se suma al saldo de la tabla compartida, así que si otro
+        # proceso modificó al jugador mientras tanto, su cambio no se pierde
+        saldo = registrar_eventos(self.jugador.id, [evento])
+        if saldo is not None:
+            self.jugador.saldo_actual = saldo
+        self._en_juego = self._terminada = False
+        return ResultadoBlackjack(evento, self.jugador.saldo_actual,
+                                  self.mano_jugador.puntaje, self.mano_dealer.puntaje)
+
+    def cerrar_sesion(self):
+        """Guarda ya las manos pendientes (se llama al salir de la mesa)"""
+        vaciar_pendientes()
+
+
+# ---------------------------------------------------------------- Tragamonedas
+
+COSTO_JUGADA = 1000
+TAMANO_BLOQUE = 1 << 16  # tiradas que el autojuego sortea de una vez
+
+# Pozo progresivo compartido (persistencia/pozo_progresivo.py): se paga además del premio de la tabla
+COMBINACION_POZO = ("7️⃣", "7️⃣", "7️⃣")
+APORTE_POZO = 0.01               # parte de cada jugada que va al pozo
+POZO_INICIAL = 10 * COSTO_JUGADA  # lo que pone la casa cada vez que el pozo se paga
+# CASINO_POZO=0 lo desactiva en la consola
+POZO_ACTIVO = os.environ.get("CASINO_POZO", "1").strip() != "0"
+
+# Por qué se detuvo el autojuego
+FIN_TIRADAS = "tiradas"          # se jugaron todas las pedidas
+FIN_PERDIDA = "limite_perdida"   # la próxima tirada podía pasar el límite de pérdida
+FIN_META = "meta_ganancia"       # se llegó a la ganancia buscada
+FIN_SALDO = "saldo_minimo"       # la próxima tirada podía dejar el saldo bajo el mínimo
+
+
+def pozo_tragamonedas():
+    """El pozo compartido de la consola, o None si está desactivado"""
+    return obtener_pozo(POZO_INICIAL) if POZO_ACTIVO else None
+
+
+class ResultadoTirada:
+    """
+    Una tirada: combinación, premio (incluido el pozo), evento guardado,
+    saldo después de la tirada y el PagoPozo si se ganó el pozo
+    """
+    __slots__ = ("combinacion", "premio", "evento", "saldo", "pozo")
+
+    def __init__(self, combinacion, premio, evento, saldo, pozo=None):
+        self.combinacion = combinacion
+        self.premio = premio
+        self.evento = evento
+        self.saldo = saldo
+        self.pozo = pozo
+
+    @property
+    def gano(self):
+        return self.premio > 0
+
+
+class ResultadoAutojuego:
+    """
+    Resumen de un autojuego:
+      tiradas, aciertos:  jugadas hechas y cuántas pagaron algo
+      apostado, pagado:   totales cobrados y pagados
+      premio_mayor:       mayor premio de una tirada (0 si ninguna pagó)
+      motivo:             FIN_TIRADAS, FIN_PERDIDA, FIN_META o FIN_SALDO
+      evento, saldo:      evento resumen guardado y saldo después (None si no se jugó ninguna tirada)
+      pozos:              PagoPozo de cada vez que se ganó el pozo (ya sumados en pagado)
+    """
+    __slots__ = ("tiradas", "aciertos", "apostado", "pagado", "premio_mayor", "motivo", "evento", "saldo",
+                 "pozos")
+
+    def __init__(self, tiradas, aciertos, apostado, pagado, premio_mayor, motivo, evento, saldo, pozos=()):
+        self.tiradas = tiradas
+        self.aciertos = aciertos
+        self.apostado = apostado
+        self.pagado = pagado
+        self.premio_mayor = premio_mayor
+        self.motivo = motivo
+        self.evento = evento
+        self.saldo = saldo
+        self.pozos = list(pozos)
+
+    @property
+    def neto(self):
+        return self.pagado - self.apostado
+
+
+class MotorTragamonedas:
+    """
+    Sesión de tragamonedas de un jugador:
+      iniciar(id)  -> saldo actual
+      girar()      -> ResultadoTirada  (cobra la jugada y paga el premio)
+      autojugar(n) -> ResultadoAutojuego (n tiradas de una vez, un solo evento resumen)
+      liquidar()   -> guarda ya las tiradas de la sesión
+
+    Con un `pozo` (PozoProgresivo), cada jugada aporta APORTE_POZO de su
+    costo y COMBINACION_POZO se lleva el pozo además de su premio.
+    """
+
+    def __init__(self, costo_jugada=COSTO_JUGADA, rng=None, tabla=TABLA, rodillos=RODILLOS, pozo=None):
+        # Los rodillos sortean índices de símbolo: con otro orden que la tabla se pagarían otras combinaciones
+        if tuple(rodillos.simbolos) != tuple(tabla.simbolos):
+            raise ValueError(f"Los rodillos ({', '.join(rodillos.simbolos)}) no tienen los símbolos de la tabla "
+                             f"de premios en el mismo orden ({', '.join(tabla.simbolos)})")
+        self.costo_jugada = costo_jugada
+        self.tabla = tabla
+        self.rodillos = rodillos  # tiras con pesos (Juegos/Rodillos.py), las mismas en vivo y en autojuego
+        self.pozo = pozo
+        self.posicion_pozo = tabla.posicion(*(tabla.indice[s] for s in COMBINACION_POZO))
+        self.rng = rng or nuevo_random()  # flujo propio de la sesión (Juegos/Aleatorio.py)
+        self.generador = None  # numpy.random.Generator del autojuego (se pide al usarlo)
+        self.jugador = None
+        self.saldo = 0
+
+    def iniciar(self, id_jugador):
+        jugador = buscar_jugador(id_jugador)
+        if not jugador:
+            raise ErrorJuego("Jugador no encontrado.")
+        self.jugador = jugador
+        self.saldo = saldo_jugador(jugador.id)  # saldo al día desde la tabla compartida
+        return self.saldo
+
+    @property
+    def puede_girar(self):
+        return self.jugador is not None and self.saldo >= self.costo_jugada
+
+    def girar(self):
+        if self.jugador is None:
+            raise ErrorJuego("No hay una sesión iniciada.")
+        if self.saldo < self.costo_jugada:
+            raise ErrorJuego("Te has quedado sin saldo.")
+        # Se sortea el índice del símbolo de cada rodillo y el premio sale del arreglo compilado
+        posicion = self.tabla.posicion(*self.rodillos.girar(self.rng))
+        jugada = self.tabla.combinacion(posicion)
+        premio = self.tabla.premios[posicion]
+        detalle = " | ".join(jugada)
+        pago_pozo = None
+        if self.pozo is not None:
+            # El aporte de esta tirada entra antes de cobrar: el que acierta también lo gana
+            self.pozo.aportar(self.costo_jugada * APORTE_POZO)
+            if posicion == self.posicion_pozo:
+                pago_pozo = self.pozo.cobrar(self.jugador.id)
+                premio += pago_pozo.monto
+                detalle += f" + {marca_pago(pago_pozo.numero)}"
+        evento = Evento(TRAGAMONEDAS, self.costo_jugada, premio, GANA if premio > 0 else PIERDE, detalle)
+        # El saldo se actualiza al momento en la tabla compartida (no pisa cambios de otros procesos);
+        # las tiradas se guardan juntas en segundo plano
+        saldo = registrar_eventos(self.jugador.id, [evento])
+        if pago_pozo is not None:
+            # El pozo se guarda ya: hasta acreditarlo, su reclamo sigue pendiente en el archivo del pozo
+            if saldo is not None:
+                vaciar_pendientes()
+            self.pozo.acreditado(pago_pozo)
+        if saldo is None:
+            self.jugador = None
+            raise ErrorJuego("Jugador no encontrado.")
+        self.saldo = saldo
+        return ResultadoTirada(jugada, premio, evento, saldo, pago_pozo)
+
+    def autojugar(self, tiradas, limite_perdida=None, meta_ganancia=None, saldo_minimo=0):
+        """
+        Juega hasta `tiradas` tiradas seguidas sin preguntar. Los rodillos de
+        un bloque se sortean juntos con NumPy (con las mismas tablas alias que
+        girar) y los premios salen del arreglo compilado en una sola
+        indexación. Se detiene antes de una tirada que pueda perder más de
+        `limite_perdida` o dejar el saldo bajo `saldo_minimo`, y después de
+        la tirada que alcanza `meta_ganancia`. Con pozo, cada acierto del
+        pozo cierra un tramo del bloque: se cobra solo si esa tirada se juega.
+
+        Al final se registra un único evento resumen y se guarda con una sola
+        escritura al almacenamiento, tenga 1 o 10 000 tiradas.
+        """
+        if self.jugador is None:
+            raise ErrorJuego("No hay una sesión iniciada.")
+        if tiradas <= 0:
+            raise ErrorJuego("La cantidad de tiradas debe ser mayor a 0")
+        if self.generador is None:
+            self.generador = nuevo_generador()
+        costo = self.costo_jugada
+        n = len(self.tabla.simbolos)
+        premios = np.asarray(self.tabla.premios, dtype=np.int64)
+        # El límite de pérdida es otro piso de saldo; las dos se revisan antes de cada tirada
+        piso = saldo_minimo
+        motivo_piso = FIN_SALDO
+        if limite_perdida is not None and self.saldo - limite_perdida > piso:
+            piso = self.saldo - limite_perdida
+            motivo_piso = FIN_PERDIDA
+        meta = np.inf if meta_ganancia is None else meta_ganancia
+
+        jugadas = aciertos = pagado = premio_mayor = 0
+        pozos = []
+        motivo = None
+        while motivo is None and jugadas < tiradas:
+            bloque = min(TAMANO_BLOQUE, tiradas - jugadas)
+            rodillos = self.rodillos.girar_lote(self.generador, bloque)
+            posiciones = (rodillos[:, 0] * n + rodillos[:, 1]) * n + rodillos[:, 2]
+            premio = premios[posiciones]
+            fines = [bloque]
+            if self.pozo is not None:
+                fines = sorted(set(np.flatnonzero(posiciones == self.posicion_pozo) + 1) | {bloque})
+            inicio = 0
+            for fin in fines:
+                tramo = premio[inicio:fin]
+                # Ganancia de la sesión antes de cada tirada del tramo (incluye los tramos anteriores)
+                previo = np.concatenate(([0], np.cumsum(tramo - costo)[:-1])) + (pagado - costo * jugadas)
+                sin_piso = self.saldo + previo - costo < piso
+                con_meta = previo >= meta
+                cortes = np.flatnonzero(sin_piso | con_meta)
+                hechas = int(cortes[0]) if len(cortes) else len(tramo)
+                if hechas:
+                    jugado = tramo[:hechas]
+                    jugadas += hechas
+                    aciertos += int(np.count_nonzero(jugado))
+                    pagado += int(jugado.sum())
+                    premio_mayor = max(premio_mayor, int(jugado.max()))
+                    if self.pozo is not None:
+                        self.pozo.aportar(costo * APORTE_POZO * hechas, hechas)
+                if len(cortes):
+                    motivo = FIN_META if con_meta[hechas] else motivo_piso
+                    break
+                if self.pozo is not None and posiciones[fin - 1] == self.posicion_pozo:
+                    pago_pozo = self.pozo.cobrar(self.jugador.id)
+                    pozos.append(pago_pozo)
+                    pagado += pago_pozo.monto
+                    premio_mayor = max(premio_mayor, int(tramo[-1]) + pago_pozo.monto)
+                inicio = fin
+        motivo = motivo or FIN_TIRADAS
+
+        if jugadas == 0:
+            return ResultadoAutojuego(0, 0, 0, 0, 0, motivo, None, self.saldo)
+        apostado = costo * jugadas
+        resultado = GANA if pagado > apostado else PIERDE if pagado < apostado else EMPATE
+        detalle = f"Autojuego: {jugadas} tiradas" + "".join(f" + {marca_pago(p.numero)}" for p in pozos)
+        evento = Evento(TRAGAMONEDAS, apostado, pagado, resultado, detalle)
+        saldo = registrar_eventos(self.jugador.id, [evento])
+        if saldo is not None:
+            vaciar_pendientes()
+        for pago_pozo in pozos:
+            self.pozo.acreditado(pago_pozo)
+        if saldo is None:
+            self.jugador = None
+            raise ErrorJuego("Jugador no encontrado.")
+        self.saldo = saldo
+        return ResultadoAutojuego(jugadas, aciertos, apostado, pagado, premio_mayor, motivo, evento, saldo, pozos)
+
+    def liquidar(self):
+        """Fin de la sesión: guardar ya las tiradas pendientes (y sumar al pozo los aportes juntados)"""
+        vaciar_pendientes()
+        if self.pozo is not None:
+            self.pozo.sincronizar()
+
+
+# ---------------------------------------------------------------- Tragamonedas 5x3 con líneas
+
+class ResultadoGiroLineas:
+    """
+    Un giro del tragamonedas de 5x3:
+      grilla:            FILAS filas de símbolos
+      lineas, dispersos: lo que pagó (ver Juegos/TablaLineas.ResultadoLineas)
+      apuesta, premio:   costo del giro (todas las líneas apostadas) y premio total
+      evento, saldo:     evento guardado y saldo después del giro
+    """
+    __slots__ = ("grilla", "lineas", "dispersos", "apuesta", "premio", "evento", "saldo")
+
+    def __init__(self, grilla, lineas, dispersos, apuesta, premio, evento, saldo):
+        self.grilla = grilla
+        self.lineas = lineas
+        self.dispersos = dispersos
+        self.apuesta = apuesta
+        self.premio = premio
+        self.evento = evento
+        self.saldo = saldo
+
+    @property
+    def gano(self):
+        return self.premio > 0
+
+
+class MotorMultilinea:
+    """
+    Sesión del tragamonedas de 5x3 con líneas de pago y dispersos:
+      iniciar(id) -> saldo actual
+      girar()     -> ResultadoGiroLineas (cobra costo_linea por línea apostada y paga lo ganado)
+      liquidar()  -> guarda ya los giros de la sesión
+    Se apuestan las primeras `lineas` líneas de la tabla (todas por defecto).
+    """
+
+    def __init__(self, lineas=None, costo_linea=COSTO_LINEA, rng=None, tabla=TABLA_LINEAS, tiras=TIRAS):
+        self.tabla = tabla
+        self.tiras = tiras
+        self.lineas = len(tabla.lineas) if lineas is None else lineas
+        if not 1 <= self.lineas <= len(tabla.lineas):
+            raise ErrorJuego(f"Se pueden apostar de 1 a {len(tabla.lineas)} líneas.")
+        self.activas = (1 << self.lineas) - 1
+        self.costo_linea = costo_linea
+        self.rng = rng or nuevo_random()
+        self.jugador = None
+        self.saldo = 0
+
+    @property
+    def costo_giro(self):
+        return self.costo_linea * self.lineas
+
+    def iniciar(self, id_jugador):
+        jugador = buscar_jugador(id_jugador)
+        if not jugador:
+            raise ErrorJuego("Jugador no encontrado.")
+        self.jugador = jugador
+        self.saldo = saldo_jugador(jugador.id)
+        return self.saldo
+
+    @property
+    def puede_girar(self):
+        return self.jugador is not None and self.saldo >= self.costo_giro
+
+    def girar(self):
+        if self.jugador is None:
+            raise ErrorJuego("No hay una sesión iniciada.")
+        if self.saldo < self.costo_giro:
+            raise ErrorJuego("Te has quedado sin saldo.")
+        codigos = self.tiras.girar(self.rng)
+        resultado = self.tabla.evaluar(codigos, self.activas)
+        apuesta = self.costo_giro
+        evento = Evento(TRAGAMONEDAS, apuesta, resultado.premio, GANA if resultado.premio > 0 else PIERDE,
+                        f"5x3: {len(resultado.lineas)} de {self.lineas} líneas")
+        saldo = registrar_eventos(self.jugador.id, [evento])
+        if saldo is None:
+            self.jugador = None
+            raise ErrorJuego("Jugador no encontrado.")
+        self.saldo = saldo
+        return ResultadoGiroLineas(self.tabla.grilla(codigos), resultado.lineas, resultado.dispersos, apuesta,
+                                   resultado.premio, evento, saldo)
+
+    def liquidar(self):
+        """Fin de la sesión: guardar ya los giros pendientes"""
+        vaciar_pendientes()
@@ -0,0 +1,168 @@
+import sys
+import os
+import time
+from functools import lru_cache
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.Mano import puntaje, valor_duro
+from Juegos.Zapato import RANGOS, PALOS, MAZOS_POR_ZAPATO
+
+# Las probabilidades solo dependen del valor de las cartas: la composición del zapato
+# se cuenta por clase de valor (2..9, 10 = 10/J/Q/K, A)
+VALORES_CLASE = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+CLASE_DE_CODIGO = (0, 1, 2, 3, 4, 5, 6, 7, 8, 8, 8, 8, 9)  # código de rango (Juegos/Zapato.py) -> clase
+# Totales finales del dealer; la última posición es "se pasó"
+RESULTADOS_DEALER = (17, 18, 19, 20, 21, "bust")
+PASADO = len(RESULTADOS_DEALER) - 1
+TAMANO_CACHE = 1 << 20  # estados guardados por cada cálculo memorizado (acota la memoria)
+
+# Tablas precalculadas para las recursiones (evitan llamadas en el ciclo interno)
+_VALOR_DURO = tuple(valor_duro(v) for v in VALORES_CLASE)
+_CLASE_AS = VALORES_CLASE.index(11)
+_PASADO = (0.0,) * PASADO + (1.0,)
+_PLANTADO = tuple(tuple(float(i == j) for j in range(len(RESULTADOS_DEALER))) for i in range(PASADO))
+
+
+def composicion_inicial(mazos=MAZOS_POR_ZAPATO):
+    """Composición de un zapato completo: cantidad de cartas de cada clase de valor"""
+    composicion = [0] * len(VALORES_CLASE)
+    for codigo in range(RANGOS):
+        composicion[CLASE_DE_CODIGO[codigo]] += PALOS * mazos
+    return tuple(composicion)
+
+
+def composicion_de_codigos(codigos):
+    """Composición de una colección de cartas (códigos de rango), p. ej. Zapato.cartas_restantes()"""
+    composicion = [0] * len(VALORES_CLASE)
+    for codigo in codigos:
+        composicion[CLASE_DE_CODIGO[codigo]] += 1
+    return tuple(composicion)
+
+
+def quitar(composicion, clase):
+    """Composición sin una carta de esa clase"""
+    if not composicion[clase]:
+        raise ValueError(f"No quedan cartas de valor {VALORES_CLASE[clase]} en el zapato")
+    return composicion[:clase] + (composicion[clase] - 1,) + composicion[clase + 1:]
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def _final_dealer(total_duro, tiene_as, composicion):
+    """Probabilidad de cada resultado del dealer desde una mano (total duro, si tiene As) y un zapato"""
+    actual = puntaje(total_duro, tiene_as)
+    if actual > 21:
+        return _PASADO
+    if actual >= 17:
+        # Como en MotorBlackjack.plantarse: se planta con 17 o más (también con 17 suave)
+        return _PLANTADO[actual - 17]
+    cartas = sum(composicion)
+    p17 = p18 = p19 = p20 = p21 = pasado = 0.0
+    for clase, cantidad in enumerate(composicion):
+        if not cantidad:
+            continue
+        siguiente = _final_dealer(total_duro + _VALOR_DURO[clase], tiene_as or clase == _CLASE_AS,
+                                  composicion[:clase] + (cantidad - 1,) + composicion[clase + 1:])
+        peso = cantidad / cartas
+        p17 += peso * siguiente[0]
+        p18 += peso * siguiente[1]
+        p19 += peso * siguiente[2]
+        p20 += peso * siguiente[3]
+        p21 += peso * siguiente[4]
+        pasado += peso * siguiente[5]
+    return p17, p18, p19, p20, p21, pasado
+
+
+def probabilidades_dealer(carta_visible, composicion):
+    """
+    Probabilidades exactas de los resultados del dealer (ver RESULTADOS_DEALER)
+    con `carta_visible` (valor 2-11) y `composicion` = cartas que quedan sin
+    contar la visible. La carta oculta sale de esas mismas cartas: el dealer
+    no mira si tiene Blackjack antes de que juegue el jugador.
+    """
+    return _final_dealer(valor_duro(carta_visible), carta_visible == 11, composicion)
+
+
+def tabla_dealer(composicion):
+    """Diccionario carta visible -> probabilidades del dealer, sacando la visible del zapato"""
+    return {valor: probabilidades_dealer(valor, quitar(composicion, clase))
+            for clase, valor in enumerate(VALORES_CLASE) if composicion[clase]}
+
+
+def ev_plantarse(puntaje_jugador, carta_visible, composicion):
+    """Ganancia esperada (por unidad apostada) de plantarse con ese puntaje (sin Blackjack)"""
+    if puntaje_jugador > 21:
+        return -1.0
+    probabilidades = probabilidades_dealer(carta_visible, composicion)
+    ev = probabilidades[PASADO]
+    for total, p in zip(RESULTADOS_DEALER, probabilidades[:PASADO]):
+        # Con 21 contra el Blackjack del dealer se empata, igual que en liquidar_mano
+        ev += p * ((puntaje_jugador > total) - (puntaje_jugador < total))
+    return ev
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def _ev_optimo(total_duro, tiene_as, carta_visible, composicion):
+    """Mejor ganancia esperada entre plantarse y pedir, jugando bien desde ahí"""
+    actual = puntaje(total_duro, tiene_as)
+    if actual > 21:
+        return -1.0
+    plantarse = ev_plantarse(actual, carta_visible, composicion)
+    if actual == 21:
+        return plantarse
+    return max(plantarse, _ev_pedir(total_duro, tiene_as, carta_visible, composicion))
+
+
+def _ev_pedir(total_duro, tiene_as, carta_visible, composicion):
+    cartas = sum(composicion)
+    ev = 0.0
+    for clase, cantidad in enumerate(composicion):
+        if cantidad:
+            ev += cantidad / cartas * _ev_optimo(total_duro + _VALOR_DURO[clase], tiene_as or clase == _CLASE_AS,
+                                                  carta_visible,
+                                                  composicion[:clase] + (cantidad - 1,) + composicion[clase + 1:])
+    return ev
+
+
+def evs_mano(valores_jugador, carta_visible, composicion):
+    """
+    Ganancias esperadas exactas (plantarse, pedir) de una mano del jugador.
+      valores_jugador: valores de sus cartas (A = 11)
+      carta_visible:   valor de la carta visible del dealer
+      composicion:     cartas que quedan en el zapato (sin las de la mesa)
+    "Pedir" es pedir una carta y después seguir jugando de la mejor forma.
+    """
+    total_duro = sum(valor_duro(v) for v in valores_jugador)
+    tiene_as = 11 in valores_jugador
+    plantarse = ev_plantarse(puntaje(total_duro, tiene_as), carta_visible, composicion)
+    return plantarse, _ev_pedir(total_duro, tiene_as, carta_visible, composicion)
+
+
+def limpiar_cache():
+    _final_dealer.cache_clear()
+    _ev_optimo.cache_clear()
+
+
+if __name__ == "__main__":
+    # Uso: python Juegos/ProbabilidadesBlackjack.py [mazos]
+    mazos = int(sys.argv[1]) if len(sys.argv) > 1 else MAZOS_POR_ZAPATO
+    zapato = composicion_inicial(mazos)
+
+    inicio = time.perf_counter()
+    tabla = tabla_dealer(zapato)
+    duracion = time.perf_counter() - inicio
+    print(f"🏠 Resultado final del dealer con zapato de {mazos} mazos ({duracion * 1000:.0f} ms)\n")
+    print(f"{'VISIBLE':<8}" + "".join(f"{str(r):>8}" for r in RESULTADOS_DEALER))
+    for valor, probabilidades in tabla.items():
+        print(f"{'A' if valor == 11 else valor:<8}" + "".join(f"{p:>8.4f}" for p in probabilidades))
+
+    inicio = time.perf_counter()
+    print(f"\n🎯 EV de plantarse / pedir contra cada carta visible\n")
+    print(f"{'MANO':<8}" + "".join(f"{'A' if v == 11 else v:>14}" for v in VALORES_CLASE))
+    for primera, segunda in [(10, 6), (10, 7), (11, 6), (11, 7)]:
+        resto = quitar(quitar(zapato, VALORES_CLASE.index(primera)), VALORES_CLASE.index(segunda))
+        celdas = []
+        for clase, visible in enumerate(VALORES_CLASE):
+            plantarse, pedir = evs_mano([primera, segunda], visible, quitar(resto, clase))
+            celdas.append(f"{plantarse:+.3f}/{pedir:+.3f}")
+        nombre = f"{'A' if primera == 11 else primera}+{segunda}"
+        print(f"{nombre:<8}" + "".join(f"{c:>14}" for c in celdas))
+    print(f"\n⏱️ {time.perf_counter() - inicio:.2f} s para la tabla de EV (los totales bajos exploran muchos más zapatos)")
@@ -0,0 +1,134 @@
+import json
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.TablaPremios import TABLA
+
+# Configuración de los rodillos del juego; si no existe, los tres rodillos son uniformes
+ARCHIVO_RODILLOS = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "rodillos.json"))
+
+
+class TablaAlias:
+    """
+    Muestreo de un índice 0..n-1 con probabilidades proporcionales a `pesos`
+    en O(1) por muestra (método alias de Walker, construcción de Vose):
+    se elige una columna al azar y, con probabilidad `corte[columna]`, se
+    queda con ella; si no, con su `alias`.
+    """
+    __slots__ = ("n", "corte", "alias", "_corte", "_alias")
+
+    def __init__(self, pesos):
+        pesos = [float(p) for p in pesos]
+        total = sum(pesos)
+        if not pesos or min(pesos) < 0 or total <= 0:
+            raise ValueError("Los pesos deben ser no negativos y sumar más que 0")
+        n = len(pesos)
+        escalados = [p * n / total for p in pesos]
+        corte = [1.0] * n
+        alias = list(range(n))
+        chicos = [i for i, p in enumerate(escalados) if p < 1]
+        grandes = [i for i, p in enumerate(escalados) if p >= 1]
+        while chicos and grandes:
+            chico, grande = chicos.pop(), grandes.pop()
+            corte[chico] = escalados[chico]
+            alias[chico] = grande
+            # Lo que le falta a la columna chica sale de la grande
+            escalados[grande] -= 1 - escalados[chico]
+            (chicos if escalados[grande] < 1 else grandes).append(grande)
+        # Las que quedan (por redondeo) se llenan solas: corte 1
+        self.n = n
+        self.corte = tuple(corte)
+        self.alias = tuple(alias)
+        self._corte = np.array(corte)
+        self._alias = np.array(alias)
+
+    def muestra(self, rng):
+        """Un índice con random.Random (tiradas en vivo)"""
+        u = rng.random() * self.n
+        i = int(u)
+        return i if u - i < self.corte[i] else self.alias[i]
+
+    def muestras(self, generador, cantidad):
+        """`cantidad` índices con numpy.random.Generator (autojuego y simulación)"""
+        i = generador.integers(0, self.n, size=cantidad)
+        return np.where(generador.random(cantidad) < self._corte[i], i, self._alias[i])
+
+
+class Rodillos:
+    """
+    Rodillos virtuales con pesos: cada rodillo tiene su propia tira, dada
+    como {símbolo: paradas en la tira}. Las tiradas en vivo (girar) y las
+    de autojuego o simulación (girar_lote) usan las mismas tablas alias, y
+    `pesos` (un peso por símbolo de cada rodillo, en el orden de
+    `simbolos`) es lo que recibe Juegos/AnalisisTragamonedas.analizar.
+    Los índices que devuelven son posiciones en `simbolos`: por defecto el
+    orden de la tabla de premios cargada (TABLA.simbolos), que puede venir
+    de data/tabla_premios.json.
+    """
+
+    def __init__(self, tiras=None, simbolos_rodillo=None):
+        self.simbolos = tuple(simbolos_rodillo or TABLA.simbolos)
+        tiras = tiras or [{simbolo: 1 for simbolo in self.simbolos}] * 3
+        if len(tiras) != 3:
+            raise ValueError("Se necesitan 3 rodillos")
+        for tira in tiras:
+            desconocidos = set(tira) - set(self.simbolos)
+            if desconocidos:
+                raise ValueError(f"Símbolos desconocidos en un rodillo: {', '.join(desconocidos)}")
+        self.pesos = tuple(tuple(tira.get(simbolo, 0) for simbolo in self.simbolos) for tira in tiras)
+        self.alias = tuple(TablaAlias(pesos) for pesos in self.pesos)
+
+    @property
+    def uniformes(self):
+        return all(len(set(pesos)) == 1 for pesos in self.pesos)
+
+    def girar(self, rng):
+        """Índices de símbolo (a, b, c) de una tirada"""
+        a, b, c = self.alias
+        return a.muestra(rng), b.muestra(rng), c.muestra(rng)
+
+    def girar_lote(self, generador, cantidad):
+        """Arreglo (cantidad, 3) con los índices de símbolo de `cantidad` tiradas"""
+        return np.stack([rodillo.muestras(generador, cantidad) for rodillo in self.alias], axis=1)
+
+    def to_dict(self):
+        return {"rodillos": [{s: p for s, p in zip(self.simbolos, pesos) if p} for pesos in self.pesos]}
+
+    @staticmethod
+    def from_dict(data):
+        return Rodillos(data["rodillos"])
+
+
+def guardar_rodillos(rodillos, archivo=ARCHIVO_RODILLOS):
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    with open(archivo, "w", encoding="utf-8") as f:
+        json.dump(rodillos.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def cargar_rodillos(archivo=ARCHIVO_RODILLOS):
+    """Rodillos configurados en `archivo`, o uniformes si no existe"""
+    if not os.path.exists(archivo):
+        return Rodillos()
+    with open(archivo, encoding="utf-8") as f:
+        return Rodillos.from_dict(json.load(f))
+
+
+# Los rodillos que usan el juego, el autojuego y las pantallas de premios
+RODILLOS = cargar_rodillos()
+
+
+if __name__ == "__main__":
+    # Uso: python Juegos/Rodillos.py [archivo_rodillos] [muestras]
+    # Compara la frecuencia muestreada de cada símbolo con la configurada
+    archivo = sys.argv[1] if len(sys.argv) > 1 else ARCHIVO_RODILLOS
+    muestras = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rodillos = cargar_rodillos(archivo)
+    print(f"🎰 Rodillos de {archivo if os.path.exists(archivo) else '(uniformes)'}\n")
+    indices = rodillos.girar_lote(np.random.default_rng(), muestras)
+    for numero, pesos in enumerate(rodillos.pesos):
+        total = sum(pesos)
+        conteo = np.bincount(indices[:, numero], minlength=len(pesos)) / muestras
+        print(f"Rodillo {numero + 1}:")
+        for simbolo, peso, frecuencia in zip(rodillos.simbolos, pesos, conteo):
+            print(f"   {simbolo}\t{peso:>4} paradas  esperado {peso / total:7.4f}  muestreado {frecuencia:7.4f}")
@@ -0,0 +1,208 @@
+import math
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.Aleatorio import ServicioAleatorio
+from Juegos.Mano import puntaje, valor_duro
+from Juegos.Zapato import VALORES, PALOS, MAZOS_POR_ZAPATO
+
+# Resultado neto de cada mano en medias apuestas (así cabe en un entero: el Blackjack paga 3:2)
+PIERDE, EMPATA, GANA, GANA_BLACKJACK = -2, 0, 2, 3
+
+
+class PoliticaUmbral:
+    """Política que pide carta mientras el puntaje sea menor que `umbral` (como el dealer con 17)"""
+
+    def __init__(self, umbral=17):
+        self.umbral = umbral
+        self.nombre = f"pedir hasta {umbral}"
+
+    def __call__(self, puntaje_jugador, suave, carta_dealer, cartas):
+        return puntaje_jugador < self.umbral
+
+
+def politica_umbral(umbral=17):
+    return PoliticaUmbral(umbral)
+
+
+def _jugar_trozo(simulador, semilla, n):
+    """Juega un trozo con su propia semilla (corre en un proceso trabajador) y devuelve sus sumas"""
+    resultado = simulador._jugar_lote(n, np.random.default_rng(semilla))
+    conteo = np.bincount(np.searchsorted([PIERDE, EMPATA, GANA, GANA_BLACKJACK], resultado), minlength=4)
+    return conteo, int(resultado.sum(dtype=np.int64)), int((resultado.astype(np.int64) ** 2).sum())
+
+
+class ResultadoSimulacion:
+    """Estadísticas de una simulación (resultado por unidad apostada)"""
+
+    def __init__(self, manos, ganadas, perdidas, empatadas, blackjacks, suma, suma_cuadrados, duracion):
+        self.manos = manos
+        self.ganadas = ganadas
+        self.perdidas = perdidas
+        self.empatadas = empatadas
+        self.blackjacks = blackjacks
+        self.ev = suma / manos                                    # ganancia esperada por unidad apostada
+        self.varianza = suma_cuadrados / manos - self.ev ** 2     # varianza del resultado de una mano
+        self.error_estandar = math.sqrt(self.varianza / manos)
+        self.duracion = duracion
+
+    def __str__(self):
+        manos = self.manos
+        return "\n".join([
+            f"Manos simuladas: {manos:,} en {self.duracion:.2f} s ({manos / self.duracion:,.0f} manos/s)",
+            f"Ganadas:   {self.ganadas / manos:7.2%}  (Blackjack: {self.blackjacks / manos:.2%})",
+            f"Perdidas:  {self.perdidas / manos:7.2%}",
+            f"Empatadas: {self.empatadas / manos:7.2%}",
+            f"EV por unidad apostada: {self.ev:+.5f} ± {1.96 * self.error_estandar:.5f} (95%)",
+            f"Varianza: {self.varianza:.4f}  (desviación {math.sqrt(self.varianza):.4f})",
+        ])
+
+
+class SimuladorBlackjack:
+    """
+    Simulador Monte Carlo de MotorBlackjack sin entrada ni salida por consola.
+
+    Juega lotes de manos a la vez con arreglos de NumPy y las mismas reglas
+    que Juegos/Motor.py:
+      - zapato de `mazos` mazos (6 por defecto, como la mesa)
+      - reparto jugador, dealer (oculta), jugador, dealer (visible)
+      - el jugador solo puede pedir o plantarse; el dealer pide con menos de 17
+      - Blackjack del jugador paga 3:2 (empata si el dealer también tiene Blackjack)
+      - el dealer juega aunque tenga Blackjack: un 21 de 3+ cartas contra su Blackjack empata
+      - empate devuelve la apuesta
+
+    Las manos se juegan en trozos de `tamano_lote` y cada trozo tiene su
+    propia semilla, hija de `semilla` según su número de trozo (ver
+    Juegos/Aleatorio.py): con la misma semilla el resultado es idéntico
+    con cualquier cantidad de trabajadores.
+
+    La política del jugador recibe arreglos (puntaje, suave, carta visible del dealer,
+    cantidad de cartas) de las manos que siguen jugando y devuelve un arreglo
+    booleano: True para pedir carta.
+
+    Cada mano sale de un zapato recién barajado: no se modela cómo cambian
+    las probabilidades a medida que el zapato se gasta hasta el corte.
+    """
+
+    def __init__(self, politica=None, semilla=None, mazos=MAZOS_POR_ZAPATO, tamano_lote=100_000):
+        # La política tiene que poder enviarse a otros procesos (una clase como PoliticaUmbral, no una lambda)
+        self.politica = politica or politica_umbral(17)
+        self.aleatorio = ServicioAleatorio(semilla)
+        self.mazos = mazos
+        self.tamano_lote = tamano_lote
+        self._valores = np.array(VALORES * (PALOS * mazos), dtype=np.int8)  # valor de cada carta del zapato
+
+    def _robar(self, plano, n, manos, siguiente, rng):
+        """
+        Saca la próxima carta del mazo de cada mano indicada. El mazo se baraja
+        a medida que se reparte (Fisher-Yates perezoso): la carta sale de una
+        posición al azar entre las que quedan y en su lugar se mueve la de la
+        posición actual. Así solo se sortean las cartas que realmente se usan.
+        """
+        posicion = siguiente[manos]
+        elegida = posicion + (rng.random(manos.size) * (self._valores.size - posicion)).astype(np.intp)
+        elegida = elegida * n + manos
+        carta = plano[elegida]
+        plano[elegida] = plano[posicion * n + manos]
+        siguiente[manos] += 1
+        return carta
+
+    def _jugar_lote(self, n, rng):
+        """Juega n manos y devuelve el resultado neto de cada una en medias apuestas"""
+        # Un zapato nuevo por mano, guardado por columnas (cartas x n) para que cada posición sea contigua
+        plano = np.repeat(self._valores, n)
+        todas = np.arange(n)
+        siguiente = np.zeros(n, dtype=np.intp)  # próxima posición del mazo de cada mano
+        # Las 4 primeras cartas: jugador, dealer (oculta), jugador, dealer (visible)
+        c1, c2, c3, c4 = (self._robar(plano, n, todas, siguiente, rng) for _ in range(4))
+        as_jugador = (c1 == 11) | (c3 == 11)
+        as_dealer = (c2 == 11) | (c4 == 11)
+        # Total duro: cada As cuenta 1 (ver Juegos/Mano.py)
+        jugador = valor_duro(c1) + valor_duro(c3)
+        dealer = valor_duro(c2) + valor_duro(c4)
+        carta_dealer = c4
+        cartas_jugador = np.full(n, 2, dtype=np.int8)
+
+        blackjack_jugador = puntaje(jugador, as_jugador) == 21
+        blackjack_dealer = puntaje(dealer, as_dealer) == 21
+
+        # Turno del jugador (las manos con Blackjack no juegan)
+        activas = np.flatnonzero(~blackjack_jugador)
+        while activas.size:
+            actual = puntaje(jugador[activas], as_jugador[activas])
+            suave = as_jugador[activas] & (jugador[activas] <= 11)
+            pide = np.asarray(self.politica(actual, suave, carta_dealer[activas], cartas_jugador[activas]),
+                              dtype=bool)
+            activas = activas[pide & (actual <= 21)]
+            if not activas.size:
+                break
+            carta = self._robar(plano, n, activas, siguiente, rng)
+            jugador[activas] += valor_duro(carta)
+            as_jugador[activas] |= carta == 11
+            cartas_jugador[activas] += 1
+            # Las que se pasan dejan de jugar
+            activas = activas[jugador[activas] <= 21]
+        final_jugador = puntaje(jugador, as_jugador)
+        pasado = final_jugador > 21
+
+        # Turno del dealer: solo si el jugador no se pasó ni tiene Blackjack
+        activas = np.flatnonzero(~pasado & ~blackjack_jugador)
+        while activas.size:
+            activas = activas[puntaje(dealer[activas], as_dealer[activas]) < 17]
+            if not activas.size:
+                break
+            carta = self._robar(plano, n, activas, siguiente, rng)
+            dealer[activas] += valor_duro(carta)
+            as_dealer[activas] |= carta == 11
+        final_dealer = puntaje(dealer, as_dealer)
+
+        # Mismo orden de casos que liquidar_mano (Juegos/Motor.py)
+        resultado = np.where(final_jugador > final_dealer, GANA,
+                             np.where(final_jugador < final_dealer, PIERDE, EMPATA)).astype(np.int8)
+        resultado[final_dealer > 21] = GANA
+        resultado[pasado] = PIERDE
+        resultado[blackjack_jugador] = np.where(blackjack_dealer[blackjack_jugador], EMPATA, GANA_BLACKJACK)
+        return resultado
+
+    def simular(self, manos, trabajadores=1):
+        """
+        Juega `manos` manos y devuelve un ResultadoSimulacion. Con varios
+        trabajadores los trozos se reparten entre procesos; cada llamada
+        usa semillas nuevas, pero la secuencia de llamadas es reproducible.
+        """
+        inicio = time.perf_counter()
+        tamanos = [self.tamano_lote] * (manos // self.tamano_lote)
+        if manos % self.tamano_lote:
+            tamanos.append(manos % self.tamano_lote)
+        semillas = self.aleatorio.semillas(len(tamanos))
+        if trabajadores > 1:
+            with ProcessPoolExecutor(trabajadores) as grupo:
+                trozos = list(grupo.map(_jugar_trozo, [self] * len(tamanos), semillas, tamanos))
+        else:
+            trozos = [_jugar_trozo(self, semilla, n) for semilla, n in zip(semillas, tamanos)]
+        conteo = np.zeros(4, dtype=np.int64)  # perdidas, empatadas, ganadas, blackjacks
+        suma = suma_cuadrados = 0
+        for conteo_trozo, suma_trozo, cuadrados_trozo in trozos:
+            conteo += conteo_trozo
+            suma += suma_trozo
+            suma_cuadrados += cuadrados_trozo
+        perdidas, empatadas, ganadas, blackjacks = (int(c) for c in conteo)
+        return ResultadoSimulacion(manos, ganadas + blackjacks, perdidas, empatadas, blackjacks,
+                                   suma / 2, suma_cuadrados / 4, time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    # Uso: python Juegos/SimuladorBlackjack.py [manos] [umbral_para_plantarse] [semilla] [mazos] [trabajadores]
+    manos = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    umbral = int(sys.argv[2]) if len(sys.argv) > 2 else 17
+    semilla = int(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[3] != "-" else None
+    mazos = int(sys.argv[4]) if len(sys.argv) > 4 else MAZOS_POR_ZAPATO
+    trabajadores = int(sys.argv[5]) if len(sys.argv) > 5 else os.cpu_count() or 1
+    politica = politica_umbral(umbral)
+    simulador = SimuladorBlackjack(politica, semilla, mazos)
+    print(f"🃏 Política del jugador: {politica.nombre}, zapato de {mazos} mazos, {trabajadores} trabajadores")
+    print(f"🎲 Semilla: {simulador.aleatorio.entropia} (pásala como tercer argumento para repetir la corrida)")
+    print(simulador.simular(manos, trabajadores))
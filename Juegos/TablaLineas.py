@@ -0,0 +1,236 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.TablaPremios import COMODIN, simbolos
+
+RODILLOS = 5
+FILAS = 3  # 0 = arriba, 1 = centro, 2 = abajo
+
+# Líneas de pago: la fila que toma en cada rodillo
+LINEAS = (
+    (1, 1, 1, 1, 1), (0, 0, 0, 0, 0), (2, 2, 2, 2, 2), (0, 1, 2, 1, 0), (2, 1, 0, 1, 2),
+    (1, 0, 0, 0, 1), (1, 2, 2, 2, 1), (0, 0, 1, 2, 2), (2, 2, 1, 0, 0), (1, 2, 1, 0, 1),
+    (1, 0, 1, 2, 1), (0, 1, 1, 1, 0), (2, 1, 1, 1, 2), (0, 1, 0, 1, 0), (2, 1, 2, 1, 2),
+    (1, 1, 0, 1, 1), (1, 1, 2, 1, 1), (0, 0, 2, 0, 0), (2, 2, 0, 2, 2), (0, 2, 2, 2, 0),
+    (2, 0, 0, 0, 2), (1, 0, 2, 0, 1), (1, 2, 0, 2, 1), (0, 2, 0, 2, 0), (2, 0, 2, 0, 2),
+)
+
+COSTO_LINEA = 40  # 25 líneas = $1.000 por giro, lo mismo que una jugada del tragamonedas de 3 rodillos
+
+# Premio por línea, con la misma sintaxis que tabla_ganadora: COMODIN = cualquier símbolo,
+# y una regla más corta que los rodillos se completa con comodines a la derecha
+tabla_lineas = {
+    ("7️⃣", "7️⃣", "7️⃣", "7️⃣", "7️⃣"): 800 * COSTO_LINEA,   # Premio mayor
+    ("BAR", "BAR", "BAR", "BAR", "BAR"): 400 * COSTO_LINEA,
+    ("🔔", "🔔", "🔔", "🔔", "🔔"): 200 * COSTO_LINEA,
+    ("🍒", "🍒", "🍒", "🍒", "🍒"): 120 * COSTO_LINEA,
+    ("🍋", "🍋", "🍋", "🍋", "🍋"): 80 * COSTO_LINEA,
+    ("7️⃣", "7️⃣", "7️⃣", "7️⃣"): 120 * COSTO_LINEA,          # Cuatro desde la izquierda
+    ("BAR", "BAR", "BAR", "BAR"): 60 * COSTO_LINEA,
+    ("🔔", "🔔", "🔔", "🔔"): 30 * COSTO_LINEA,
+    ("🍒", "🍒", "🍒", "🍒"): 20 * COSTO_LINEA,
+    ("🍋", "🍋", "🍋", "🍋"): 12 * COSTO_LINEA,
+    ("7️⃣", "7️⃣", "7️⃣"): 24 * COSTO_LINEA,                 # Tres desde la izquierda
+    ("BAR", "BAR", "BAR"): 12 * COSTO_LINEA,
+    ("🔔", "🔔", "🔔"): 6 * COSTO_LINEA,
+    ("🍒", "🍒", "🍒"): 4 * COSTO_LINEA,
+    ("🍋", "🍋", "🍋"): 2 * COSTO_LINEA,
+    ("7️⃣", COMODIN, COMODIN, COMODIN, "7️⃣"): 5 * COSTO_LINEA,  # Sietes en los extremos
+}
+
+# Símbolos dispersos: pagan por cantidad en cualquier lugar de la grilla, sin importar las líneas
+# ({símbolo: {mínimo de apariciones: premio}}; se paga el mayor mínimo alcanzado)
+dispersos = {
+    "🔔": {5: 1000, 7: 5000, 9: 50000},
+}
+
+# Tira virtual de cada rodillo (la misma en los cinco); se ven 3 paradas seguidas
+TIRA = ("🍋", "🍒", "🔔", "🍋", "BAR", "🍒", "🍋", "7️⃣", "🔔", "🍒",
+        "🍋", "BAR", "🍋", "🍒", "🔔", "🍋", "7️⃣", "🍒", "🔔", "BAR")
+
+
+class ResultadoLineas:
+    """
+    Evaluación de una grilla:
+      premio:    total (líneas + dispersos)
+      lineas:    (número de línea desde 1, regla, premio) de cada línea ganadora
+      dispersos: (símbolo, apariciones, premio) de cada disperso que pagó
+    """
+    __slots__ = ("premio", "lineas", "dispersos")
+
+    def __init__(self, premio, lineas, dispersos):
+        self.premio = premio
+        self.lineas = lineas
+        self.dispersos = dispersos
+
+
+class TablaLineas:
+    """
+    Tabla de premios de un tragamonedas de RODILLOS x FILAS con líneas de pago.
+
+    Lo que se ve en cada rodillo (FILAS símbolos) se identifica con un
+    código de ventana (ver codigo). Todo lo que depende de las líneas se
+    calcula una vez: para cada rodillo y cada ventana posible, la máscara
+    de bits de las líneas que pasan por cada símbolo, y cada regla queda
+    como la lista de casillas (rodillo, símbolo) que exige. Al evaluar,
+    las máscaras de los rodillos se juntan con una indexación por rodillo
+    y las líneas que cumplen una regla son el AND de las máscaras de sus
+    casillas: no se recorren líneas ni posiciones.
+
+    Cada línea paga solo su regla de mayor prioridad (la misma que
+    TablaPremios: primero las reglas sin comodines, después el resto en orden).
+    """
+
+    def __init__(self, reglas=None, lineas=LINEAS, dispersos_simbolo=None, simbolos_rodillo=None,
+                 rodillos=RODILLOS, filas=FILAS):
+        self.simbolos = tuple(simbolos_rodillo or simbolos)
+        self.indice = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+        self.rodillos = rodillos
+        self.filas = filas
+        self.lineas = tuple(tuple(linea) for linea in lineas)
+        for linea in self.lineas:
+            if len(linea) != rodillos or not all(0 <= f < filas for f in linea):
+                raise ValueError(f"Línea inválida para {rodillos}x{filas}: {linea}")
+        self.todas = (1 << len(self.lineas)) - 1
+        n = len(self.simbolos)
+
+        # lineas_en[r][f]: máscara de las líneas que pasan por la fila f del rodillo r
+        lineas_en = [[0] * filas for _ in range(rodillos)]
+        for numero, linea in enumerate(self.lineas):
+            for rodillo, fila in enumerate(linea):
+                lineas_en[rodillo][fila] |= 1 << numero
+        # _por_ventana[r][código]: máscara de líneas de cada símbolo en ese rodillo (n máscaras)
+        self._por_ventana = []
+        for rodillo in range(rodillos):
+            por_codigo = []
+            for codigo in range(n ** filas):
+                mascaras = [0] * n
+                for fila, simbolo in enumerate(self.ventana(codigo)):
+                    mascaras[simbolo] |= lineas_en[rodillo][fila]
+                por_codigo.append(tuple(mascaras))
+            self._por_ventana.append(por_codigo)
+
+        reglas = reglas or tabla_lineas
+        ordenadas = ([r for r in reglas.items() if COMODIN not in r[0]]
+                     + [r for r in reglas.items() if COMODIN in r[0]])
+        self.reglas = []  # (regla completa, premio, casillas exigidas) en orden de prioridad
+        for regla, premio in ordenadas:
+            if len(regla) > rodillos:
+                raise ValueError(f"La regla {regla} tiene más de {rodillos} símbolos")
+            completa = tuple(regla) + (COMODIN,) * (rodillos - len(regla))
+            # Casilla = posición de la máscara de ese símbolo en ese rodillo al juntar los rodillos
+            casillas = tuple(rodillo * n + self.indice[s] for rodillo, s in enumerate(completa) if s != COMODIN)
+            if not casillas:
+                raise ValueError(f"La regla {regla} no exige ningún símbolo")
+            self.reglas.append((completa, premio, casillas))
+        self._reglas = [(premio, casillas[0], casillas[1:]) for _, premio, casillas in self.reglas]
+
+        # Dispersos: apariciones en cada ventana y premio según el total (índice = apariciones en la grilla)
+        self.dispersos = []
+        for simbolo, pagos in (dispersos if dispersos_simbolo is None else dispersos_simbolo).items():
+            i = self.indice[simbolo]
+            por_cantidad = [0] * (rodillos * filas + 1)
+            for minimo, premio in sorted(pagos.items()):
+                for cantidad in range(minimo, len(por_cantidad)):
+                    por_cantidad[cantidad] = premio
+            apariciones = [self.ventana(codigo).count(i) for codigo in range(n ** filas)]
+            self.dispersos.append((simbolo, apariciones, por_cantidad))
+
+    def codigo(self, ventana):
+        """Código de los FILAS índices de símbolo que se ven en un rodillo (de arriba a abajo)"""
+        codigo = 0
+        for simbolo in ventana:
+            codigo = codigo * len(self.simbolos) + simbolo
+        return codigo
+
+    def ventana(self, codigo):
+        """Índices de símbolo de un código de ventana (de arriba a abajo)"""
+        n = len(self.simbolos)
+        return [codigo // n ** (self.filas - 1 - f) % n for f in range(self.filas)]
+
+    def codificar(self, grilla):
+        """Códigos de una grilla dada como RODILLOS columnas de FILAS símbolos"""
+        return [self.codigo([self.indice[s] for s in columna]) for columna in grilla]
+
+    def grilla(self, codigos):
+        """La grilla como FILAS filas de símbolos (para mostrarla)"""
+        columnas = [[self.simbolos[s] for s in self.ventana(codigo)] for codigo in codigos]
+        return [[columna[f] for columna in columnas] for f in range(self.filas)]
+
+    def _mascaras(self, codigos):
+        mascaras = ()
+        for por_codigo, codigo in zip(self._por_ventana, codigos):
+            mascaras += por_codigo[codigo]
+        return mascaras
+
+    def premio(self, codigos, activas=None):
+        """Premio total de un giro (un código por rodillo). `activas` = máscara de las líneas apostadas"""
+        mascaras = self._mascaras(codigos)
+        libres = self.todas if activas is None else self.todas & activas
+        total = 0
+        for premio, primera, resto in self._reglas:
+            ganan = mascaras[primera] & libres
+            if ganan:
+                for casilla in resto:
+                    ganan &= mascaras[casilla]
+                    if not ganan:
+                        break
+                else:
+                    total += premio * ganan.bit_count()
+                    libres ^= ganan
+        for _, apariciones, por_cantidad in self.dispersos:
+            total += por_cantidad[sum(map(apariciones.__getitem__, codigos))]
+        return total
+
+    def evaluar(self, codigos, activas=None):
+        """Como premio(), pero con el detalle de cada línea y disperso que pagó (ResultadoLineas)"""
+        mascaras = self._mascaras(codigos)
+        libres = self.todas if activas is None else self.todas & activas
+        lineas = []
+        for regla, premio, casillas in self.reglas:
+            ganan = libres
+            for casilla in casillas:
+                ganan &= mascaras[casilla]
+            libres ^= ganan
+            while ganan:
+                bit = ganan & -ganan
+                lineas.append((bit.bit_length(), regla, premio))
+                ganan ^= bit
+        lineas.sort()
+        pagos_dispersos = []
+        for simbolo, apariciones, por_cantidad in self.dispersos:
+            cantidad = sum(apariciones[codigo] for codigo in codigos)
+            if por_cantidad[cantidad]:
+                pagos_dispersos.append((simbolo, cantidad, por_cantidad[cantidad]))
+        total = sum(premio for _, _, premio in lineas) + sum(premio for _, _, premio in pagos_dispersos)
+        return ResultadoLineas(total, lineas, pagos_dispersos)
+
+
+class TirasRodillos:
+    """
+    Tiras virtuales de los rodillos: cada giro elige una parada por rodillo
+    y se ven FILAS paradas seguidas. El código de ventana de cada parada se
+    calcula una vez, así que girar devuelve directamente lo que evalúa TablaLineas.
+    """
+
+    def __init__(self, tiras=None, tabla=None):
+        tabla = tabla or TABLA_LINEAS
+        tiras = tiras or [TIRA] * tabla.rodillos
+        if len(tiras) != tabla.rodillos:
+            raise ValueError(f"Se necesitan {tabla.rodillos} tiras")
+        self.tiras = [tuple(tira) for tira in tiras]
+        self._codigos = []
+        for tira in self.tiras:
+            indices = [tabla.indice[s] for s in tira]
+            # La ventana da la vuelta al final de la tira
+            self._codigos.append([tabla.codigo([indices[(parada + f) % len(indices)] for f in range(tabla.filas)])
+                                  for parada in range(len(indices))])
+
+    def girar(self, rng):
+        """Código de ventana de cada rodillo en un giro"""
+        return [rng.choice(codigos) for codigos in self._codigos]
+
+
+# La tabla y las tiras del tragamonedas de 5x3
+TABLA_LINEAS = TablaLineas()
+TIRAS = TirasRodillos()
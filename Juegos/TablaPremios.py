@@ -0,0 +1,117 @@
+import json
+import os
+from itertools import product
+
+# Premios configurados (p. ej. por Juegos/AjusteTragamonedas.py); si no existe, se usa tabla_ganadora
+ARCHIVO_PREMIOS = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "tabla_premios.json"))
+
+COMODIN = "*"  # en una regla, cualquier símbolo en esa posición
+
+simbolos = ["🍒", "🍋", "7️⃣", "BAR", "🔔"]
+tabla_ganadora = {
+    # Combinaciones exactas (tres símbolos iguales)
+    ("7️⃣", "7️⃣", "7️⃣"): 50000,     # Premio mayor
+    ("BAR", "BAR", "BAR"): 25000,     # Premio alto
+    ("🍒", "🍒", "🍒"): 20000,         # Premio medio
+    ("🔔", "🔔", "🔔"): 15000,         # Premio medio-bajo
+    ("🍋", "🍋", "🍋"): 10000,         # Premio bajo
+
+    # Combinaciones parciales con *=(cualquier elemento en esa posicion)
+    ("7️⃣", "*", "7️⃣"): 15000,        # Sietes en los extremos
+    ("BAR", "BAR", "*"): 10000,        # Dos BAR al inicio
+    ("🔔", "🔔", "*"): 7000,           # Dos campanas al inicio
+    ("🍒", "*", "🍒"): 6000,           # Cerezas en los extremos
+    ("🍒", "🍒", "*"): 5000,           # Dos cerezas al inicio
+    ("*", "🍒", "🍒"): 5000,           # Dos cerezas al final
+    ("*", "7️⃣", "*"): 3000,          # Un siete en el medio
+    ("*", "BAR", "*"): 2000,          # Un BAR en el medio
+    ("🍒", "*", "*"): 2000            # Una cereza al inicio
+}
+
+SIN_REGLA = -1
+
+
+class TablaPremios:
+    """
+    Tabla de premios compilada: para cada combinación posible de los
+    rodillos (5³ = 125 con 5 símbolos) se calcula una sola vez qué regla
+    la paga, y el premio queda en un arreglo plano indexado por los
+    índices de los símbolos. Evaluar una tirada es una sola indexación.
+
+    La prioridad es la de siempre: primero una regla exacta (sin
+    comodines) y si no, la primera regla con comodines que coincida,
+    en el orden de `reglas`.
+    """
+
+    def __init__(self, reglas=None, simbolos_rodillo=None):
+        self.simbolos = tuple(simbolos_rodillo or simbolos)
+        self.reglas = tuple((reglas or tabla_ganadora).items())  # (combinación, premio) en orden de prioridad
+        self.indice = {simbolo: i for i, simbolo in enumerate(self.simbolos)}
+        exactas = {combo: i for i, (combo, _) in enumerate(self.reglas) if COMODIN not in combo}
+        regla_de = []
+        for combo in product(self.simbolos, repeat=3):
+            numero = exactas.get(combo, SIN_REGLA)
+            if numero == SIN_REGLA:
+                for i, (regla, _) in enumerate(self.reglas):
+                    if all(r == COMODIN or r == s for r, s in zip(regla, combo)):
+                        numero = i
+                        break
+            regla_de.append(numero)
+        self.regla_de = tuple(regla_de)  # número de regla que paga cada combinación (SIN_REGLA si ninguna)
+        self.premios = tuple(self.reglas[n][1] if n != SIN_REGLA else 0 for n in regla_de)
+
+    def __len__(self):
+        return len(self.premios)
+
+    def posicion(self, a, b, c):
+        """Posición en el arreglo de la combinación de índices de símbolo (a, b, c)"""
+        n = len(self.simbolos)
+        return (a * n + b) * n + c
+
+    def combinacion(self, posicion):
+        """Símbolos de una posición del arreglo"""
+        n = len(self.simbolos)
+        return (self.simbolos[posicion // (n * n)], self.simbolos[posicion // n % n], self.simbolos[posicion % n])
+
+    def evaluar(self, combo):
+        """Premio de una combinación de símbolos"""
+        i = self.indice
+        return self.premios[self.posicion(i[combo[0]], i[combo[1]], i[combo[2]])]
+
+    @property
+    def premio_maximo(self):
+        return max(self.premios)
+
+    def con_premios(self, premios):
+        """Misma tabla (mismas reglas y prioridad) con otros montos, uno por regla"""
+        return TablaPremios({combo: int(p) for (combo, _), p in zip(self.reglas, premios)}, self.simbolos)
+
+    def to_dict(self):
+        # Lista y no diccionario: el orden de las reglas es su prioridad
+        return {"simbolos": list(self.simbolos), "reglas": [[list(combo), premio] for combo, premio in self.reglas]}
+
+    @staticmethod
+    def from_dict(data):
+        return TablaPremios({tuple(combo): premio for combo, premio in data["reglas"]}, data.get("simbolos"))
+
+
+def guardar_tabla(tabla, archivo=ARCHIVO_PREMIOS):
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    with open(archivo, "w", encoding="utf-8") as f:
+        json.dump(tabla.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def cargar_tabla(archivo=ARCHIVO_PREMIOS):
+    """Tabla configurada en `archivo`, o la de tabla_ganadora si no existe"""
+    if not os.path.exists(archivo):
+        return TablaPremios()
+    with open(archivo, encoding="utf-8") as f:
+        return TablaPremios.from_dict(json.load(f))
+
+
+# La tabla que leen el juego y las pantallas de premios
+TABLA = cargar_tabla()
+
+
+def evaluar(combo):
+    return TABLA.evaluar(combo)
@@ -1,128 +1,191 @@
-import random
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from controller.jugador_controller  import buscar_jugador, guardar_jugadores, cargar_jugadores
-
-simbolos = ["🍒", "🍋", "7️⃣", "BAR", "🔔"]
-tabla_ganadora = {
-    # Combinaciones exactas (tres símbolos iguales)
-    ("7️⃣", "7️⃣", "7️⃣"): 50000,     # Premio mayor
-    ("BAR", "BAR", "BAR"): 25000,     # Premio alto
-    ("🍒", "🍒", "🍒"): 20000,         # Premio medio
-    ("🔔", "🔔", "🔔"): 15000,         # Premio medio-bajo
-    ("🍋", "🍋", "🍋"): 10000,         # Premio bajo
-
-    # Combinaciones parciales con *=(cualquier elemento en esa posicion)
-    ("7️⃣", "*", "7️⃣"): 15000,        # Sietes en los extremos
-    ("BAR", "BAR", "*"): 10000,        # Dos BAR al inicio
-    ("🔔", "🔔", "*"): 7000,           # Dos campanas al inicio
-    ("🍒", "*", "🍒"): 6000,           # Cerezas en los extremos
-    ("🍒", "🍒", "*"): 5000,           # Dos cerezas al inicio
-    ("*", "🍒", "🍒"): 5000,           # Dos cerezas al final
-    ("*", "7️⃣", "*"): 3000,          # Un siete en el medio
-    ("*", "BAR", "*"): 2000,          # Un BAR en el medio
-    ("🍒", "*", "*"): 2000            # Una cereza al inicio
-}
+from Juegos.Motor import (MotorTragamonedas, MotorMultilinea, ErrorJuego, COSTO_JUGADA, FIN_TIRADAS, FIN_PERDIDA, FIN_META, FIN_SALDO,
+                          COMBINACION_POZO, APORTE_POZO, pozo_tragamonedas)
+from Juegos.TablaPremios import TABLA, COMODIN
+from Juegos.AnalisisTragamonedas import analizar
+from Juegos.Rodillos import RODILLOS
 
-def evaluar(combo):
-    if combo in tabla_ganadora:
-        return tabla_ganadora[combo]
-    for regla, premio in tabla_ganadora.items():
-        if all(regla[i] == "*" or regla[i] == combo[i] for i in range(3)):
-            return premio
-    return 0
 
 def jugar_tragamonedas_con_usuario():
+    """Consola del tragamonedas: pregunta antes de cada tirada y muestra lo que devuelve el motor"""
+    motor = MotorTragamonedas(pozo=pozo_tragamonedas())
     id = input("Ingresa tu ID: ").upper()
-    jugador = buscar_jugador(id)
-    if not jugador:
-        print("Jugador no encontrado.")
+    try:
+        saldo = motor.iniciar(id)
+    except ErrorJuego as e:
+        print(e)
         return
 
-    saldo = jugador.saldo_actual
-    costo_jugada = 1000
-
-    print(f"\n🎰 Bienvenido {jugador.nombre}")
+    print(f"\n🎰 Bienvenido {motor.jugador.nombre}")
     print(f"💰 Saldo actual: ${saldo:.2f}")
+    if motor.pozo is not None:
+        print(f"💎 Pozo progresivo: ${motor.pozo.monto:,.2f}")
 
-    while saldo >= costo_jugada:
+    while motor.puede_girar:
         eleccion = input("¿Jugar tragamonedas? (S/N): ").upper()
         if eleccion != "S":
             print("👋 ¡Gracias por jugar!")
             break
 
-        saldo -= costo_jugada
-        jugada = (random.choice(simbolos), random.choice(simbolos), random.choice(simbolos))
+        try:
+            tirada = motor.girar()
+        except ErrorJuego as e:
+            print(e)
+            return
+        jugada = tirada.combinacion
         print(f"🎲 Jugada: {jugada[0]} | {jugada[1]} | {jugada[2]}")
-
-        premio = 0
-        for a in simbolos:
-            for b in simbolos:
-                for c in simbolos:
-                    if (a, b, c) == jugada:
-                        premio = evaluar(jugada)
-                        break
-
-        if premio > 0:
-            print(f"🎉 ¡Ganaste ${premio}!")
-            saldo += premio
-            jugador.agregar_historial(f"Ganó ${premio} con {jugada}")
+        if tirada.pozo is not None:
+            print(f"💎💎💎 ¡GANASTE EL POZO PROGRESIVO: ${tirada.pozo.monto:,.2f}! 💎💎💎")
+        if tirada.gano:
+            print(f"🎉 ¡Ganaste ${tirada.premio}!")
         else:
             print("😢 No ganaste esta vez.")
-            jugador.agregar_historial(f"Perdió ${costo_jugada} con {jugada}")
+        print(f"💰 Saldo actualizado: ${tirada.saldo:.2f}")
 
-        print(f"💰 Saldo actualizado: ${saldo:.2f}")
-
-    if saldo < costo_jugada:
+    if not motor.puede_girar:
         print("💸 Te has quedado sin saldo.")
 
-    jugador.saldo_actual = saldo #  Actualizar el saldo 
-    jugadores = cargar_jugadores()
-    for i, j in enumerate(jugadores):
-        if j.id == jugador.id:
-            jugadores[i] = jugador
+    # Fin de la sesión: guardar ya las tiradas pendientes
+    motor.liquidar()
+
+
+MENSAJES_FIN = {
+    FIN_TIRADAS: "✅ Se jugaron todas las tiradas.",
+    FIN_PERDIDA: "🛑 Se alcanzó el límite de pérdida.",
+    FIN_META: "🎯 ¡Se alcanzó la meta de ganancia!",
+    FIN_SALDO: "🛑 El saldo llegó al mínimo indicado.",
+}
+
+
+def _leer_monto(mensaje):
+    """Monto opcional: Enter = sin límite"""
+    while True:
+        texto = input(mensaje).strip()
+        if not texto:
+            return None
+        try:
+            monto = float(texto)
+        except ValueError:
+            print("❌ Ingresa un número o deja vacío.")
+            continue
+        if monto < 0:
+            print("❌ El monto no puede ser negativo.")
+            continue
+        return monto
+
+
+def autojugar_tragamonedas_con_usuario():
+    """Autojuego: muchas tiradas seguidas sin preguntar, con límites de parada"""
+    motor = MotorTragamonedas(pozo=pozo_tragamonedas())
+    id = input("Ingresa tu ID: ").upper()
+    try:
+        saldo = motor.iniciar(id)
+    except ErrorJuego as e:
+        print(e)
+        return
+
+    print(f"\n🤖 Autojuego de {motor.jugador.nombre} (cada jugada cuesta ${COSTO_JUGADA:,})")
+    print(f"💰 Saldo actual: ${saldo:.2f}")
+    try:
+        tiradas = int(input("¿Cuántas tiradas? "))
+    except ValueError:
+        print("❌ Cantidad inválida.")
+        return
+    limite = _leer_monto("Límite de pérdida (Enter = sin límite): ")
+    meta = _leer_monto("Meta de ganancia (Enter = sin meta): ")
+    minimo = _leer_monto("Saldo mínimo a conservar (Enter = $0): ") or 0
+
+    try:
+        resumen = motor.autojugar(tiradas, limite, meta, minimo)
+    except ErrorJuego as e:
+        print(e)
+        return
+    print(f"\n{MENSAJES_FIN[resumen.motivo]}")
+    if resumen.tiradas == 0:
+        print("😶 No se jugó ninguna tirada.")
+        return
+    print(f"🎲 Tiradas: {resumen.tiradas:,} (pagaron {resumen.aciertos:,})")
+    print(f"💸 Apostado: ${resumen.apostado:,}  🎁 Pagado: ${resumen.pagado:,.2f}")
+    print(f"🏆 Premio mayor: ${resumen.premio_mayor:,.2f}")
+    for pago in resumen.pozos:
+        print(f"💎 ¡Ganaste el pozo progresivo #{pago.numero}: ${pago.monto:,.2f}!")
+    print(f"{'🎉 Ganancia' if resumen.neto >= 0 else '😢 Pérdida'}: ${abs(resumen.neto):,.2f}")
+    print(f"💰 Saldo actualizado: ${resumen.saldo:.2f}")
+
+
+def jugar_multilinea_con_usuario():
+    """Consola del tragamonedas de 5x3: muestra la grilla y las líneas que pagaron"""
+    id = input("Ingresa tu ID: ").upper()
+    texto = input("¿Cuántas líneas apuestas? (1-25, Enter = 25): ").strip()
+    try:
+        motor = MotorMultilinea(int(texto) if texto else None)
+        saldo = motor.iniciar(id)
+    except ValueError:
+        print("❌ Cantidad de líneas inválida.")
+        return
+    except ErrorJuego as e:
+        print(e)
+        return
+
+    print(f"\n🎰 Bienvenido {motor.jugador.nombre}: {motor.lineas} líneas a ${motor.costo_linea:,} "
+          f"(${motor.costo_giro:,} por giro)")
+    print(f"💰 Saldo actual: ${saldo:.2f}")
+
+    while motor.puede_girar:
+        if input("¿Girar? (S/N): ").upper() != "S":
+            print("👋 ¡Gracias por jugar!")
             break
-    guardar_jugadores(jugadores)
+        try:
+            giro = motor.girar()
+        except ErrorJuego as e:
+            print(e)
+            return
+        print()
+        for fila in giro.grilla:
+            print("   " + " | ".join(fila))
+        for numero, regla, premio in giro.lineas:
+            print(f"   ✨ Línea {numero}: {' '.join(regla).replace(COMODIN, '❓')} → ${premio:,}")
+        for simbolo, cantidad, premio in giro.dispersos:
+            print(f"   💫 {cantidad} {simbolo} dispersos → ${premio:,}")
+        if giro.gano:
+            print(f"🎉 ¡Ganaste ${giro.premio:,}!")
+        else:
+            print("😢 No ganaste esta vez.")
+        print(f"💰 Saldo actualizado: ${giro.saldo:.2f}")
+
+    if not motor.puede_girar:
+        print("💸 No te alcanza el saldo para otro giro.")
+    motor.liquidar()
 
 
 def mostrar_tabla_premios():
-    """Muestra la tabla de premios del tragamonedas"""
-    simbolos = ["🍒", "🍋", "7️⃣", "BAR", "🔔"]
-    tabla_ganadora = {
-        ("7️⃣", "7️⃣", "7️⃣"): 50000,
-        ("BAR", "BAR", "BAR"): 25000,
-        ("🍒", "🍒", "🍒"): 20000,
-        ("🔔", "🔔", "🔔"): 15000,
-        ("🍋", "🍋", "🍋"): 10000,
-        ("7️⃣", "*", "7️⃣"): 15000,
-        ("BAR", "BAR", "*"): 10000,
-        ("🔔", "🔔", "*"): 7000,
-        ("🍒", "*", "🍒"): 6000,
-        ("🍒", "🍒", "*"): 5000,
-        ("*", "🍒", "🍒"): 5000,
-        ("*", "7️⃣", "*"): 3000,
-        ("*", "BAR", "*"): 2000,
-        ("🍒", "*", "*"): 2000
-    }
-    
+    """Muestra la tabla de premios del tragamonedas (la misma tabla compilada que usa el juego)"""
     print("\n" + "=" * 50)
     print("🏆 TABLA DE PREMIOS - TRAGAMONEDAS")
     print("=" * 50)
     print("💰 COMBINACIONES GANADORAS:")
     print()
     
-    premios_ordenados = sorted(tabla_ganadora.items(), key=lambda x: x[1], reverse=True)
+    premios_ordenados = sorted(TABLA.reglas, key=lambda x: x[1], reverse=True)
     
     for combo, premio in premios_ordenados:
         combo_str = " | ".join(combo)
-        combo_str = combo_str.replace("*", "❓")
+        combo_str = combo_str.replace(COMODIN, "❓")
         print(f"  {combo_str:<15} → ${premio:,}")
     
     print("\n📋 NOTAS:")
     print("  • ❓ = Cualquier símbolo")
-    print("  • Costo por jugada: $100")
-    print(f"  • Premio máximo: ${max(tabla_ganadora.values()):,}")
+    print(f"  • Costo por jugada: ${COSTO_JUGADA:,}")
+    print(f"  • Premio máximo: ${TABLA.premio_maximo:,}")
+    analisis = analizar(COSTO_JUGADA, RODILLOS.pesos)
+    print(f"  • Retorno al jugador (RTP): {analisis.rtp:.2%}")
+    print(f"  • Alguna combinación paga en el {analisis.frecuencia_aciertos:.1%} de las jugadas")
+    pozo = pozo_tragamonedas()
+    if pozo is not None:
+        print(f"  • 💎 Pozo progresivo: ${pozo.monto:,.2f} para {' | '.join(COMBINACION_POZO)} "
+              f"(además del premio; recibe el {APORTE_POZO:.0%} de cada jugada)")
     print("=" * 50)
 
 def mostrar_reglas():
@@ -132,13 +195,12 @@ def mostrar_reglas():
     print("🎯 OBJETIVO:")
     print("   Conseguir combinaciones ganadoras de símbolos")
     print("\n🎮 CÓMO JUGAR:")
-    print("   • Cada jugada cuesta: $100")
+    print(f"   • Cada jugada cuesta: ${COSTO_JUGADA:,}")
     print("   • Se generan 3 símbolos aleatorios")
     print("   • Si formas una combinación ganadora, recibes un premio")
     print("   • Los premios varían según la combinación")
     print("\n🎰 SÍMBOLOS:")
-    simbolos = ["🍒", "🍋", "7️⃣", "BAR", "🔔"]
-    for simbolo in simbolos:
+    for simbolo in TABLA.simbolos:
         print(f"   • {simbolo}")
     print("\n💡 CONSEJOS:")
     print("   • 7️⃣ 7️⃣ 7️⃣ es la combinación más valiosa")
@@ -153,9 +215,11 @@ def menu_tragamonedas():
         print("🎰 CASINO - TRAGAMONEDAS DELUXE")
         print("=" * 50)
         print("1. 🎮 Jugar Tragamonedas")
-        print("2. 🏆 Ver tabla de premios")
-        print("3. 📋 Ver reglas del juego")
-        print("4. 🚪 Salir")
+        print("2. 🤖 Autojuego")
+        print("3. 🎰 Tragamonedas 5x3 (25 líneas)")
+        print("4. 🏆 Ver tabla de premios")
+        print("5. 📋 Ver reglas del juego")
+        print("6. 🚪 Salir")
         print("=" * 50)
         
         opcion = input("Selecciona una opción: ").strip()
@@ -177,18 +241,24 @@ def menu_tragamonedas():
                     print("❌ Responde 's' para sí o 'n' para no.")
         
         elif opcion == "2":
+            autojugar_tragamonedas_con_usuario()
+
+        elif opcion == "3":
+            jugar_multilinea_con_usuario()
+
+        elif opcion == "4":
             mostrar_tabla_premios()
         
-        elif opcion == "3":
+        elif opcion == "5":
             mostrar_reglas()
         
-        elif opcion == "4":
+        elif opcion == "6":
             print("👋 ¡Gracias por visitar nuestro casino!")
             print("🍀 ¡Que tengas mucha suerte en tu próxima visita!")
             break
         
         else:
-            print("❌ Opción inválida. Por favor selecciona 1, 2, 3 o 4.")
+            print("❌ Opción inválida. Por favor selecciona del 1 al 6.")
 
 
 
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.Aleatorio import nuevo_random
+
+# Cartas codificadas por rango: el código es el índice en estas tablas
+NOMBRES = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+VALORES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)  # J, Q, K = 10, A = 11
+RANGOS = len(NOMBRES)
+PALOS = 4
+
+MAZOS_POR_ZAPATO = 6
+PENETRACION = 0.75  # fracción del zapato que se reparte antes de volver a barajar
+
+
+class Zapato:
+    """
+    Zapato de varios mazos como en las mesas reales: las cartas se guardan
+    como códigos de rango en un bytearray (un byte por carta), se reparten
+    en O(1) avanzando una posición y solo se vuelve a barajar cuando se
+    llega a la carta de corte (al empezar la mano siguiente).
+    """
+
+    def __init__(self, mazos=MAZOS_POR_ZAPATO, penetracion=PENETRACION, rng=None):
+        if mazos < 1:
+            raise ValueError("El zapato necesita al menos un mazo")
+        if not 0 < penetracion <= 1:
+            raise ValueError("La penetración debe estar entre 0 y 1")
+        self.mazos = mazos
+        self.penetracion = penetracion
+        self.rng = rng or nuevo_random()  # flujo propio del servicio de Juegos/Aleatorio.py
+        self._cartas = bytearray(range(RANGOS)) * (PALOS * mazos)
+        self.corte = int(len(self._cartas) * penetracion)
+        self.barajar()
+
+    def barajar(self):
+        self.rng.shuffle(self._cartas)
+        self._posicion = 0
+
+    @property
+    def necesita_barajar(self):
+        """Ya salió la carta de corte: hay que barajar antes de la próxima mano"""
+        return self._posicion >= self.corte
+
+    @property
+    def restantes(self):
+        return len(self._cartas) - self._posicion
+
+    def repartir(self):
+        """Devuelve el código de la próxima carta"""
+        if self._posicion >= len(self._cartas):
+            # Solo pasa con penetración 1 (o casi) en medio de una mano: se baraja lo que haya
+            self.barajar()
+        codigo = self._cartas[self._posicion]
+        self._posicion += 1
+        return codigo
+
+    def cartas_restantes(self):
+        """Códigos de las cartas que faltan repartir (en el orden del zapato)"""
+        return bytes(self._cartas[self._posicion:])
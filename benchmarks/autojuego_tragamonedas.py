@@ -0,0 +1,80 @@
+"""
+Compara N tiradas de tragamonedas jugadas una por una (MotorTragamonedas.girar)
+con las mismas N en un autojuego (MotorTragamonedas.autojugar): tiempo,
+escrituras al almacenamiento y retorno, que debe acercarse al RTP exacto
+de Juegos/AnalisisTragamonedas.py. Al final verifica el saldo guardado.
+
+Corre en una carpeta temporal: no toca data/ del proyecto.
+
+Uso: python benchmarks/autojuego_tragamonedas.py [tiradas] [json|sqlite]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+SALDO_INICIAL = 10 ** 12
+
+
+def contar_escrituras(repositorio):
+    """Cuenta las escrituras de la escritura diferida (cada vaciado es un modificar_varios)"""
+    original = repositorio.modificar_varios
+    contador = [0]
+
+    def modificar_varios(cambios, *args, **kwargs):
+        contador[0] += 1
+        return original(cambios, *args, **kwargs)
+
+    repositorio.modificar_varios = modificar_varios
+    return contador
+
+
+def main():
+    tiradas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    os.environ["CASINO_ALMACENAMIENTO"] = sys.argv[2] if len(sys.argv) > 2 else "json"
+    with tempfile.TemporaryDirectory() as carpeta:
+        # El controlador usa data/ relativo a la carpeta actual
+        os.chdir(carpeta)
+        from controller import jugador_controller
+        from controller.jugador_controller import (registrar_jugadores_bulk, saldo_jugador, buscar_jugador,
+                                                   cerrar_almacenamiento)
+        from Juegos.Motor import MotorTragamonedas
+        from Juegos.AnalisisTragamonedas import analizar
+
+        registrar_jugadores_bulk([{"nombre": "Banco", "id": "BANCO", "saldo_inicial": SALDO_INICIAL}])
+        escrituras = contar_escrituras(jugador_controller.obtener_escritura().repositorio)
+        motor = MotorTragamonedas()
+        motor.iniciar("BANCO")
+        rtp = analizar(motor.costo_jugada, motor.rodillos.pesos).rtp
+        print(f"🎰 {tiradas:,} tiradas a ${motor.costo_jugada:,} ({os.environ['CASINO_ALMACENAMIENTO']}), "
+              f"RTP exacto {rtp:.4f}\n")
+
+        inicio = time.perf_counter()
+        pagado = 0
+        for _ in range(tiradas):
+            pagado += motor.girar().premio
+        motor.liquidar()
+        duracion = time.perf_counter() - inicio
+        print(f"Una por una: {duracion * 1000:9.2f} ms  {escrituras[0]:>4} escrituras  "
+              f"retorno {pagado / (tiradas * motor.costo_jugada):.4f}")
+
+        escrituras[0] = 0
+        inicio = time.perf_counter()
+        resumen = motor.autojugar(tiradas)
+        duracion = time.perf_counter() - inicio
+        print(f"Autojuego:   {duracion * 1000:9.2f} ms  {escrituras[0]:>4} escrituras  "
+              f"retorno {resumen.pagado / resumen.apostado:.4f}")
+
+        esperado = SALDO_INICIAL + pagado - tiradas * motor.costo_jugada + resumen.neto
+        guardado = buscar_jugador("BANCO").saldo_actual
+        print(f"\n{'✅' if saldo_jugador('BANCO') == guardado == esperado else '❌'} "
+              f"Saldo guardado ${guardado:,.2f} (esperado ${esperado:,.2f})")
+        cerrar_almacenamiento()
+        os.chdir(RAIZ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Prueba de estrés del almacenamiento de jugadores con varios procesos.
+
+Lanza varios procesos que apuestan al mismo tiempo sobre un grupo pequeño de
+jugadores (para forzar choques) y al final comprueba que el saldo de cada
+jugador es exactamente el inicial más todos los movimientos hechos.
+
+Con "tabla" las apuestas van solo a la tabla de saldos compartida (mmap),
+como jugadas pendientes; el proceso principal la tiene abierta todo el
+tiempo (si nadie la tiene abierta, el siguiente que la abre la vacía).
+
+Uso: python benchmarks/estres_concurrencia.py [json|sqlite|tabla] [procesos] [apuestas_por_proceso]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from model.jugador import Jugador
+from model.evento import Evento, BLACKJACK, GANA, PIERDE
+from persistencia.repositorio import RepositorioJSON
+from persistencia.repositorio_sqlite import RepositorioSQLite
+from persistencia.tabla_saldos import TablaSaldos
+
+SALDO_INICIAL = 100000
+IDS = [f"J{i}" for i in range(8)]
+
+
+def crear_repositorio(tipo, carpeta):
+    if tipo == "tabla":
+        return TablaSaldos(os.path.join(carpeta, "saldos.bin"))
+    if tipo == "sqlite":
+        return RepositorioSQLite(os.path.join(carpeta, "jugadores.db"))
+    # Límite bajo para que también se compacte varias veces durante la prueba
+    return RepositorioJSON(os.path.join(carpeta, "jugadores.json"), limite_journal=50,
+                           sincronizar_disco=False)
+
+
+def apostar(tipo, carpeta, semilla, apuestas):
+    """Trabajo de un proceso: hace apuestas y devuelve el total movido por jugador"""
+    repositorio = crear_repositorio(tipo, carpeta)
+    rng = random.Random(semilla)
+    movimientos = {id: 0 for id in IDS}
+    for _ in range(apuestas):
+        id = rng.choice(IDS)
+        delta = rng.choice([-1000, -500, -100, 100, 500, 1500])
+
+        def cambio(jugador, delta=delta):
+            jugador.saldo_actual += delta
+            if delta > 0:
+                evento = Evento(BLACKJACK, delta, 2 * delta, GANA, saldo=jugador.saldo_actual)
+            else:
+                evento = Evento(BLACKJACK, -delta, 0, PIERDE, saldo=jugador.saldo_actual)
+            jugador.agregar_historial(evento)
+
+        if tipo == "tabla":
+            repositorio.sumar(id, delta)
+        else:
+            repositorio.modificar(id, cambio)
+        movimientos[id] += delta
+    repositorio.cerrar()
+    return movimientos
+
+
+def main():
+    tipo = sys.argv[1] if len(sys.argv) > 1 else "json"
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    apuestas = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        repositorio = crear_repositorio(tipo, carpeta)
+        if tipo == "tabla":
+            for id in IDS:
+                repositorio.cargar(id, lambda: (SALDO_INICIAL, SALDO_INICIAL, 0))
+        else:
+            repositorio.reemplazar_todos([Jugador(f"Jugador {id}", id, SALDO_INICIAL) for id in IDS])
+            repositorio.cerrar()
+
+        inicio = time.perf_counter()
+        with multiprocessing.Pool(procesos) as pool:
+            resultados = pool.starmap(apostar, [(tipo, carpeta, semilla, apuestas)
+                                                for semilla in range(procesos)])
+        duracion = time.perf_counter() - inicio
+
+        esperado = {id: SALDO_INICIAL + sum(r[id] for r in resultados) for id in IDS}
+        if tipo != "tabla":
+            repositorio = crear_repositorio(tipo, carpeta)
+        errores = 0
+        for id in IDS:
+            if tipo == "tabla":
+                _, guardado, pendiente, version = repositorio.obtener(id)
+                saldo = guardado + pendiente
+            else:
+                jugador = repositorio.obtener(id)
+                saldo, version = jugador.saldo_actual, jugador.version
+            estado = "OK" if saldo == esperado[id] else "ERROR"
+            errores += estado == "ERROR"
+            print(f"{id:<4} esperado ${esperado[id]:>10.2f}  guardado ${saldo:>10.2f}  "
+                  f"versión {version:<6} {estado}")
+        repositorio.cerrar()
+
+    total = procesos * apuestas
+    print(f"\n{tipo}: {total} apuestas en {procesos} procesos, {duracion:.2f} s "
+          f"({total / duracion:.0f} apuestas/s)")
+    if errores:
+        print(f"❌ {errores} jugadores con saldo incorrecto (actualizaciones perdidas)")
+        sys.exit(1)
+    print("✅ Ningún movimiento se perdió")
+
+
+if __name__ == "__main__":
+    main()
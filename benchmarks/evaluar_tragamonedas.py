@@ -0,0 +1,59 @@
+"""
+Micro-benchmark de la evaluación de una tirada del tragamonedas: el evaluar
+anterior (búsqueda en el diccionario y después recorrido de las reglas con
+comodines) contra la tabla compilada de Juegos/TablaPremios.py (una sola
+indexación en un arreglo de 125 premios).
+
+Antes de medir verifica que las 125 combinaciones den el mismo premio.
+
+Uso: python benchmarks/evaluar_tragamonedas.py [tiradas]
+"""
+import os
+import random
+import sys
+import time
+from itertools import product
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.TablaPremios import TablaPremios, tabla_ganadora, simbolos
+
+# Compilada desde tabla_ganadora, aunque haya premios configurados en data/tabla_premios.json
+TABLA = TablaPremios()
+
+
+def evaluar_anterior(combo):
+    """Copia del evaluar que usaba Tragamonedas antes de compilar la tabla"""
+    if combo in tabla_ganadora:
+        return tabla_ganadora[combo]
+    for regla, premio in tabla_ganadora.items():
+        if all(regla[i] == "*" or regla[i] == combo[i] for i in range(3)):
+            return premio
+    return 0
+
+
+def main():
+    tiradas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    distintas = [c for c in product(simbolos, repeat=3) if evaluar_anterior(c) != TABLA.evaluar(c)]
+    print(f"{'✅' if not distintas else '❌'} {len(TABLA)} combinaciones comparadas, {len(distintas)} distintas")
+
+    rng = random.Random(1)
+    n = len(simbolos)
+    indices = [(rng.randrange(n), rng.randrange(n), rng.randrange(n)) for _ in range(tiradas)]
+    combos = [(simbolos[a], simbolos[b], simbolos[c]) for a, b, c in indices]
+    print(f"🎰 {tiradas:,} tiradas\n")
+
+    inicio = time.perf_counter()
+    total_anterior = sum(evaluar_anterior(c) for c in combos)
+    anterior = time.perf_counter() - inicio
+
+    premios, posicion = TABLA.premios, TABLA.posicion
+    inicio = time.perf_counter()
+    total_compilada = sum(premios[posicion(a, b, c)] for a, b, c in indices)
+    compilada = time.perf_counter() - inicio
+
+    print(f"anterior   {anterior:6.2f} s ({anterior / tiradas * 1e9:5.0f} ns por tirada)  total {total_anterior:,}")
+    print(f"compilada  {compilada:6.2f} s ({compilada / tiradas * 1e9:5.0f} ns por tirada)  total {total_compilada:,}")
+    print(f"\n⚡ La tabla compilada es {anterior / compilada:.1f}x más rápida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Mide cuánto tarda importar muchos jugadores desde CSV con importar_jugadores()
+(validación + una sola escritura) y lo compara con registrarlos uno por uno
+con registrar_jugador(), que hace una escritura por jugador.
+
+Corre en una carpeta temporal: no toca data/ del proyecto.
+
+Uso: python benchmarks/importacion_jugadores.py [json|sqlite] [cantidad_jugadores]
+"""
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+UNO_POR_UNO = 2000  # registrar de a uno es lento: se mide con menos jugadores y se extrapola
+
+
+def crear_csv(ruta, cantidad):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["nombre", "id", "saldo_inicial"])
+        for i in range(cantidad):
+            escritor.writerow([f"Jugador {i}", f"ID{i}", 1000 + i % 500])
+        # Algunas filas inválidas o repetidas para que también se rechacen
+        escritor.writerow(["Sin saldo", "MALO1", "abc"])
+        escritor.writerow(["", "MALO2", "100"])
+        escritor.writerow(["Repetido", "ID0", "100"])
+
+
+def main():
+    tipo = sys.argv[1] if len(sys.argv) > 1 else "json"
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    os.environ["CASINO_ALMACENAMIENTO"] = tipo
+    with tempfile.TemporaryDirectory() as carpeta:
+        # El controlador usa data/ relativo a la carpeta actual
+        os.chdir(carpeta)
+        from controller.jugador_controller import importar_jugadores, registrar_jugador, cerrar_almacenamiento
+        from model.jugador import Jugador
+
+        ruta = os.path.join(carpeta, "jugadores.csv")
+        crear_csv(ruta, cantidad)
+        inicio = time.perf_counter()
+        registrados, rechazados = importar_jugadores(ruta)
+        duracion = time.perf_counter() - inicio
+        print(f"📥 {tipo}: importar_jugadores() de {cantidad:,} filas: {duracion:.2f} s "
+              f"({registrados:,} registrados, {len(rechazados)} rechazados)")
+        for numero, motivo in rechazados:
+            print(f"   fila {numero}: {motivo}")
+
+        inicio = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for i in range(UNO_POR_UNO):
+                registrar_jugador(Jugador(f"Uno {i}", f"UNO{i}", 1000))
+        duracion_uno = time.perf_counter() - inicio
+        estimado = duracion_uno / UNO_POR_UNO * cantidad
+        print(f"🐢 {tipo}: registrar_jugador() de a uno: {UNO_POR_UNO:,} en {duracion_uno:.2f} s "
+              f"(≈ {estimado:.0f} s para {cantidad:,}, {estimado / duracion:.0f}x más lento)")
+        cerrar_almacenamiento()
+        os.chdir(RAIZ)
+
+
+if __name__ == "__main__":
+    main()
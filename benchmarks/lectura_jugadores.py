@@ -0,0 +1,70 @@
+"""
+Compara la memoria pico y el tiempo de un reporte de saldos (cantidad, total
+y top 10) cargando todos los jugadores con todos() y recorriéndolos con
+iter_jugadores(), que lee el snapshot por bloques y no decodifica historiales.
+
+Uso: python benchmarks/lectura_jugadores.py [cantidad_jugadores]
+"""
+import gc
+import heapq
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from model.evento import Evento, BLACKJACK, TRAGAMONEDAS, GANA, PIERDE
+from persistencia.repositorio import RepositorioJSON
+
+HISTORIAL = [Evento(BLACKJACK if k % 2 else TRAGAMONEDAS, 500.0, 1000.0 if k % 3 else 0,
+                    GANA if k % 3 else PIERDE, None, 1000.0 + k, 1760000000.0 + k).to_dict()
+             for k in range(10)]
+
+
+def crear_archivo(ruta, cantidad):
+    with open(ruta, "w") as f:
+        f.write("[\n")
+        for i in range(cantidad):
+            data = {"nombre": f"Jugador {i}", "id": f"ID{i}", "saldo_inicial": 1000.0,
+                    "saldo_actual": float(i % 7919), "historial": HISTORIAL, "version": 0}
+            f.write(("" if i == 0 else ",\n") + json.dumps(data, indent=4))
+        f.write("\n]")
+
+
+def reporte(jugadores):
+    cantidad = total = 0
+    filas = []
+    for j in jugadores:
+        cantidad += 1
+        total += j.saldo_actual
+        filas.append((j.nombre, j.id, j.saldo_actual))
+    return cantidad, total, heapq.nlargest(10, filas, key=lambda fila: fila[2])
+
+
+def medir(nombre, funcion):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<20} {pico / 2**20:>10.1f} MB {duracion:>8.2f} s")
+    return resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "jugadores.json")
+        crear_archivo(ruta, cantidad)
+        print(f"👥 {cantidad:,} jugadores, archivo de {os.path.getsize(ruta) / 2**20:.0f} MB\n")
+        print(f"{'LECTURA':<20} {'MEMORIA PICO':>13} {'TIEMPO':>10}")
+        a = medir("todos()", lambda: reporte(RepositorioJSON(ruta).todos()))
+        b = medir("iter_jugadores()", lambda: reporte(RepositorioJSON(ruta).iter_jugadores()))
+        assert a == b
+
+
+if __name__ == "__main__":
+    main()
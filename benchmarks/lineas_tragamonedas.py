@@ -0,0 +1,77 @@
+"""
+Micro-benchmark del tragamonedas de 5x3 (Juegos/TablaLineas.py): la
+evaluación con máscaras de bits contra una evaluación directa que recorre
+cada línea, cada regla y cada posición.
+
+Antes de medir verifica que las dos den el mismo premio en grillas al
+azar (no solo las que salen de las tiras). Al final estima el RTP del
+juego con las tiras y la tabla por defecto.
+
+Uso: python benchmarks/lineas_tragamonedas.py [giros]
+"""
+import math
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.TablaLineas import TABLA_LINEAS, TIRAS, COSTO_LINEA, COMODIN
+
+
+def premio_directo(tabla, codigos):
+    """Recorre línea por línea: la primera regla que coincide en todas sus posiciones paga"""
+    grilla = tabla.grilla(codigos)
+    total = 0
+    for linea in tabla.lineas:
+        simbolos = [grilla[fila][rodillo] for rodillo, fila in enumerate(linea)]
+        for regla, premio, _ in tabla.reglas:
+            if all(r == COMODIN or r == s for r, s in zip(regla, simbolos)):
+                total += premio
+                break
+    for simbolo, _, por_cantidad in tabla.dispersos:
+        total += por_cantidad[sum(fila.count(simbolo) for fila in grilla)]
+    return total
+
+
+def main():
+    giros = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tabla = TABLA_LINEAS
+    rng = random.Random(1)
+    ventanas = len(tabla.simbolos) ** tabla.filas
+    azar = [[rng.randrange(ventanas) for _ in range(tabla.rodillos)] for _ in range(20_000)]
+    distintas = sum(premio_directo(tabla, c) != tabla.premio(c) for c in azar)
+    print(f"{'✅' if not distintas else '❌'} {len(azar):,} grillas al azar comparadas, {distintas} distintas")
+
+    codigos = [TIRAS.girar(rng) for _ in range(giros)]
+    print(f"🎰 {giros:,} giros de {len(tabla.lineas)} líneas, {len(tabla.reglas)} reglas\n")
+
+    inicio = time.perf_counter()
+    total = sum(map(tabla.premio, codigos))
+    mascaras = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for c in codigos:
+        tabla.evaluar(c)
+    detalle = time.perf_counter() - inicio
+
+    muestra = codigos[:giros // 50]
+    inicio = time.perf_counter()
+    for c in muestra:
+        premio_directo(tabla, c)
+    directo = (time.perf_counter() - inicio) / len(muestra) * giros
+
+    print(f"máscaras (premio)   {mascaras / giros * 1e6:7.2f} µs por giro")
+    print(f"máscaras (evaluar)  {detalle / giros * 1e6:7.2f} µs por giro (con el detalle de cada línea)")
+    print(f"directo             {directo / giros * 1e6:7.2f} µs por giro")
+    print(f"\n⚡ Las máscaras son {directo / mascaras:.0f}x más rápidas")
+
+    costo = COSTO_LINEA * len(tabla.lineas)
+    pagos = [tabla.premio(c) / costo for c in codigos]
+    rtp = sum(pagos) / giros
+    error = math.sqrt(sum((p - rtp) ** 2 for p in pagos) / (giros - 1) / giros)
+    aciertos = sum(p > 0 for p in pagos) / giros
+    print(f"\n📈 RTP estimado {rtp:.2%} ± {2 * error:.2%}, algún premio en el {aciertos:.1%} de los giros")
+
+
+if __name__ == "__main__":
+    main()
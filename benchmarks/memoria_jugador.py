@@ -0,0 +1,111 @@
+"""
+Compara la memoria que ocupan N jugadores con la representación anterior
+(objeto con __dict__ e historial de frases en una lista) y con la actual
+(__slots__, historial de eventos empaquetado en un solo bytes por jugador:
+sin un objeto Evento ni floats sueltos por jugada).
+
+Los historiales se construyen como los devuelve json.load: objetos iguales
+en contenido pero distintos en memoria para cada jugador.
+
+Uso: python benchmarks/memoria_jugador.py [cantidad_jugadores]
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from model.jugador import Jugador
+from model.evento import Evento, BLACKJACK, TRAGAMONEDAS, GANA, PIERDE, EMPATE
+
+ACTIVIDADES = [
+    "Apostó $500.0 en Blackjack",
+    "Saldo actualizado: $900.0",
+    "Perdió $1000 con ('🔔', '🍒', '🍋')",
+    "Ganó $2000 con ('🍒', '🍋', '🔔')",
+    "Apostó $100.0 | Empató (Mismo puntaje) | Saldo: $1000.0",
+]
+
+# Las mismas jugadas como eventos
+EVENTOS = [
+    Evento(BLACKJACK, 500.0, 1000.0, GANA, "dealer_bust", 1400.0, 1760000000.0),
+    Evento(BLACKJACK, 500.0, 0, PIERDE, "bust", 900.0, 1760000100.0),
+    Evento(TRAGAMONEDAS, 1000, 0, PIERDE, "🔔 | 🍒 | 🍋", 1900.0, 1760000200.0),
+    Evento(TRAGAMONEDAS, 1000, 2000, GANA, "🍒 | 🍋 | 🔔", 2900.0, 1760000300.0),
+    Evento(BLACKJACK, 100.0, 100.0, EMPATE, "mismo_puntaje", 1000.0, 1760000400.0),
+]
+
+
+class JugadorAnterior:
+    """Copia de la representación original de model.jugador.Jugador"""
+    def __init__(self, nombre, id, saldo_inicial):
+        self.nombre = nombre
+        self.id = id
+        self.saldo_inicial = float(saldo_inicial)
+        self.saldo_actual = float(saldo_inicial)
+        self.historial = []
+
+    def agregar_historial(self, actividad):
+        self.historial.append(actividad)
+        if len(self.historial) > 10:
+            self.historial.pop(0)
+
+    @staticmethod
+    def from_dict(data):
+        jugador = JugadorAnterior(data["nombre"], data["id"], data["saldo_inicial"])
+        jugador.saldo_actual = data.get("saldo_actual", jugador.saldo_inicial)
+        jugador.historial = data.get("historial", [])
+        return jugador
+
+
+# Historiales serializados; al decodificarlos cada jugador recibe sus propios objetos
+HISTORIALES_JSON = {
+    JugadorAnterior: [json.dumps([ACTIVIDADES[(i + k) % 5] for k in range(8)]) for i in range(5)],
+    Jugador: [json.dumps([EVENTOS[(i + k) % 5].to_dict() for k in range(8)]) for i in range(5)],
+}
+NUEVA_ACTIVIDAD = {JugadorAnterior: ACTIVIDADES[1], Jugador: EVENTOS[1]}
+
+
+def datos_jugador(clase, i):
+    historial = json.loads(HISTORIALES_JSON[clase][i % 5])
+    return {"nombre": f"Jugador {i}", "id": f"ID{i}", "saldo_inicial": 1000.0,
+            "saldo_actual": 1000.0, "historial": historial}
+
+
+def medir(clase, cantidad):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    jugadores = [clase.from_dict(datos_jugador(clase, i)) for i in range(cantidad)]
+    duracion = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Costo de agregar jugadas a historiales llenos
+    nueva = NUEVA_ACTIVIDAD[clase]
+    inicio = time.perf_counter()
+    for jugador in jugadores[:100000]:
+        for _ in range(5):
+            jugador.agregar_historial(nueva)
+    duracion_agregar = time.perf_counter() - inicio
+    del jugadores
+    return memoria, duracion, duracion_agregar
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"👥 {cantidad:,} jugadores con 8 jugadas en el historial\n")
+    print(f"{'REPRESENTACIÓN':<22} {'MEMORIA':>12} {'BYTES/JUGADOR':>14} {'CARGA':>9} {'AGREGAR x500k':>14}")
+    resultados = {}
+    for nombre, clase in [("anterior (__dict__)", JugadorAnterior), ("actual (__slots__)", Jugador)]:
+        memoria, duracion, duracion_agregar = medir(clase, cantidad)
+        resultados[nombre] = memoria
+        print(f"{nombre:<22} {memoria / 2**20:>9.1f} MB {memoria / cantidad:>14.0f} "
+              f"{duracion:>7.2f} s {duracion_agregar:>12.3f} s")
+    anterior, actual = resultados.values()
+    print(f"\n📉 Ahorro: {(1 - actual / anterior) * 100:.1f}% de memoria")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Juega rondas en una MesaBlackjack con todos los asientos ocupados por bots
+asíncronos (estrategia básica con una demora al azar, como clientes de red;
+uno de ellos a veces no contesta y se planta por tiempo) y compara dos
+formas de liquidar:
+  - por ronda:   todos los asientos en una sola escritura (MesaBlackjack)
+  - por asiento: una escritura por asiento, como si cada uno fuera una mesa aparte
+
+Al final verifica que el saldo de cada jugador sea la suma de sus eventos,
+tanto en la tabla de saldos como en el repositorio (después de vaciar la
+escritura diferida), y que su historial guardado tenga sus últimas manos.
+Corre en una carpeta temporal: no toca data/ del proyecto.
+
+Uso: python benchmarks/mesa_blackjack.py [rondas] [asientos] [json|sqlite]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+SALDO_INICIAL = 10 ** 9
+APUESTA = 10
+DEMORA_MAXIMA = 0.0002   # segundos que tarda un bot en "contestar"
+TIEMPO_LIMITE = 0.002
+
+
+def crear_decisores(decisor_estrategia, semilla=1):
+    rng = random.Random(semilla)
+
+    async def bot(mesa, asiento):
+        await asyncio.sleep(rng.uniform(0, DEMORA_MAXIMA))
+        return await decisor_estrategia(mesa, asiento)
+
+    async def distraido(mesa, asiento):
+        # Uno de cada diez turnos no contesta a tiempo
+        if rng.random() < 0.1:
+            await asyncio.sleep(TIEMPO_LIMITE * 2)
+        return await bot(mesa, asiento)
+
+    return bot, distraido
+
+
+async def jugar(mesa, rondas, asientos):
+    ganancias = {}
+    manos = {}
+    vencidos = 0
+    for _ in range(rondas):
+        resultado = await mesa.jugar_ronda({n: APUESTA for n in range(1, asientos + 1)})
+        for r in resultado.asientos:
+            ganancias[r.id_jugador] = ganancias.get(r.id_jugador, 0) + r.evento.neto
+            manos[r.id_jugador] = manos.get(r.id_jugador, 0) + 1
+            vencidos += r.vencido
+    return ganancias, manos, vencidos
+
+
+def verificar(ganancias, manos, saldo_jugador, obtener_repositorio, vaciar_pendientes):
+    """Saldos en la tabla y, ya guardados, en el repositorio con su historial completo"""
+    from model.jugador import MAX_HISTORIAL
+    if not all(saldo_jugador(id) == SALDO_INICIAL + g for id, g in ganancias.items()):
+        return "❌ saldos distintos en la tabla"
+    vaciar_pendientes()
+    for id, ganancia in ganancias.items():
+        jugador = obtener_repositorio().obtener(id)
+        historial = jugador.historial
+        if jugador.saldo_actual != SALDO_INICIAL + ganancia:
+            return f"❌ {id}: ${jugador.saldo_actual:,.2f} guardado, ${SALDO_INICIAL + ganancia:,.2f} esperado"
+        if len(historial) != min(manos[id], MAX_HISTORIAL) or historial[-1].saldo != jugador.saldo_actual:
+            return f"❌ {id}: historial guardado incompleto ({len(historial)} eventos)"
+    return "✅ saldos correctos (tabla y repositorio)"
+
+
+def main():
+    rondas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    asientos = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    os.environ["CASINO_ALMACENAMIENTO"] = sys.argv[3] if len(sys.argv) > 3 else "json"
+    with tempfile.TemporaryDirectory() as carpeta:
+        # El controlador usa data/ relativo a la carpeta actual
+        os.chdir(carpeta)
+        from controller.jugador_controller import (registrar_jugadores_bulk, registrar_eventos, saldo_jugador,
+                                                   obtener_repositorio, vaciar_pendientes, cerrar_almacenamiento)
+        from Juegos.MesaBlackjack import MesaBlackjack, ResultadoAsiento, decisor_estrategia
+        from Juegos.Motor import liquidar_mano
+
+        class MesaMedida(MesaBlackjack):
+            """Acumula el tiempo que se pasa liquidando"""
+            tiempo_liquidando = 0.0
+
+            async def _liquidar(self, jugando):
+                inicio = time.perf_counter()
+                resultados = await self._liquidar_ronda(jugando)
+                self.tiempo_liquidando += time.perf_counter() - inicio
+                return resultados
+
+            async def _liquidar_ronda(self, jugando):
+                return await MesaBlackjack._liquidar(self, jugando)
+
+        class MesaPorAsiento(MesaMedida):
+            """Liquidación anterior: cada asiento con su propia escritura"""
+            async def _liquidar_ronda(self, jugando):
+                resultados = []
+                for asiento in jugando:
+                    evento = liquidar_mano(asiento.mano, self.mano_dealer, asiento.apuesta)
+                    saldo = registrar_eventos(asiento.jugador.id, [evento])
+                    await asyncio.to_thread(vaciar_pendientes)
+                    resultados.append(ResultadoAsiento(asiento.numero, asiento.jugador.id, evento, saldo,
+                                                       asiento.vencido))
+                return resultados
+
+        print(f"🪑 {rondas:,} rondas con {asientos} asientos ({os.environ['CASINO_ALMACENAMIENTO']})\n")
+        for nombre, clase in [("por asiento", MesaPorAsiento), ("por ronda", MesaMedida)]:
+            registrar_jugadores_bulk([{"nombre": f"Bot {n}", "id": f"{nombre[4:7].upper()}{n}",
+                                       "saldo_inicial": SALDO_INICIAL} for n in range(1, asientos + 1)])
+            mesa = clase(asientos, tiempo_limite=TIEMPO_LIMITE)
+            bot, distraido = crear_decisores(decisor_estrategia)
+            for n in range(1, asientos + 1):
+                mesa.sentar(n, f"{nombre[4:7].upper()}{n}", distraido if n == 1 else bot)
+
+            inicio = time.perf_counter()
+            ganancias, manos, vencidos = asyncio.run(jugar(mesa, rondas, asientos))
+            duracion = time.perf_counter() - inicio
+            verificacion = verificar(ganancias, manos, saldo_jugador, obtener_repositorio, vaciar_pendientes)
+            print(f"{nombre:<12} {duracion:6.2f} s  {rondas / duracion:8,.0f} rondas/s  "
+                  f"{rondas * asientos / duracion:8,.0f} manos/s  "
+                  f"liquidación {mesa.tiempo_liquidando / rondas * 1000:6.2f} ms/ronda  "
+                  f"({vencidos} turnos vencidos)  {verificacion}")
+        cerrar_almacenamiento()
+        os.chdir(RAIZ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Mide cuántas manos de Blackjack y tiradas de tragamonedas por segundo se
+juegan con los motores de Juegos/Motor.py, sin consola: mismo código que
+usan las mesas (reparto, liquidación, registrar_eventos y la tabla de saldos).
+
+Al final compara el saldo del jugador con la suma de los eventos devueltos
+para verificar que no se perdió ninguna liquidación.
+
+Corre en una carpeta temporal: no toca data/ del proyecto.
+
+Uso: python benchmarks/motor_juegos.py [manos] [tiradas] [json|sqlite]
+"""
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+SALDO_INICIAL = 10 ** 12
+APUESTA = 10
+
+
+def jugar_blackjack(motor, id_jugador, manos):
+    """Política simple: pedir con menos de 17 (como el dealer). Devuelve la suma de ganancias"""
+    ganancia = 0
+    for _ in range(manos):
+        jugada = motor.iniciar(id_jugador, APUESTA)
+        while not jugada.terminada:
+            jugada = motor.pedir() if motor.mano_jugador.puntaje < 17 else motor.plantarse()
+        ganancia += motor.liquidar().ganancia
+    return ganancia
+
+
+def jugar_tragamonedas(motor, id_jugador, tiradas):
+    ganancia = 0
+    motor.iniciar(id_jugador)
+    for _ in range(tiradas):
+        ganancia += motor.girar().evento.neto
+    motor.liquidar()
+    return ganancia
+
+
+def main():
+    manos = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tiradas = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    os.environ["CASINO_ALMACENAMIENTO"] = sys.argv[3] if len(sys.argv) > 3 else "json"
+    with tempfile.TemporaryDirectory() as carpeta:
+        # El controlador usa data/ relativo a la carpeta actual
+        os.chdir(carpeta)
+        from controller.jugador_controller import registrar_jugadores_bulk, saldo_jugador, cerrar_almacenamiento
+        from Juegos.Motor import MotorBlackjack, MotorTragamonedas
+
+        registrar_jugadores_bulk([{"nombre": "Banco", "id": "BANCO", "saldo_inicial": SALDO_INICIAL}])
+        print(f"🤖 Motores sin consola ({os.environ['CASINO_ALMACENAMIENTO']}), apuesta ${APUESTA}\n")
+
+        inicio = time.perf_counter()
+        ganancia_bj = jugar_blackjack(MotorBlackjack(), "BANCO", manos)
+        duracion = time.perf_counter() - inicio
+        print(f"🃏 Blackjack:    {manos:,} manos en {duracion:.2f} s ({manos / duracion:,.0f} manos/s), "
+              f"resultado {ganancia_bj / (manos * APUESTA):+.4f} por unidad apostada")
+
+        inicio = time.perf_counter()
+        motor = MotorTragamonedas()
+        ganancia_tm = jugar_tragamonedas(motor, "BANCO", tiradas)
+        duracion = time.perf_counter() - inicio
+        print(f"🎰 Tragamonedas: {tiradas:,} tiradas en {duracion:.2f} s ({tiradas / duracion:,.0f} tiradas/s), "
+              f"retorno {1 + ganancia_tm / (tiradas * motor.costo_jugada):.4f}")
+
+        esperado = SALDO_INICIAL + ganancia_bj + ganancia_tm
+        saldo = saldo_jugador("BANCO")
+        print(f"\n{'✅' if saldo == esperado else '❌'} Saldo final ${saldo:,.2f} (esperado ${esperado:,.2f})")
+        cerrar_almacenamiento()
+        os.chdir(RAIZ)
+
+
+if __name__ == "__main__":
+    main()
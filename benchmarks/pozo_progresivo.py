@@ -0,0 +1,104 @@
+"""
+Varios procesos juegan el tragamonedas a la vez con el pozo progresivo
+compartido, con rodillos cargados para que 7️⃣ 7️⃣ 7️⃣ salga seguido (muchos
+aciertos casi simultáneos). Al final verifica que:
+  - cada pago del pozo tenga un número distinto, sin huecos (exactamente una vez),
+  - lo pagado a las sesiones sea lo que descontó el pozo,
+  - ningún aporte se perdió: aportado = tiradas x costo x APORTE_POZO,
+  - monto = sembrado + aportado - pagado,
+  - no quede ningún pago cobrado sin acreditar al ganador.
+También compara las tiradas por segundo de un proceso con y sin pozo.
+
+Corre en una carpeta temporal: no toca data/ del proyecto.
+
+Uso: python benchmarks/pozo_progresivo.py [procesos] [tiradas_por_proceso] [peso_del_siete]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(RAIZ)
+
+SALDO_INICIAL = 10 ** 12
+
+
+def rodillos_cargados(peso):
+    from Juegos.Rodillos import Rodillos
+    from Juegos.TablaPremios import TABLA
+    tira = {simbolo: (peso if simbolo == "7️⃣" else 1) for simbolo in TABLA.simbolos}
+    return Rodillos([tira] * 3)
+
+
+def jugar(carpeta, id_jugador, tiradas, peso, con_pozo=True):
+    """Sesión de un proceso: devuelve (pagos del pozo como (número, monto), duración)"""
+    os.chdir(carpeta)
+    from controller.jugador_controller import cerrar_almacenamiento
+    from Juegos.Motor import MotorTragamonedas, pozo_tragamonedas
+    motor = MotorTragamonedas(rodillos=rodillos_cargados(peso), pozo=pozo_tragamonedas() if con_pozo else None)
+    motor.iniciar(id_jugador)
+    pagos = []
+    inicio = time.perf_counter()
+    for _ in range(tiradas):
+        tirada = motor.girar()
+        if tirada.pozo is not None:
+            pagos.append((tirada.pozo.numero, tirada.pozo.monto))
+    motor.liquidar()
+    duracion = time.perf_counter() - inicio
+    cerrar_almacenamiento()
+    return pagos, duracion
+
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    tiradas = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    peso = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+    with tempfile.TemporaryDirectory() as carpeta:
+        os.chdir(carpeta)
+        from controller.jugador_controller import registrar_jugadores_bulk, ARCHIVO_POZO
+        from persistencia.pozo_progresivo import PozoProgresivo
+        from Juegos.Motor import POZO_INICIAL, APORTE_POZO, COSTO_JUGADA
+        registrar_jugadores_bulk([{"nombre": f"Jugador {i}", "id": f"J{i}", "saldo_inicial": SALDO_INICIAL}
+                                  for i in range(procesos + 1)])
+        probabilidad = (peso / (peso + 4)) ** 3
+        print(f"💎 {procesos} procesos x {tiradas:,} tiradas, 7️⃣ 7️⃣ 7️⃣ en el {probabilidad:.1%} de las tiradas\n")
+
+        contexto = multiprocessing.get_context("spawn")
+        with contexto.Pool(procesos, maxtasksperchild=1) as pool:  # cada sesión en un proceso nuevo
+            resultados = pool.starmap(jugar, [(carpeta, f"J{i}", tiradas, peso) for i in range(procesos)])
+
+        pagos = sorted(pago for lista, _ in resultados for pago in lista)
+        # Directo (sin obtener_pozo, que acreditaría lo pendiente al abrirlo)
+        pozo = PozoProgresivo(ARCHIVO_POZO, POZO_INICIAL)
+        estado = pozo.estado()
+        sin_acreditar = pozo.reclamos_sin_acreditar()
+        pozo.cerrar()
+        numeros = [numero for numero, _ in pagos]
+        unicos = numeros == list(range(1, estado["pagos"] + 1))
+        pagado = sum(monto for _, monto in pagos)
+        aportado = procesos * tiradas * COSTO_JUGADA * APORTE_POZO
+        cuadra = abs(estado["monto"] - (estado["sembrado"] + estado["aportado"] - estado["pagado"])) < 1e-6
+
+        print(f"{'✅' if unicos else '❌'} {len(pagos):,} pagos del pozo, números 1..{estado['pagos']:,} "
+              f"sin repetir ni saltar")
+        print(f"{'✅' if abs(pagado - estado['pagado']) < 1e-6 else '❌'} Pagado a las sesiones ${pagado:,.2f} "
+              f"(el pozo registra ${estado['pagado']:,.2f})")
+        print(f"{'✅' if abs(aportado - estado['aportado']) < 1e-6 else '❌'} Aportado ${estado['aportado']:,.2f} "
+              f"(esperado ${aportado:,.2f})")
+        print(f"{'✅' if cuadra else '❌'} Monto ${estado['monto']:,.2f} = sembrado + aportado - pagado")
+        print(f"{'❌' if sin_acreditar else '✅'} {len(sin_acreditar)} pagos sin acreditar")
+
+        # Un proceso solo, con y sin pozo, para ver cuánto cuesta aportar (y, con los rodillos cargados,
+        # guardar al momento cada pozo ganado)
+        with contexto.Pool(1, maxtasksperchild=1) as pool:
+            _, con_pozo = pool.apply(jugar, (carpeta, f"J{procesos}", tiradas, peso, True))
+            _, sin_pozo = pool.apply(jugar, (carpeta, f"J{procesos}", tiradas, peso, False))
+        print(f"\n⚡ Un proceso solo: {tiradas / con_pozo:,.0f} tiradas/s con pozo, "
+              f"{tiradas / sin_pozo:,.0f} tiradas/s sin pozo")
+        os.chdir(RAIZ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark del puntaje de una mano de Blackjack: el cálculo recursivo
+anterior (recorre la mano en cada consulta) contra Juegos.Mano (puntaje
+actualizado al agregar cada carta).
+
+Se reparten manos al azar y, como hacía el juego, en cada paso se consulta
+el puntaje varias veces (mostrar estado, turno, Blackjack, resultado).
+
+Uso: python benchmarks/puntaje_mano.py [cantidad_manos]
+"""
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.BlackJack import CartaBlackjack
+from Juegos.Mano import Mano
+from Juegos.Zapato import RANGOS
+
+CONSULTAS_POR_CARTA = 4
+
+
+def calcular_puntaje_recursivo(mano, indice=0, suma_actual=0, ases=0):
+    """Copia del cálculo que usaba BlackjackSimplificado antes de Mano"""
+    if indice >= len(mano):
+        while suma_actual > 21 and ases > 0:
+            suma_actual -= 10
+            ases -= 1
+        return suma_actual
+    carta_actual = mano[indice]
+    nueva_suma = suma_actual + carta_actual.valor
+    nuevos_ases = ases + (1 if carta_actual.valor == 11 else 0)
+    return calcular_puntaje_recursivo(mano, indice + 1, nueva_suma, nuevos_ases)
+
+
+def repartos(cantidad):
+    """Códigos de las cartas que se reparten hasta llegar a 17 (como el dealer)"""
+    mazo = list(range(RANGOS)) * 4
+    rng = random.Random(1)
+    resultado = []
+    for _ in range(cantidad):
+        cartas = rng.sample(mazo, 12)
+        mano = Mano()
+        for carta in cartas:
+            mano.agregar(carta)
+            if mano.puntaje >= 17:
+                break
+        resultado.append(mano.cartas)
+    return resultado
+
+
+def con_recursion(repartos):
+    # Antes las manos eran listas de CartaBlackjack
+    repartos = [[CartaBlackjack.desde_codigo(c) for c in cartas] for cartas in repartos]
+    total = 0
+    for cartas in repartos:
+        mano = []
+        for carta in cartas:
+            mano.append(carta)
+            for _ in range(CONSULTAS_POR_CARTA):
+                total += calcular_puntaje_recursivo(mano)
+    return total
+
+
+def con_mano(repartos):
+    total = 0
+    for cartas in repartos:
+        mano = Mano()
+        for carta in cartas:
+            mano.agregar(carta)
+            for _ in range(CONSULTAS_POR_CARTA):
+                total += mano.puntaje
+    return total
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    manos = repartos(cantidad)
+    cartas = sum(len(m) for m in manos)
+    print(f"🃏 {cantidad:,} manos, {cartas:,} cartas, {CONSULTAS_POR_CARTA} consultas por carta\n")
+    tiempos = {}
+    for nombre, funcion in [("recursivo", con_recursion), ("Mano", con_mano)]:
+        inicio = time.perf_counter()
+        total = funcion(manos)
+        tiempos[nombre] = time.perf_counter() - inicio
+        print(f"{nombre:<10} {tiempos[nombre]:6.2f} s  "
+              f"({tiempos[nombre] / (cartas * CONSULTAS_POR_CARTA) * 1e9:6.0f} ns por consulta)  suma {total}")
+    print(f"\n⚡ Mano es {tiempos['recursivo'] / tiempos['Mano']:.1f}x más rápido")
+
+
+if __name__ == "__main__":
+    main()
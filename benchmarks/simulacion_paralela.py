@@ -0,0 +1,33 @@
+"""
+Corre la misma simulación de Blackjack (misma semilla) con distinta
+cantidad de trabajadores y verifica que el resultado sea idéntico:
+cada trozo de manos tiene su propia semilla derivada de la raíz, así que
+no importa qué proceso lo juegue ni en qué orden terminen.
+
+Uso: python benchmarks/simulacion_paralela.py [manos] [semilla] [trabajadores_maximos]
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Juegos.SimuladorBlackjack import SimuladorBlackjack, politica_umbral
+
+
+def main():
+    manos = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    semilla = int(sys.argv[2]) if len(sys.argv) > 2 else 2024
+    maximo = int(sys.argv[3]) if len(sys.argv) > 3 else max(4, os.cpu_count() or 1)
+    print(f"🎲 {manos:,} manos con semilla {semilla} ({os.cpu_count()} CPU)\n")
+    referencia = None
+    trabajadores = 1
+    while trabajadores <= maximo:
+        resultado = SimuladorBlackjack(politica_umbral(17), semilla).simular(manos, trabajadores)
+        firma = (resultado.ganadas, resultado.perdidas, resultado.empatadas, resultado.blackjacks, resultado.ev)
+        referencia = referencia or firma
+        print(f"{trabajadores:>3} trabajadores: {resultado.duracion:6.2f} s "
+              f"({manos / resultado.duracion:>12,.0f} manos/s)  EV {resultado.ev:+.6f}  "
+              f"{'✅ idéntico' if firma == referencia else '❌ distinto'}")
+        trabajadores *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,322 @@
+import csv
 import json
+import math
 import os
+import threading
 from model.jugador import Jugador
+from model.evento import Evento, TRAGAMONEDAS, GANA
+from persistencia.repositorio import RepositorioJSON
+from persistencia.repositorio_sqlite import RepositorioSQLite
+from persistencia.escritura_diferida import EscrituraDiferida
+from persistencia.tabla_saldos import TablaSaldos, TablaLlena
+from persistencia.pozo_progresivo import PozoProgresivo, marca_pago, tiene_marca
 
 ARCHIVO = os.path.join("data", "jugadores.json")
+ARCHIVO_DB = os.path.join("data", "jugadores.db")
+# Almacenamiento a usar: "json" (por defecto) o "sqlite"
+ALMACENAMIENTO = os.environ.get("CASINO_ALMACENAMIENTO", "json").lower()
+# Tabla de saldos compartida entre procesos (una por almacenamiento)
+ARCHIVO_SALDOS = os.path.join("data", f"saldos_{ALMACENAMIENTO}.bin")
+# Pozo progresivo del tragamonedas, compartido entre procesos
+ARCHIVO_POZO = os.path.join("data", "pozo.bin")
+
+def crear_repositorio(tipo=ALMACENAMIENTO):
+    if tipo == "sqlite":
+        return RepositorioSQLite(ARCHIVO_DB)
+    if tipo == "json":
+        return RepositorioJSON(ARCHIVO)
+    raise ValueError(f"Almacenamiento desconocido: {tipo}")
+
+# Todo se abre la primera vez que se usa: importar el controlador (reportes, motores...) no crea
+# archivos, conexiones ni hilos. _iniciando evita que dos hilos abran lo mismo a la vez
+_repositorio = None  # repositorio compartido por todo el programa
+_escritura = None    # las jugadas se guardan en segundo plano, agrupadas por jugador (ver registrar_eventos)
+_tabla = None        # saldos al día de todos los procesos de juego; el historial sigue en el repositorio
+_pozo = None         # pozo progresivo (ver obtener_pozo)
+_iniciando = threading.Lock()
+_conciliados = set() # jugadores cuya ranura de la tabla ya se comparó con el repositorio en este proceso
+
+def obtener_repositorio():
+    global _repositorio
+    if _repositorio is None:
+        with _iniciando:
+            if _repositorio is None:
+                _repositorio = crear_repositorio()
+    return _repositorio
+
+def obtener_escritura():
+    global _escritura
+    if _escritura is None:
+        with _iniciando:
+            if _escritura is None:
+                _escritura = EscrituraDiferida(crear_repositorio, al_guardar=_confirmar_guardados)
+    return _escritura
+
+def _obtener_tabla():
+    global _tabla
+    if _tabla is None:
+        with _iniciando:
+            if _tabla is None:
+                _tabla = TablaSaldos(ARCHIVO_SALDOS)
+    return _tabla
+#la escritura diferida guardó jugadas ({id: (eventos, jugador guardado)}): en la tabla pasan de pendientes a guardadas
+def _confirmar_guardados(guardados):
+    tabla = _tabla
+    if tabla is None:
+        return
+    for id, (eventos, jugador) in guardados.items():
+        tabla.confirmar(id, sum(evento.neto for evento in eventos), jugador.saldo_actual, jugador.version)
+#saldo guardado de un jugador tal como lo necesita TablaSaldos.cargar
+def _leer_guardado(id):
+    jugador = obtener_repositorio().obtener(id)
+    return None if jugador is None else (jugador.saldo_inicial, jugador.saldo_actual, jugador.version)
+#pozo progresivo compartido; `inicial` es el monto con el que arranca (y con el que se reinicia al pagarse).
+#Al abrirlo se acreditan los pagos que quedaron a medias (ver _acreditar_pozos)
+def obtener_pozo(inicial):
+    global _pozo
+    if _pozo is None:
+        nuevo = None
+        with _iniciando:
+            if _pozo is None:
+                _pozo = nuevo = PozoProgresivo(ARCHIVO_POZO, inicial)
+        if nuevo is not None:
+            _acreditar_pozos(nuevo)  # fuera de _iniciando: acreditar abre el repositorio y la escritura
+    return _pozo
+#pagos del pozo cobrados por un proceso que murió antes de acreditarlos: si el evento del ganador
+#no llegó a guardarse (no está en su historial) se le acredita ahora el premio
+def _acreditar_pozos(pozo):
+    for pago in pozo.reclamos_sin_acreditar():
+        vaciar_pendientes()
+        jugador = obtener_repositorio().obtener(pago.id_jugador)
+        if jugador is not None and not any(tiene_marca(e.detalle, pago.numero) for e in jugador.historial):
+            evento = Evento(TRAGAMONEDAS, 0, pago.monto, GANA, f"Acreditado: {marca_pago(pago.numero)}")
+            if registrar_eventos(pago.id_jugador, [evento]) is not None:
+                vaciar_pendientes()
+        # Si el jugador ya no existe no hay a quién pagarle
+        pozo.acreditado(pago)
+#guardar ya las jugadas pendientes (fin de una sesión de juego, antes de reportes...)
+def vaciar_pendientes():
+    if _escritura is not None:
+        _escritura.vaciar()
+#guardar todo lo pendiente y cerrar el almacenamiento (al salir del programa).
+#Lo que se vuelva a usar después se abre de nuevo
+def cerrar_almacenamiento():
+    global _repositorio, _escritura, _tabla, _pozo
+    with _iniciando:
+        if _escritura is not None:
+            _escritura.cerrar()
+            _escritura.repositorio.cerrar()
+        for abierto in (_repositorio, _tabla, _pozo):
+            if abierto is not None:
+                abierto.cerrar()
+        _repositorio = _escritura = _tabla = _pozo = None
+        _conciliados.clear()
 #mostrar todos los jugadores
 
 def cargar_jugadores():
-    if not os.path.exists(ARCHIVO):
-        return []
-    with open(ARCHIVO, "r") as f:
-        data = json.load(f)
-        return [Jugador.from_dict(j) for j in data]
-#leer jugador 
+    vaciar_pendientes()
+    return obtener_repositorio().todos()
+#leer jugador
 def guardar_jugadores(jugadores):
-    with open(ARCHIVO, "w") as f:
-        json.dump([j.to_dict() for j in jugadores], f, indent=4)
-#nuevo jugador 
+    vaciar_pendientes()
+    obtener_repositorio().reemplazar_todos(jugadores)
+    _obtener_tabla().vaciar()
+    _conciliados.clear()
+#guardar los cambios de un solo jugador
+def actualizar_jugador(jugador):
+    if not obtener_repositorio().actualizar(jugador):
+        return False
+    # En la tabla cambia el saldo guardado; las jugadas pendientes de otros procesos se suman encima
+    _obtener_tabla().confirmar(jugador.id, 0, jugador.saldo_actual, jugador.version)
+    return True
+#saldo actual de un jugador (None si no existe), leído de la tabla compartida sin cargar el repositorio.
+#La primera vez en cada proceso la ranura se compara con el repositorio (ver TablaSaldos.cargar)
+def saldo_jugador(id):
+    saldo = _obtener_tabla().saldo(id) if id in _conciliados else None
+    if saldo is None:
+        try:
+            saldo = _obtener_tabla().cargar(id, lambda: _leer_guardado(id))
+        except TablaLlena:
+            # Ninguna ranura libre: el saldo sale del repositorio (más las jugadas pendientes de este proceso)
+            jugador = buscar_jugador(id)
+            return None if jugador is None else jugador.saldo_actual
+        if saldo is None:
+            return None
+        _conciliados.add(id)
+    return saldo
+#registrar jugadas (model.evento.Evento): suma su resultado al saldo sin pisar cambios de otros procesos.
+#El saldo se actualiza al momento en la tabla compartida; el historial se guarda en segundo plano
+#(las jugadas quedan pendientes y se guardan todas juntas cada pocos segundos o al vaciar).
+#Devuelve el nuevo saldo o None si el jugador no existe
+def registrar_eventos(id, eventos):
+    neto = sum(evento.neto for evento in eventos)
+    # Se suma antes de anotarlas: así la escritura diferida no puede confirmarlas antes de que estén en la tabla
+    saldo = _obtener_tabla().sumar(id, neto) if id in _conciliados else None
+    if saldo is None:
+        # Primera jugada en este proceso, o su ranura se liberó
+        _conciliados.discard(id)
+        if saldo_jugador(id) is None:
+            return None
+        saldo = _obtener_tabla().sumar(id, neto) if id in _conciliados else None
+        if saldo is None:
+            # Sin lugar en la tabla: se guardan ya y el saldo sale del repositorio
+            obtener_escritura().registrar(id, eventos)
+            vaciar_pendientes()
+            jugador = buscar_jugador(id)
+            return None if jugador is None else jugador.saldo_actual
+    obtener_escritura().registrar(id, eventos)
+    return saldo
+#registrar jugadas de varios jugadores a la vez ({id: [eventos]}), p. ej. todos los asientos de una ronda.
+#Devuelve {id: nuevo saldo o None si no existe}; al vaciar se guardan todos en una sola escritura
+def registrar_eventos_lote(eventos_por_jugador):
+    return {id: registrar_eventos(id, eventos) for id, eventos in eventos_por_jugador.items()}
+#nuevo jugador
 def registrar_jugador(jugador):
-    jugadores = cargar_jugadores()
-    if any(j.id == jugador.id for j in jugadores):
+    if not obtener_repositorio().agregar(jugador):
         print("Ya existe un jugador con ese ID.")
         return
-    jugadores.append(jugador)
-    guardar_jugadores(jugadores)
     print(" Jugador registrado exitosamente.")
 
+#columnas de los archivos CSV de importación/exportación (saldo_actual es opcional al importar)
+COLUMNAS_CSV = ["nombre", "id", "saldo_inicial", "saldo_actual"]
+#validar un monto importado (número finito y no negativo)
+def _monto(valor, campo):
+    try:
+        monto = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{campo} inválido: {valor!r}")
+    if not math.isfinite(monto) or monto < 0:
+        raise ValueError(f"{campo} inválido: {valor!r}")
+    return monto
+#convertir una fila importada (dict o Jugador) en Jugador; lanza ValueError con el motivo si no es válida
+def _jugador_desde_fila(fila):
+    if isinstance(fila, Jugador):
+        return fila
+    if not isinstance(fila, dict):
+        raise ValueError("la fila no es un objeto con los datos del jugador")
+    nombre = str(fila.get("nombre") or "").strip()
+    id = str(fila.get("id") or "").strip().upper()
+    if not nombre:
+        raise ValueError("falta el nombre")
+    if not id:
+        raise ValueError("falta el ID")
+    jugador = Jugador(nombre, id, _monto(fila.get("saldo_inicial"), "saldo_inicial"))
+    if fila.get("saldo_actual") not in (None, ""):
+        jugador.saldo_actual = _monto(fila["saldo_actual"], "saldo_actual")
+    if fila.get("historial"):
+        try:
+            jugador.historial = fila["historial"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("historial inválido")
+    return jugador
+
+def _registrar_filas(filas, rechazados):
+    # filas: pares (número de fila, datos). Se valida todo y se guarda en una sola escritura
+    jugadores = []
+    filas_por_id = {}
+    for numero, fila in filas:
+        try:
+            jugador = _jugador_desde_fila(fila)
+        except ValueError as e:
+            rechazados.append((numero, str(e)))
+            continue
+        if jugador.id in filas_por_id:
+            rechazados.append((numero, f"ID {jugador.id} repetido (ya está en la fila {filas_por_id[jugador.id]})"))
+            continue
+        filas_por_id[jugador.id] = numero
+        jugadores.append(jugador)
+    existentes = obtener_repositorio().agregar_varios(jugadores)
+    for id in existentes:
+        rechazados.append((filas_por_id[id], f"ya existe un jugador con el ID {id}"))
+    rechazados.sort()
+    return len(jugadores) - len(existentes), rechazados
+#registrar muchos jugadores de una vez (Jugador o dict con nombre, id, saldo_inicial y opcionalmente saldo_actual).
+#Devuelve (cantidad registrada, lista de (número de fila, motivo) de las filas rechazadas)
+def registrar_jugadores_bulk(filas):
+    return _registrar_filas(enumerate(filas, 1), [])
+
+def _formato(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato no soportado: {ruta} (usa .csv o .jsonl)")
+#importar jugadores de un archivo .csv (con encabezado) o .jsonl (un objeto por línea)
+def importar_jugadores(ruta):
+    formato = _formato(ruta)
+    rechazados = []
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        if formato == "csv":
+            lector = csv.DictReader(f)
+            # El número de fila es el de la línea del archivo (la 1 es el encabezado)
+            return _registrar_filas(((lector.line_num, fila) for fila in lector), rechazados)
+
+        def filas_jsonl():
+            for numero, linea in enumerate(f, 1):
+                if not linea.strip():
+                    continue
+                try:
+                    yield numero, json.loads(linea)
+                except ValueError:
+                    rechazados.append((numero, "JSON inválido"))
+        return _registrar_filas(filas_jsonl(), rechazados)
+#exportar todos los jugadores a .csv (datos y saldos) o .jsonl (incluye historial); devuelve cuántos se exportaron
+def exportar_jugadores(ruta):
+    formato = _formato(ruta)
+    cantidad = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f) if formato == "csv" else None
+        if escritor:
+            escritor.writerow(COLUMNAS_CSV)
+        for jugador in iter_jugadores():
+            if escritor:
+                escritor.writerow([jugador.nombre, jugador.id, jugador.saldo_inicial, jugador.saldo_actual])
+            else:
+                f.write(json.dumps(jugador.to_dict(), ensure_ascii=False) + "\n")
+            cantidad += 1
+    return cantidad
+
+#recorrer los jugadores uno a uno sin cargarlos todos en memoria (para listados y reportes)
+def iter_jugadores():
+    vaciar_pendientes()
+    return obtener_repositorio().iter_jugadores()
+
 def listar_jugadores():
-    return cargar_jugadores()
-#buscar un jugador por id 
+    return iter_jugadores()
+#buscar un jugador por id
 def buscar_jugador(id):
-    jugadores = cargar_jugadores()
-    for jugador in jugadores:
-        if jugador.id == id:
-            return jugador
-    return None
-#eliminar un jugador por id 
+    # Incluye las jugadas que todavía no se guardaron; si este proceso ya comparó su ranura de la
+    # tabla compartida con el repositorio (ver saldo_jugador), su saldo incluye también las de otros
+    # procesos. Si no, no se toca la tabla: una ranura sin comparar puede estar vieja
+    if _escritura is None:
+        jugador = obtener_repositorio().obtener(id)  # este proceso todavía no registró jugadas
+    else:
+        jugador = _escritura.obtener(id, obtener_repositorio().obtener)
+    if jugador is not None and id in _conciliados and _tabla is not None:
+        saldo = _tabla.saldo(id)
+        if saldo is not None:
+            jugador.saldo_actual = saldo
+    return jugador
+#eliminar un jugador por id
 def eliminar_jugador(id):
-    jugadores = cargar_jugadores()
-    jugadores = [j for j in jugadores if j.id != id]
-    guardar_jugadores(jugadores)
+    vaciar_pendientes()
+    obtener_repositorio().eliminar(id)
+    _obtener_tabla().eliminar(id)
+    _conciliados.discard(id)
     print(" Jugador eliminado.")
 
 def modificar_jugador(id, nuevo_nombre=None, nuevo_saldo=None):
-    jugadores = cargar_jugadores()
-    for jugador in jugadores:
-        if jugador.id == id:
-            if nuevo_nombre:
-                jugador.nombre = nuevo_nombre
-            if nuevo_saldo is not None:
-                jugador.saldo_actual = float(nuevo_saldo)
-            guardar_jugadores(jugadores)
-            print(" Jugador modificado.")
-            return
-    print(" Jugador no encontrado.")
+    def cambio(jugador):
+        if nuevo_nombre:
+            jugador.nombre = nuevo_nombre
+        if nuevo_saldo is not None:
+            jugador.saldo_actual = float(nuevo_saldo)
+    vaciar_pendientes()
+    jugador = obtener_repositorio().modificar(id, cambio)
+    if jugador is None:
+        print(" Jugador no encontrado.")
+        return
+    # Como en actualizar_jugador: no se pisan las jugadas pendientes de otros procesos
+    _obtener_tabla().confirmar(id, 0, jugador.saldo_actual, jugador.version)
+    print(" Jugador modificado.")
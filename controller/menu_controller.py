@@ -30,6 +30,7 @@ def menu_principal_controller():
         elif opcion == "5" :
             menu_reportes()
         elif opcion == "6":
+            cerrar_almacenamiento()  # guarda las jugadas pendientes antes de salir
             print("¡ESPERAMOS VERTE DE NUEVO EN EL CASINO!")
             break
         else:
@@ -65,6 +66,24 @@ def controllerMenu():
             id = input("ID del jugador a eliminar: ").upper()
             eliminar_jugador(id)
         elif opcion == "6":
+            ruta = input("Archivo a importar (.csv o .jsonl): ").strip()
+            try:
+                registrados, rechazados = importar_jugadores(ruta)
+            except (OSError, ValueError) as e:
+                print(f"No se pudo importar: {e}")
+                continue
+            print(f" {registrados} jugadores registrados, {len(rechazados)} filas rechazadas.")
+            for numero, motivo in rechazados[:20]:
+                print(f"  - Fila {numero}: {motivo}")
+            if len(rechazados) > 20:
+                print(f"  ... y {len(rechazados) - 20} más")
+        elif opcion == "7":
+            ruta = input("Archivo de destino (.csv o .jsonl): ").strip()
+            try:
+                print(f" {exportar_jugadores(ruta)} jugadores exportados a {ruta}.")
+            except (OSError, ValueError) as e:
+                print(f"No se pudo exportar: {e}")
+        elif opcion == "8":
             break 
         else:
             print("Opción inválida.")
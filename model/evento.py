@@ -0,0 +1,191 @@
+import re
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Juegos
+BLACKJACK = "blackjack"
+TRAGAMONEDAS = "tragamonedas"
+SIMULACION = "simulacion"
+
+# Resultados
+GANA = "GANA"
+PIERDE = "PIERDE"
+EMPATE = "EMPATE"
+INFO = "INFO"  # Actividad sin resultado (solo en historiales migrados del formato anterior)
+
+NOMBRES_JUEGO = {
+    BLACKJACK: "Blackjack",
+    TRAGAMONEDAS: "Tragamonedas",
+    SIMULACION: "Simulación",
+}
+
+# Texto de los motivos con los que termina una mano de Blackjack
+MOTIVOS = {
+    "blackjack": "Blackjack",
+    "bust": "Bust",
+    "dealer_bust": "Dealer Bust",
+    "doble_blackjack": "Ambos con Blackjack",
+    "mayor_puntaje": "Mayor puntaje",
+    "menor_puntaje": "Dealer mayor puntaje",
+    "mismo_puntaje": "Mismo puntaje",
+}
+
+NAN = float("nan")
+
+# Evento empaquetado (ver empaquetar): apuesta, pago, saldo (NaN = sin saldo), fecha,
+# código del juego, código del resultado y largo del detalle en utf-8, que va a continuación
+REGISTRO = struct.Struct("<ddddHHH")
+# Códigos de juego y resultado conocidos por este proceso (el empaquetado nunca se guarda en disco)
+_CODIGOS = [BLACKJACK, TRAGAMONEDAS, SIMULACION, GANA, PIERDE, EMPATE, INFO]
+_NUMERO_CODIGO = {codigo: i for i, codigo in enumerate(_CODIGOS)}
+_NUEVO_CODIGO = threading.Lock()
+
+
+class Evento:
+    """
+    Registro compacto de una jugada en el historial de un jugador.
+      juego:     BLACKJACK, TRAGAMONEDAS o SIMULACION
+      apuesta:   monto apostado
+      pago:      monto devuelto al jugador (0 si pierde, la apuesta si empata)
+      resultado: GANA, PIERDE, EMPATE o INFO
+      detalle:   código corto (motivo en Blackjack, combinación en Tragamonedas...)
+      saldo:     saldo del jugador después de la jugada
+      fecha:     marca de tiempo (segundos desde epoch)
+    El texto para mostrarlo se genera solo al imprimirlo (__str__).
+    Los historiales en memoria no guardan objetos Evento sino sus datos
+    empaquetados (ver empaquetar): los Evento se crean al leerlos.
+    """
+    __slots__ = ("juego", "apuesta", "pago", "resultado", "detalle", "saldo", "fecha")
+
+    def __init__(self, juego, apuesta, pago, resultado, detalle=None, saldo=None, fecha=None):
+        # Los códigos se repiten en todos los eventos: se internan para compartir una sola copia
+        self.juego = sys.intern(juego)
+        self.apuesta = apuesta
+        self.pago = pago
+        self.resultado = sys.intern(resultado)
+        self.detalle = sys.intern(detalle) if detalle else detalle
+        self.saldo = saldo
+        self.fecha = time.time() if fecha is None else fecha
+
+    @property
+    def neto(self):
+        """Ganancia (positiva) o pérdida (negativa) de la jugada"""
+        return self.pago - self.apuesta
+
+    def to_dict(self):
+        data = {"j": self.juego, "a": self.apuesta, "p": self.pago, "r": self.resultado,
+                "s": self.saldo, "t": self.fecha}
+        if self.detalle:
+            data["d"] = self.detalle
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        return Evento(data["j"], data["a"], data["p"], data["r"], data.get("d"), data.get("s"), data.get("t", 0))
+
+    @staticmethod
+    def desde_texto(texto):
+        """
+        Convierte una actividad del formato de texto anterior en un Evento.
+        Solo se usa al leer historiales viejos; el texto original se conserva
+        en detalle y la fecha queda en 0 (desconocida).
+        """
+        montos = [float(m) for m in re.findall(r"\$(-?\d+(?:\.\d+)?)", texto)]
+        saldo = montos[-1] if "Saldo" in texto and montos else None
+        if "[SIMULACIÓN]" in texto or "Simulación" in texto:
+            juego = SIMULACION
+        elif " con (" in texto:
+            juego = TRAGAMONEDAS
+        else:
+            juego = BLACKJACK
+
+        apuesta = pago = 0.0
+        if texto.startswith("Ganó") and montos:
+            resultado, pago = GANA, montos[0]
+        elif texto.startswith("Perdió") and montos:
+            resultado, apuesta = PIERDE, montos[0]
+        elif texto.startswith("Apostó") and "|" in texto and montos:
+            apuesta = montos[0]
+            if "Ganó" in texto:
+                resultado, pago = GANA, apuesta + montos[1]
+            elif "Perdió" in texto:
+                resultado = PIERDE
+            else:
+                resultado, pago = EMPATE, apuesta
+        else:
+            resultado = INFO
+        return Evento(juego, apuesta, pago, resultado, texto, saldo, 0)
+
+    def __str__(self):
+        if not self.fecha:
+            # Evento migrado del formato anterior: se muestra tal como se escribió
+            return self.detalle or ""
+        fecha = datetime.fromtimestamp(self.fecha).strftime("%Y-%m-%d %H:%M")
+        partes = [fecha, NOMBRES_JUEGO.get(self.juego, self.juego)]
+        if self.juego == TRAGAMONEDAS and self.detalle:
+            partes.append(self.detalle)
+        elif self.juego == SIMULACION and self.detalle:
+            partes.append(f"[SIMULACIÓN] {self.detalle}")
+        partes.append(f"Apostó ${self.apuesta:.2f}")
+
+        motivo = f" ({MOTIVOS[self.detalle]})" if self.detalle in MOTIVOS else ""
+        if self.resultado == GANA:
+            partes.append(f"Ganó ${self.neto:.2f}{motivo}")
+        elif self.resultado == PIERDE:
+            partes.append(f"Perdió ${self.apuesta - self.pago:.2f}{motivo}")
+        elif self.resultado == EMPATE:
+            partes.append(f"Empató{motivo}")
+        if self.saldo is not None:
+            partes.append(f"Saldo: ${self.saldo:.2f}")
+        return " | ".join(partes)
+
+
+def _numero(codigo):
+    numero = _NUMERO_CODIGO.get(codigo)
+    if numero is None:
+        # Un juego o resultado que no estaba en la lista: se le da el siguiente número
+        with _NUEVO_CODIGO:
+            numero = _NUMERO_CODIGO.get(codigo)
+            if numero is None:
+                _CODIGOS.append(sys.intern(codigo))
+                numero = _NUMERO_CODIGO[codigo] = len(_CODIGOS) - 1
+    return numero
+
+
+def empaquetar(eventos):
+    """
+    Empaqueta una secuencia de eventos en un solo bytes: un REGISTRO de ancho
+    fijo por evento seguido de su detalle. Ocupa una fracción de lo que ocupan
+    los Evento (sin objeto ni floats por evento) y se comparte entre copias.
+    Acepta Evento o sus diccionarios (to_dict), que así se empaquetan sin crear el Evento.
+    """
+    partes = []
+    for e in eventos:
+        if isinstance(e, dict):
+            juego, apuesta, pago, resultado = e["j"], e["a"], e["p"], e["r"]
+            detalle, saldo, fecha = e.get("d"), e.get("s"), e.get("t", 0)
+        else:
+            juego, apuesta, pago, resultado = e.juego, e.apuesta, e.pago, e.resultado
+            detalle, saldo, fecha = e.detalle, e.saldo, e.fecha
+        detalle = detalle.encode("utf-8") if detalle else b""
+        partes.append(REGISTRO.pack(apuesta, pago, NAN if saldo is None else saldo, fecha,
+                                    _numero(juego), _numero(resultado), len(detalle)))
+        partes.append(detalle)
+    return b"".join(partes)
+
+
+def desempaquetar(datos):
+    """Tupla de Evento a partir de lo que devuelve empaquetar"""
+    eventos = []
+    pos = 0
+    while pos < len(datos):
+        apuesta, pago, saldo, fecha, juego, resultado, largo = REGISTRO.unpack_from(datos, pos)
+        pos += REGISTRO.size
+        detalle = datos[pos:pos + largo].decode("utf-8") if largo else None
+        pos += largo
+        eventos.append(Evento(_CODIGOS[juego], apuesta, pago, _CODIGOS[resultado], detalle,
+                              None if saldo != saldo else saldo, fecha))
+    return tuple(eventos)
@@ -1,34 +1,105 @@
-import json
+from collections import deque
+from model.evento import Evento, empaquetar, desempaquetar
+
+MAX_HISTORIAL = 10 # Cantidad máxima de eventos que se guardan por jugador
+
 #Definir la clase del jugador
 class Jugador:
+    # __slots__ evita el __dict__ por instancia: con cientos de miles de jugadores en memoria la diferencia se nota
+    __slots__ = ("nombre", "id", "saldo_inicial", "saldo_actual", "_historial", "version")
+
     def __init__(self, nombre, id, saldo_inicial):
         self.nombre = nombre
         self.id = id
         self.saldo_inicial = float(saldo_inicial)
         self.saldo_actual = float(saldo_inicial)
-        self.historial = [] # Lista en la que guardaremos el hsitorial 
-    
-    def agregar_historial(self, actividad):#Fubncion a la que entra el objeto y actividad
-       # Agrega una actividad al historial del jugador (máx 10 elementos).
-        self.historial.append(actividad)# ->Añadir en el historial la actividad 
-        if len(self.historial) > 10:
-            self.historial.pop(0) # Eliminar el ultimo registro 
+        self._historial = b"" # Historial del jugador (ver la propiedad historial)
+        self.version = 0 # Aumenta cada vez que se guarda (control de concurrencia)
+
+    @property
+    def historial(self):
+        # Siempre una tupla de Evento (de solo lectura): para agregar se usa agregar_historial.
+        # Mientras nadie agregue eventos se guarda empaquetado en un solo bytes (compacto y compartible
+        # entre copias); al agregar el primero se pasa a un deque de tamaño fijo que descarta el más
+        # viejo en O(1) (ver compactar).
+        # Una lista es el historial todavía sin decodificar (from_dict con perezoso=True)
+        if isinstance(self._historial, list):
+            self.historial = self._historial
+        if isinstance(self._historial, bytes):
+            return desempaquetar(self._historial)
+        return tuple(self._historial)
+
+    @historial.setter
+    def historial(self, eventos):
+        # Los diccionarios se empaquetan tal cual; solo las frases de texto viejas pasan por Evento
+        self._historial = empaquetar([e if isinstance(e, dict) else _como_evento(e)
+                                      for e in list(eventos)[-MAX_HISTORIAL:]])
+
+    def agregar_historial(self, evento):#Fubncion a la que entra el objeto y el evento (model.evento.Evento)
+       # Agrega un evento al historial del jugador (máx 10 elementos).
+        if not isinstance(self._historial, deque):
+            self._historial = deque(self.historial, maxlen=MAX_HISTORIAL)
+        self._historial.append(evento)# ->Añadir en el historial el evento (el deque descarta el más viejo)
+
+    def compactar(self):
+        """Vuelve a empaquetar el historial después de agregar eventos (para los jugadores que quedan en memoria)"""
+        if isinstance(self._historial, deque):
+            self._historial = empaquetar(self._historial)
+
+    def aplicar_eventos(self, eventos):
+        """Suma al saldo el resultado de cada jugada y la agrega al historial con el saldo resultante"""
+        for evento in eventos:
+            self.saldo_actual += evento.neto
+            evento.saldo = self.saldo_actual
+            self.agregar_historial(evento)
 
     def to_dict(self):
+        if isinstance(self._historial, list) and all(isinstance(e, dict) for e in self._historial):
+            historial = self._historial # Sin decodificar y ya en el formato de eventos: se copia tal cual
+        else:
+            historial = [e.to_dict() for e in self.historial]
         return {
             "nombre": self.nombre,
             "id": self.id,
             "saldo_inicial": self.saldo_inicial,
             "saldo_actual": self.saldo_actual,
-            "historial": self.historial
+            "historial": historial,
+            "version": self.version
         }
 
     @staticmethod
-    def from_dict(data):
+    def from_dict(data, perezoso=False):
+        """
+        Crea el jugador a partir de su diccionario.
+        Con perezoso=True el historial se decodifica recién la primera vez que se usa:
+        sirve para recorrer muchos jugadores cuando solo interesan sus saldos.
+        """
         jugador = Jugador(data["nombre"], data["id"], data["saldo_inicial"])
         jugador.saldo_actual = data.get("saldo_actual", jugador.saldo_inicial)
-        jugador.historial = data.get("historial", [])
+        if perezoso:
+            jugador._historial = list(data.get("historial", ()))[-MAX_HISTORIAL:]
+        else:
+            jugador.historial = data.get("historial", [])
+        jugador.version = data.get("version", 0)
         return jugador
 
+    def copiar(self):
+        """Devuelve una copia independiente del jugador (incluido su historial)"""
+        copia = Jugador(self.nombre, self.id, self.saldo_inicial)
+        copia.saldo_actual = self.saldo_actual
+        # Un historial empaquetado o sin decodificar se comparte tal cual: nunca se modifica, solo se reemplaza
+        copia._historial = empaquetar(self._historial) if isinstance(self._historial, deque) else self._historial
+        copia.version = self.version
+        return copia
+
     def __str__(self):
-        return f"Jugador: {self.nombre} | ID: {self.id} | Saldo actual: ${self.saldo_actual:.2f}"
\ No newline at end of file
+        return f"Jugador: {self.nombre} | ID: {self.id} | Saldo actual: ${self.saldo_actual:.2f}"
+
+
+def _como_evento(dato):
+    # Los historiales viejos guardaban frases de texto; se convierten una sola vez al leerlos
+    if isinstance(dato, Evento):
+        return dato
+    if isinstance(dato, dict):
+        return Evento.from_dict(dato)
+    return Evento.desde_texto(dato)
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def bloquear(archivo, inicio=0, largo=1):
+    """Bloquea en exclusiva un rango de bytes de un archivo abierto (espera si está ocupado)"""
+    if fcntl:
+        fcntl.lockf(archivo.fileno(), fcntl.LOCK_EX, largo, inicio, os.SEEK_SET)
+        return
+    archivo.seek(inicio)
+    while True:
+        try:
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, largo)
+            return
+        except OSError:
+            # LK_LOCK se rinde después de ~10 segundos; seguir esperando
+            time.sleep(0.01)
+
+
+def intentar_bloquear(archivo, inicio=0, largo=1):
+    """Como bloquear(), pero sin esperar: devuelve False si el rango ya está bloqueado por otro proceso"""
+    if fcntl:
+        try:
+            fcntl.lockf(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB, largo, inicio, os.SEEK_SET)
+        except OSError:
+            return False
+        return True
+    archivo.seek(inicio)
+    try:
+        msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, largo)
+    except OSError:
+        return False
+    return True
+
+
+def desbloquear(archivo, inicio=0, largo=1):
+    """Libera un rango bloqueado con bloquear()"""
+    if fcntl:
+        fcntl.lockf(archivo.fileno(), fcntl.LOCK_UN, largo, inicio, os.SEEK_SET)
+        return
+    archivo.seek(inicio)
+    msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, largo)
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo entre procesos basado en un archivo .lock.
+    Es reentrante dentro del mismo proceso y seguro entre hilos.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._hilos = threading.RLock()
+        self._archivo = None
+        self._nivel = 0
+
+    def __enter__(self):
+        self._hilos.acquire()
+        if self._nivel == 0:
+            try:
+                carpeta = os.path.dirname(self.ruta)
+                if carpeta:
+                    os.makedirs(carpeta, exist_ok=True)
+                self._archivo = open(self.ruta, "a+b")
+                bloquear(self._archivo)
+            except BaseException:
+                if self._archivo:
+                    self._archivo.close()
+                    self._archivo = None
+                self._hilos.release()
+                raise
+        self._nivel += 1
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self._nivel -= 1
+        if self._nivel == 0:
+            desbloquear(self._archivo)
+            self._archivo.close()
+            self._archivo = None
+        self._hilos.release()
+        return False
+
+
+_bloqueos = {}
+_bloqueos_mutex = threading.Lock()
+
+
+def bloqueo_para(ruta):
+    """
+    Devuelve el BloqueoArchivo compartido de una ruta.
+    Los bloqueos de fcntl pertenecen al proceso (no al objeto que los toma):
+    si dos objetos del mismo proceso bloquearan el mismo archivo por separado,
+    soltar uno liberaría también al otro. Por eso se comparte uno por archivo.
+    """
+    ruta = os.path.abspath(ruta)
+    with _bloqueos_mutex:
+        if ruta not in _bloqueos:
+            _bloqueos[ruta] = BloqueoArchivo(ruta)
+        return _bloqueos[ruta]
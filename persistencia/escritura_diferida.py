@@ -0,0 +1,91 @@
+import atexit
+import threading
+
+
+class EscrituraDiferida:
+    """
+    Escritura diferida (write-behind) de las jugadas de los jugadores.
+
+    Las jugadas se anotan en memoria y un hilo en segundo plano las guarda
+    cada `intervalo` segundos. Todas las jugadas pendientes (de todos los
+    jugadores) se guardan juntas en una sola escritura. También se guardan al
+    llamar a vaciar() (fin de sesión) o cerrar() (salida del programa).
+
+    Usa su propio repositorio (creado con `fabrica_repositorio`) para que el
+    hilo de escritura no comparta conexión con el resto del programa.
+
+    Después de cada escritura llama a al_guardar({id: (eventos, jugador)})
+    con las jugadas que quedaron guardadas y cada jugador tal como quedó.
+    """
+
+    def __init__(self, fabrica_repositorio, intervalo=2.0, al_guardar=None):
+        self.repositorio = fabrica_repositorio()
+        self.intervalo = intervalo
+        self.al_guardar = al_guardar
+        self._pendientes = {}               # id -> lista de eventos en orden
+        self._mutex = threading.Lock()      # protege _pendientes
+        self._vaciando = threading.RLock()  # una sola escritura a la vez
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="escritura-diferida", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            self.vaciar()
+
+    def registrar(self, id, eventos):
+        """Anota jugadas de un jugador para guardarlas más tarde"""
+        with self._mutex:
+            self._pendientes.setdefault(id, []).extend(eventos)
+
+    def hay_pendientes(self):
+        with self._mutex:
+            return bool(self._pendientes)
+
+    def obtener(self, id, obtener):
+        """
+        Lee un jugador con obtener(id) y le aplica sus jugadas pendientes,
+        de modo que quien lo lee ve el saldo como si ya estuviera guardado.
+        """
+        # Mientras se lee no puede haber una escritura a medias
+        with self._vaciando:
+            jugador = obtener(id)
+            if jugador is not None:
+                with self._mutex:
+                    eventos = list(self._pendientes.get(id, ()))
+                jugador.aplicar_eventos(eventos)
+            return jugador
+
+    def vaciar(self):
+        """Guarda ahora todas las jugadas pendientes, de todos los jugadores en una sola escritura"""
+        with self._vaciando:
+            with self._mutex:
+                lote, self._pendientes = self._pendientes, {}
+            if not lote:
+                return
+            guardados = {}
+
+            def cambio(jugador, eventos):
+                jugador.aplicar_eventos(eventos)
+                guardados[jugador.id] = jugador  # si el repositorio reintenta, queda el último
+
+            cambios = {id: (lambda jugador, eventos=eventos: cambio(jugador, eventos)) for id, eventos in lote.items()}
+            try:
+                faltantes = self.repositorio.modificar_varios(cambios)
+            except Exception as e:
+                # Se devuelven a la cola (antes de las que llegaron después) para reintentar
+                with self._mutex:
+                    for id, eventos in lote.items():
+                        self._pendientes[id] = eventos + self._pendientes.get(id, [])
+                print(f"⚠️ No se pudieron guardar las jugadas de {len(lote)} jugadores: {e}")
+                return
+            if self.al_guardar:
+                self.al_guardar({id: (lote[id], jugador) for id, jugador in guardados.items() if id not in faltantes})
+
+    def cerrar(self):
+        """Detiene el hilo y guarda lo que quede pendiente"""
+        if not self._detener.is_set():
+            self._detener.set()
+            self._hilo.join()
+        self.vaciar()
@@ -0,0 +1,210 @@
+import atexit
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from persistencia.bloqueo import bloquear, intentar_bloquear, desbloquear
+
+MAGICO = b"POZO0002"
+MAGICO_ANTERIOR = b"POZO0001"  # sin reclamos: se agranda al abrirlo
+# mágico, monto actual, total sembrado por la casa, total aportado por las jugadas, total pagado,
+# cantidad de pagos, último premio pagado, ID del último ganador (utf-8 rellenado con ceros)
+ESTADO = struct.Struct("<8sddddQd32s")
+LARGO_ID = 32
+# Después del estado, los reclamos: pagos que todavía no se acreditaron al ganador.
+# Estado (LIBRE o PENDIENTE), número de pago, monto e ID completo del ganador (utf-8 rellenado con ceros)
+RECLAMO = struct.Struct("<BQd111s")
+LARGO_ID_RECLAMO = 111
+RECLAMOS = 64
+LIBRE = 0
+PENDIENTE = 1
+LOTE_APORTES = 100  # aportes que un proceso junta antes de sumarlos al pozo compartido
+
+
+def marca_pago(numero):
+    """Texto con el que el evento del ganador deja constancia de un pago del pozo"""
+    return f"pozo #{numero}"
+
+
+def tiene_marca(detalle, numero):
+    """El detalle de un evento incluye marca_pago(numero)"""
+    return re.search(rf"\bpozo #{numero}(?!\d)", detalle or "") is not None
+
+
+class PagoPozo:
+    """Un pago del pozo: número de pago (1, 2, ...), monto y ganador"""
+    __slots__ = ("numero", "monto", "id_jugador")
+
+    def __init__(self, numero, monto, id_jugador):
+        self.numero = numero
+        self.monto = monto
+        self.id_jugador = id_jugador
+
+
+class PozoProgresivo:
+    """
+    Pozo progresivo compartido por todas las sesiones y procesos, guardado
+    en un archivo pequeño mapeado en memoria (mmap).
+
+    Aportar es barato: cada proceso junta sus aportes en memoria y los suma
+    al pozo compartido de a `lote` (un bloqueo del archivo cada `lote`
+    tiradas, no uno por tirada). Antes de pagar, de leer el monto y al
+    salir del programa se suman los aportes que queden.
+
+    Pagar es exactamente una vez: cobrar() lee el monto, vuelve el pozo a
+    `inicial` y anota un reclamo (número de pago, monto y ganador), todo con
+    el archivo bloqueado, así que si dos sesiones aciertan a la vez, la
+    primera se lleva el pozo y la segunda el pozo ya reiniciado. Quien cobra
+    guarda el evento del ganador (con marca_pago en su detalle) y después
+    llama a acreditado(). Si el proceso muere entre medio, el reclamo queda
+    pendiente: reclamos_sin_acreditar() lo entrega a otro proceso, que lo
+    acredita si el evento no llegó a guardarse (ver jugador_controller).
+    Mientras el que cobró siga vivo tiene el reclamo bloqueado y nadie más
+    lo toma. Los totales permiten auditarlo: monto = sembrado + aportado - pagado.
+
+    Los aportes que otros procesos todavía tienen juntados (menos de `lote`
+    cada uno) no entran en el pozo que se cobra: se suman al siguiente.
+
+    Como los bloqueos de fcntl pertenecen al proceso, cada proceso debe
+    usar una sola instancia por archivo.
+    """
+
+    def __init__(self, archivo, inicial, lote=LOTE_APORTES):
+        self.archivo = archivo
+        self.inicial = inicial
+        self.lote = lote
+        carpeta = os.path.dirname(archivo)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self._hilos = threading.RLock()  # los bloqueos de fcntl no excluyen hilos del mismo proceso
+        self._pendiente = 0.0            # aportes de este proceso que todavía no se sumaron al pozo
+        self._aportes = 0
+        self._cobrando = set()           # números de pago cuyos reclamos tiene este proceso
+        self._archivo = os.fdopen(os.open(archivo, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        tamano = ESTADO.size + RECLAMOS * RECLAMO.size
+        with self._bloqueo_archivo():
+            if os.fstat(self._archivo.fileno()).st_size == 0:
+                self._archivo.truncate(tamano)
+                self._archivo.write(ESTADO.pack(MAGICO, inicial, inicial, 0.0, 0.0, 0, 0.0, b""))
+                self._archivo.flush()
+            elif self._archivo.read(len(MAGICO_ANTERIOR)) == MAGICO_ANTERIOR:
+                self._archivo.truncate(tamano)
+                self._archivo.seek(0)
+                self._archivo.write(MAGICO)
+                self._archivo.flush()
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0)
+        if ESTADO.unpack_from(self._mapa, 0)[0] != MAGICO:
+            raise ValueError(f"{archivo} no es un pozo progresivo")
+        atexit.register(self.sincronizar)
+
+    @contextmanager
+    def _bloqueo_archivo(self):
+        with self._hilos:
+            bloquear(self._archivo, 0, ESTADO.size)
+            try:
+                yield
+            finally:
+                desbloquear(self._archivo, 0, ESTADO.size)
+
+    def _sumar_pendiente(self):
+        """Suma al pozo los aportes juntados (con el archivo bloqueado)"""
+        if not self._aportes:
+            return
+        magico, monto, sembrado, aportado, pagado, pagos, ultimo, ganador = ESTADO.unpack_from(self._mapa, 0)
+        ESTADO.pack_into(self._mapa, 0, magico, monto + self._pendiente, sembrado, aportado + self._pendiente,
+                         pagado, pagos, ultimo, ganador)
+        self._pendiente = 0.0
+        self._aportes = 0
+
+    def aportar(self, monto, cantidad=1):
+        """Anota `cantidad` aportes que suman `monto` (una tirada, o todas las de un autojuego)"""
+        with self._hilos:
+            self._pendiente += monto
+            self._aportes += cantidad
+            if self._aportes >= self.lote:
+                self.sincronizar()
+
+    def sincronizar(self):
+        """Suma ya al pozo compartido los aportes de este proceso"""
+        with self._hilos:
+            if self._aportes and not self._mapa.closed:
+                with self._bloqueo_archivo():
+                    self._sumar_pendiente()
+
+    @property
+    def monto(self):
+        with self._bloqueo_archivo():
+            self._sumar_pendiente()
+            return ESTADO.unpack_from(self._mapa, 0)[1]
+
+    def estado(self):
+        """Totales del pozo: {monto, sembrado, aportado, pagado, pagos, ultimo_premio, ultimo_ganador}"""
+        with self._bloqueo_archivo():
+            self._sumar_pendiente()
+            _, monto, sembrado, aportado, pagado, pagos, ultimo, ganador = ESTADO.unpack_from(self._mapa, 0)
+        return {"monto": monto, "sembrado": sembrado, "aportado": aportado, "pagado": pagado, "pagos": pagos,
+                "ultimo_premio": ultimo, "ultimo_ganador": ganador.rstrip(b"\0").decode("utf-8", "replace")}
+
+    @staticmethod
+    def _posicion(n):
+        return ESTADO.size + n * RECLAMO.size
+
+    def cobrar(self, id_jugador):
+        """
+        Paga el pozo completo a un jugador, lo reinicia y anota el reclamo. Devuelve el
+        PagoPozo; una vez guardado el evento del ganador hay que llamar a acreditado()
+        """
+        clave = str(id_jugador).encode("utf-8")
+        if len(clave) > LARGO_ID_RECLAMO:
+            raise ValueError(f"El ID {id_jugador!r} es demasiado largo para cobrar el pozo")
+        with self._bloqueo_archivo():
+            # Un lugar libre que nadie tenga bloqueado (un proceso que está acreditando otro reclamo)
+            for n in range(RECLAMOS):
+                posicion = self._posicion(n)
+                if self._mapa[posicion] == LIBRE and intentar_bloquear(self._archivo, posicion, RECLAMO.size):
+                    break
+            else:
+                raise RuntimeError(f"Hay {RECLAMOS} pagos del pozo sin acreditar")
+            self._sumar_pendiente()
+            magico, monto, sembrado, aportado, pagado, pagos, _, _ = ESTADO.unpack_from(self._mapa, 0)
+            RECLAMO.pack_into(self._mapa, posicion, PENDIENTE, pagos + 1, monto, clave)
+            ESTADO.pack_into(self._mapa, 0, magico, self.inicial, sembrado + self.inicial, aportado,
+                             pagado + monto, pagos + 1, monto, clave[:LARGO_ID])
+            self._cobrando.add(pagos + 1)
+        return PagoPozo(pagos + 1, monto, id_jugador)
+
+    def acreditado(self, pago):
+        """El evento del ganador de `pago` ya está guardado: se borra su reclamo"""
+        with self._bloqueo_archivo():
+            for n in range(RECLAMOS):
+                posicion = self._posicion(n)
+                estado, numero, _, _ = RECLAMO.unpack_from(self._mapa, posicion)
+                if estado == PENDIENTE and numero == pago.numero:
+                    self._mapa[posicion] = LIBRE
+                    desbloquear(self._archivo, posicion, RECLAMO.size)
+                    break
+            self._cobrando.discard(pago.numero)
+
+    def reclamos_sin_acreditar(self):
+        """
+        Pagos que quedaron sin acreditar porque el proceso que los cobró murió. Este
+        proceso se queda con ellos: hay que acreditarlos y llamar a acreditado() con cada uno
+        """
+        pagos = []
+        with self._bloqueo_archivo():
+            for n in range(RECLAMOS):
+                posicion = self._posicion(n)
+                estado, numero, monto, clave = RECLAMO.unpack_from(self._mapa, posicion)
+                if (estado == PENDIENTE and numero not in self._cobrando
+                        and intentar_bloquear(self._archivo, posicion, RECLAMO.size)):
+                    self._cobrando.add(numero)
+                    pagos.append(PagoPozo(numero, monto, clave.rstrip(b"\0").decode("utf-8")))
+        return pagos
+
+    def cerrar(self):
+        self.sincronizar()
+        atexit.unregister(self.sincronizar)
+        self._mapa.close()
+        self._archivo.close()
@@ -0,0 +1,459 @@
+import heapq
+import json
+import os
+import random
+import re
+import time
+from model.jugador import Jugador
+from model.evento import GANA, PIERDE, EMPATE, SIMULACION
+from persistencia.bloqueo import bloqueo_para
+
+
+class ConflictoVersion(Exception):
+    """El jugador fue modificado por otro proceso después de haberlo leído"""
+
+
+class RepositorioJugadores:
+    """
+    Interfaz común de los almacenamientos de jugadores.
+    Las consultas de reportes tienen una implementación genérica basada en
+    iter_jugadores(); cada almacenamiento puede sobrescribirlas con algo más eficiente.
+    """
+
+    def todos(self):
+        raise NotImplementedError
+
+    def iter_jugadores(self):
+        """
+        Recorre los jugadores uno a uno. Los almacenamientos que pueden leerlos
+        sin cargarlos todos en memoria lo sobrescriben.
+        """
+        return iter(self.todos())
+
+    def existe(self, id):
+        raise NotImplementedError
+
+    def obtener(self, id):
+        raise NotImplementedError
+
+    def agregar(self, jugador):
+        raise NotImplementedError
+
+    def agregar_varios(self, jugadores):
+        """
+        Agrega varios jugadores nuevos. Devuelve el conjunto de IDs que ya
+        existían (esos no se agregan). Los almacenamientos lo sobrescriben
+        para guardarlos todos en una sola escritura.
+        """
+        return {j.id for j in jugadores if not self.agregar(j)}
+
+    def actualizar(self, jugador):
+        raise NotImplementedError
+
+    def eliminar(self, id):
+        raise NotImplementedError
+
+    def reemplazar_todos(self, jugadores):
+        raise NotImplementedError
+
+    def cerrar(self):
+        """Libera los recursos del almacenamiento"""
+        pass
+
+    def modificar(self, id, cambio, reintentos=50):
+        """
+        Lee el jugador, le aplica cambio(jugador) y lo guarda con control
+        optimista de versión. Si otro proceso lo guardó entretanto, vuelve a
+        leerlo y a aplicar el cambio. Devuelve el jugador guardado o None si no existe.
+        """
+        for intento in range(reintentos):
+            jugador = self.obtener(id)
+            if jugador is None:
+                return None
+            cambio(jugador)
+            try:
+                self.actualizar(jugador)
+                return jugador
+            except ConflictoVersion:
+                # Espera aleatoria creciente para no chocar otra vez con el mismo proceso
+                time.sleep(random.uniform(0, 0.001 * 2 ** min(intento, 6)))
+        raise ConflictoVersion(f"No se pudo guardar el jugador {id} tras {reintentos} intentos")
+
+    def modificar_varios(self, cambios, reintentos=50):
+        """
+        Aplica varios cambios ({id: cambio}) como modificar(). Por defecto uno
+        por uno; los repositorios lo redefinen para guardarlos todos en una
+        sola escritura. Devuelve los IDs que no existen.
+        """
+        return {id for id, cambio in cambios.items() if self.modificar(id, cambio, reintentos) is None}
+
+    def resumen_saldos(self):
+        """Devuelve (cantidad de jugadores, suma de saldos actuales)"""
+        cantidad = total = 0
+        for j in self.iter_jugadores():
+            cantidad += 1
+            total += j.saldo_actual
+        return cantidad, total
+
+    @staticmethod
+    def _mayores(filas, limite):
+        # Con límite solo se guardan en memoria los `limite` mejores (heap); sin él hay que ordenar todo
+        if limite:
+            return heapq.nlargest(limite, filas, key=lambda fila: fila[2])
+        return sorted(filas, key=lambda fila: fila[2], reverse=True)
+
+    def ranking_saldos(self, limite=None):
+        """Lista de (nombre, id, saldo_actual) de mayor a menor saldo"""
+        return self._mayores(((j.nombre, j.id, j.saldo_actual) for j in self.iter_jugadores()), limite)
+
+    def ranking_ganancias(self, limite=None):
+        """Lista de (nombre, id, ganancia) de mayor a menor ganancia"""
+        return self._mayores(((j.nombre, j.id, j.saldo_actual - j.saldo_inicial)
+                              for j in self.iter_jugadores()), limite)
+
+    def conteo_resultados(self):
+        """
+        Lista de (nombre, id, victorias, derrotas) de los jugadores con alguna jugada ganada o perdida.
+        Las apuestas simuladas del optimizador no cuentan: no son partidas jugadas.
+        """
+        filas = []
+        for j in self.iter_jugadores():
+            jugadas = [e.resultado for e in j.historial if e.juego != SIMULACION]
+            victorias = jugadas.count(GANA)
+            derrotas = jugadas.count(PIERDE)
+            if victorias + derrotas:
+                filas.append((j.nombre, j.id, victorias, derrotas))
+        return filas
+
+    def participacion_juegos(self):
+        """Diccionario juego -> (jugadas, jugadores distintos)"""
+        jugadas = {}
+        jugadores = {}
+        for j in self.iter_jugadores():
+            juegos = set()  # juegos de este jugador: así no hace falta guardar los IDs de todos
+            for e in j.historial:
+                if e.resultado in (GANA, PIERDE, EMPATE):
+                    jugadas[e.juego] = jugadas.get(e.juego, 0) + 1
+                    juegos.add(e.juego)
+            for juego in juegos:
+                jugadores[juego] = jugadores.get(juego, 0) + 1
+        return {juego: (jugadas[juego], jugadores[juego]) for juego in jugadas}
+
+
+class RepositorioJSON(RepositorioJugadores):
+    """
+    Repositorio de jugadores en memoria, indexado por ID.
+
+    Los datos viven en dos archivos:
+      - el snapshot (jugadores.json) con la lista completa de jugadores
+      - un journal (jugadores.journal) donde cada cambio se agrega como una línea JSON
+
+    Cada modificación cuesta un append pequeño al journal. Cuando el journal
+    acumula `limite_journal` registros se compacta: se reescribe el snapshot
+    y el journal se vacía. Al cargar se lee el snapshot y se reproduce el journal.
+
+    Varios procesos pueden compartir los archivos: toda lectura y escritura
+    se hace con el bloqueo de jugadores.lock y cada jugador guarda un número
+    de versión, de modo que guardar una copia desactualizada lanza ConflictoVersion.
+    """
+
+    def __init__(self, archivo, limite_journal=500, sincronizar_disco=True):
+        self.archivo = archivo
+        self.archivo_journal = os.path.splitext(archivo)[0] + ".journal"
+        self.limite_journal = limite_journal
+        self.sincronizar_disco = sincronizar_disco
+        self._bloqueo = bloqueo_para(os.path.splitext(archivo)[0] + ".lock")
+        self._jugadores = {}     # id -> Jugador
+        self._firma = None       # (mtime, tamaño) del snapshot cuando se leyó
+        self._offset_journal = 0 # bytes del journal ya reproducidos
+        self._registros_journal = 0
+        self._cargado = False
+
+    @staticmethod
+    def _firma_archivo(ruta):
+        """Devuelve una firma barata del archivo para detectar cambios externos"""
+        try:
+            info = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        return (info.st_mtime_ns, info.st_size)
+
+    def _asegurar_cargado(self):
+        """Carga el snapshot si hace falta y reproduce lo nuevo del journal"""
+        with self._bloqueo:
+            firma = self._firma_archivo(self.archivo)
+            if not self._cargado or firma != self._firma:
+                self._cargar_snapshot(firma)
+            self._reproducir_journal()
+
+    def _cargar_snapshot(self, firma):
+        self._jugadores = {}
+        if firma is not None:
+            with open(self.archivo, "r") as f:
+                for data in json.load(f):
+                    jugador = Jugador.from_dict(data)
+                    self._jugadores[jugador.id] = jugador
+        self._firma = firma
+        self._offset_journal = 0
+        self._registros_journal = 0
+        self._cargado = True
+
+    def _reproducir_journal(self):
+        """Aplica los registros del journal que todavía no se han leído"""
+        try:
+            tamano = os.path.getsize(self.archivo_journal)
+        except FileNotFoundError:
+            tamano = 0
+        if tamano < self._offset_journal:
+            # Otro proceso compactó el journal: volver a leer desde el snapshot
+            self._cargar_snapshot(self._firma_archivo(self.archivo))
+        if tamano == self._offset_journal:
+            return
+
+        with open(self.archivo_journal, "rb") as f:
+            f.seek(self._offset_journal)
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break  # registro incompleto (escritura interrumpida)
+                self._offset_journal += len(linea)
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    continue
+                self._aplicar_registro(registro)
+                self._registros_journal += 1
+
+    def _aplicar_registro(self, registro):
+        if registro["op"] == "guardar":
+            jugador = Jugador.from_dict(registro["jugador"])
+            self._jugadores[jugador.id] = jugador
+        elif registro["op"] == "eliminar":
+            self._jugadores.pop(registro["id"], None)
+
+    def _anotar(self, *registros):
+        """Agrega registros al final del journal (en una sola escritura) y compacta si se llegó al límite"""
+        lineas = "".join(json.dumps(registro, separators=(",", ":")) + "\n" for registro in registros)
+        with open(self.archivo_journal, "ab") as f:
+            f.write(lineas.encode("utf-8"))
+            f.flush()
+            if self.sincronizar_disco:
+                os.fsync(f.fileno())
+            self._offset_journal = f.tell()
+        self._registros_journal += len(registros)
+        if self._registros_journal >= self.limite_journal:
+            self._escribir_snapshot()
+
+    def compactar(self):
+        """Escribe un snapshot completo de forma atómica y vacía el journal"""
+        with self._bloqueo:
+            self._asegurar_cargado()
+            self._escribir_snapshot()
+
+    def _escribir_snapshot(self):
+        carpeta = os.path.dirname(self.archivo)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        temporal = self.archivo + ".tmp"
+        with open(temporal, "w") as f:
+            json.dump([j.to_dict() for j in self._jugadores.values()], f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.archivo)
+        # El snapshot ya contiene todo lo del journal, se puede truncar
+        open(self.archivo_journal, "wb").close()
+        self._firma = self._firma_archivo(self.archivo)
+        self._offset_journal = 0
+        self._registros_journal = 0
+
+    def todos(self):
+        """Lista con todos los jugadores"""
+        self._asegurar_cargado()
+        return list(self._jugadores.values())
+
+    def iter_jugadores(self):
+        """
+        Recorre los jugadores leyendo el snapshot de a un jugador por vez, sin
+        cargarlo entero ni usar la caché en memoria, de modo que la memoria no
+        depende del tamaño del archivo. El historial de cada jugador se
+        decodifica solo si se usa. Los cambios del journal se aplican encima.
+        """
+        with self._bloqueo:
+            # Snapshot abierto y journal leído bajo el mismo bloqueo: forman un estado consistente.
+            # Si luego otro proceso compacta, os.replace no afecta al archivo ya abierto
+            try:
+                snapshot = open(self.archivo, "r")
+            except FileNotFoundError:
+                snapshot = None
+            cambios = self._leer_journal()
+        return self._recorrer(snapshot, cambios)
+
+    def _leer_journal(self):
+        """Devuelve id -> último dato guardado (None si se eliminó) según el journal completo"""
+        cambios = {}
+        try:
+            with open(self.archivo_journal, "rb") as f:
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break
+                    try:
+                        registro = json.loads(linea)
+                    except ValueError:
+                        continue
+                    if registro["op"] == "guardar":
+                        cambios[registro["jugador"]["id"]] = registro["jugador"]
+                    elif registro["op"] == "eliminar":
+                        cambios[registro["id"]] = None
+        except FileNotFoundError:
+            pass
+        return cambios
+
+    @staticmethod
+    def _recorrer(snapshot, cambios):
+        if snapshot is not None:
+            with snapshot:
+                for data in leer_lista_json(snapshot):
+                    data = cambios.pop(data["id"], data)
+                    if data is not None:
+                        yield Jugador.from_dict(data, perezoso=True)
+        # Jugadores agregados después del último snapshot
+        for data in cambios.values():
+            if data is not None:
+                yield Jugador.from_dict(data, perezoso=True)
+
+    def existe(self, id):
+        self._asegurar_cargado()
+        return id in self._jugadores
+
+    def obtener(self, id):
+        """
+        Busca un jugador por ID en O(1).
+        Devuelve una copia para que los cambios no guardados no se filtren al repositorio.
+        """
+        self._asegurar_cargado()
+        jugador = self._jugadores.get(id)
+        return jugador.copiar() if jugador else None
+
+    def agregar(self, jugador):
+        """Agrega un jugador nuevo. Devuelve False si el ID ya existe"""
+        with self._bloqueo:
+            self._asegurar_cargado()
+            if jugador.id in self._jugadores:
+                return False
+            self._jugadores[jugador.id] = jugador.copiar()
+            self._anotar({"op": "guardar", "jugador": jugador.to_dict()})
+        return True
+
+    def agregar_varios(self, jugadores):
+        """Agrega varios jugadores nuevos en una sola escritura. Devuelve los IDs que ya existían"""
+        with self._bloqueo:
+            self._asegurar_cargado()
+            existentes = set()
+            nuevos = []
+            for jugador in jugadores:
+                if jugador.id in self._jugadores:
+                    existentes.add(jugador.id)
+                    continue
+                self._jugadores[jugador.id] = jugador.copiar()
+                nuevos.append(jugador)
+            if not nuevos:
+                return existentes
+            if self._registros_journal + len(nuevos) >= self.limite_journal:
+                # Un lote grande va directo al snapshot en vez de llenar el journal
+                self._escribir_snapshot()
+            else:
+                self._anotar(*({"op": "guardar", "jugador": j.to_dict()} for j in nuevos))
+        return existentes
+
+    def actualizar(self, jugador):
+        """
+        Reemplaza los datos guardados de un jugador existente.
+        Lanza ConflictoVersion si el jugador cambió desde que se leyó.
+        """
+        with self._bloqueo:
+            self._asegurar_cargado()
+            guardado = self._jugadores.get(jugador.id)
+            if guardado is None:
+                return False
+            if guardado.version != jugador.version:
+                raise ConflictoVersion(f"El jugador {jugador.id} fue modificado por otro proceso")
+            jugador.version += 1
+            self._jugadores[jugador.id] = jugador.copiar()
+            self._anotar({"op": "guardar", "jugador": jugador.to_dict()})
+        return True
+
+    def modificar(self, id, cambio, reintentos=50):
+        # Con el bloqueo tomado durante todo el ciclo no puede haber conflictos
+        with self._bloqueo:
+            return super().modificar(id, cambio, reintentos)
+
+    def modificar_varios(self, cambios, reintentos=50):
+        """Aplica los cambios con el bloqueo tomado y los anota en el journal en una sola escritura"""
+        with self._bloqueo:
+            self._asegurar_cargado()
+            faltantes = set()
+            registros = []
+            for id, cambio in cambios.items():
+                guardado = self._jugadores.get(id)
+                if guardado is None:
+                    faltantes.add(id)
+                    continue
+                jugador = guardado.copiar()
+                cambio(jugador)
+                jugador.version += 1
+                jugador.compactar()
+                self._jugadores[id] = jugador
+                registros.append({"op": "guardar", "jugador": jugador.to_dict()})
+            if registros:
+                self._anotar(*registros)
+        return faltantes
+
+    def eliminar(self, id):
+        """Elimina un jugador. Devuelve False si no existía"""
+        with self._bloqueo:
+            self._asegurar_cargado()
+            if self._jugadores.pop(id, None) is None:
+                return False
+            self._anotar({"op": "eliminar", "id": id})
+        return True
+
+    def reemplazar_todos(self, jugadores):
+        """Reemplaza el contenido completo del repositorio"""
+        with self._bloqueo:
+            self._jugadores = {j.id: j.copiar() for j in jugadores}
+            self._cargado = True
+            self._escribir_snapshot()
+
+
+_SEPARADORES = re.compile(r"[\s,]*")
+
+
+def leer_lista_json(archivo, tamano_bloque=1 << 16):
+    """
+    Genera uno a uno los elementos de un archivo que contiene una lista JSON,
+    leyéndolo por bloques: en memoria solo está el bloque y el elemento actual.
+    """
+    decodificador = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    abierta = False  # ya se pasó el "[" inicial
+    for bloque in iter(lambda: archivo.read(tamano_bloque), ""):
+        buffer = buffer[pos:] + bloque
+        pos = _SEPARADORES.match(buffer).end()
+        if not abierta:
+            if pos == len(buffer):
+                continue
+            if buffer[pos] != "[":
+                raise ValueError(f"{archivo.name} no contiene una lista JSON")
+            abierta = True
+            pos = _SEPARADORES.match(buffer, pos + 1).end()
+        while pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+            try:
+                elemento, pos = decodificador.raw_decode(buffer, pos)
+            except ValueError:
+                break  # elemento cortado al final del bloque: falta leer más
+            yield elemento
+            pos = _SEPARADORES.match(buffer, pos).end()
+    if abierta:
+        raise ValueError(f"{archivo.name} está incompleto")
@@ -0,0 +1,277 @@
+import os
+import sqlite3
+import sys
+from itertools import groupby
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from model.jugador import Jugador
+from model.evento import Evento, GANA, PIERDE, EMPATE, SIMULACION
+from persistencia.repositorio import RepositorioJugadores, RepositorioJSON, ConflictoVersion
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jugadores (
+    id            TEXT PRIMARY KEY,
+    nombre        TEXT NOT NULL,
+    saldo_inicial REAL NOT NULL,
+    saldo_actual  REAL NOT NULL,
+    version       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jugadores_saldo ON jugadores (saldo_actual);
+CREATE INDEX IF NOT EXISTS idx_jugadores_ganancia ON jugadores (saldo_actual - saldo_inicial);
+
+CREATE TABLE IF NOT EXISTS historial (
+    secuencia  INTEGER PRIMARY KEY AUTOINCREMENT,
+    jugador_id TEXT NOT NULL REFERENCES jugadores (id) ON DELETE CASCADE,
+    juego      TEXT NOT NULL,
+    apuesta    REAL NOT NULL,
+    pago       REAL NOT NULL,
+    resultado  TEXT NOT NULL,
+    detalle    TEXT,
+    saldo      REAL,
+    fecha      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_historial_jugador ON historial (jugador_id, secuencia);
+CREATE INDEX IF NOT EXISTS idx_historial_juego ON historial (juego, resultado, jugador_id);
+"""
+
+COLUMNAS_EVENTO = "juego, apuesta, pago, resultado, detalle, saldo, fecha"
+# Resultados que cuentan como una jugada (los INFO son actividades migradas sin resultado)
+RESULTADOS_JUGADA = (GANA, PIERDE, EMPATE)
+
+
+class RepositorioSQLite(RepositorioJugadores):
+    """
+    Almacenamiento de jugadores en SQLite (modo WAL).
+    Cada operación toca solo las filas del jugador involucrado y los
+    reportes de saldo se resuelven con consultas sobre índices.
+    SQLite se encarga del bloqueo entre procesos; la columna version
+    permite detectar copias desactualizadas (ConflictoVersion).
+    """
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        carpeta = os.path.dirname(archivo)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        # La conexión puede pasar a otro hilo (p. ej. la escritura diferida), nunca usarse desde dos a la vez
+        self._conexion = sqlite3.connect(archivo, timeout=30, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute("PRAGMA foreign_keys=ON")
+        self._migrar_historial_texto()
+        self._conexion.executescript(ESQUEMA)
+        columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(jugadores)")]
+        if "version" not in columnas:
+            # Bases creadas antes de existir el control de versiones
+            self._conexion.execute("ALTER TABLE jugadores ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def _migrar_historial_texto(self):
+        """Convierte la tabla historial del formato de texto (columna actividad) a eventos"""
+        columnas = [fila[1] for fila in self._conexion.execute("PRAGMA table_info(historial)")]
+        if "actividad" not in columnas:
+            return
+        filas = self._conexion.execute(
+            "SELECT jugador_id, actividad FROM historial ORDER BY secuencia").fetchall()
+        with self._conexion:
+            self._conexion.execute("DROP TABLE historial")
+            self._conexion.executescript(ESQUEMA)
+            self._conexion.executemany(
+                f"INSERT INTO historial (jugador_id, {COLUMNAS_EVENTO}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(jugador_id,) + self._fila_evento(Evento.desde_texto(actividad))
+                 for jugador_id, actividad in filas])
+
+    def cerrar(self):
+        self._conexion.close()
+
+    @staticmethod
+    def _fila_evento(e):
+        return (e.juego, e.apuesta, e.pago, e.resultado, e.detalle, e.saldo, e.fecha)
+
+    def _historial_de(self, id):
+        filas = self._conexion.execute(
+            f"SELECT {COLUMNAS_EVENTO} FROM historial WHERE jugador_id = ? ORDER BY secuencia", (id,))
+        return [Evento(*fila) for fila in filas]
+
+    @staticmethod
+    def _crear_jugador(fila, historial):
+        id, nombre, saldo_inicial, saldo_actual, version = fila
+        jugador = Jugador(nombre, id, saldo_inicial)
+        jugador.saldo_actual = saldo_actual
+        jugador.historial = historial
+        jugador.version = version
+        return jugador
+
+    def _escribir_historial(self, jugador):
+        self._conexion.execute("DELETE FROM historial WHERE jugador_id = ?", (jugador.id,))
+        self._conexion.executemany(
+            f"INSERT INTO historial (jugador_id, {COLUMNAS_EVENTO}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(jugador.id,) + self._fila_evento(e) for e in jugador.historial])
+
+    def todos(self):
+        historiales = {}
+        for fila in self._conexion.execute(
+                f"SELECT jugador_id, {COLUMNAS_EVENTO} FROM historial ORDER BY secuencia"):
+            historiales.setdefault(fila[0], []).append(Evento(*fila[1:]))
+        filas = self._conexion.execute(
+            "SELECT id, nombre, saldo_inicial, saldo_actual, version FROM jugadores ORDER BY rowid")
+        return [self._crear_jugador(fila, historiales.get(fila[0], [])) for fila in filas]
+
+    def iter_jugadores(self):
+        """Recorre los jugadores con una sola consulta, sin cargarlos todos en memoria"""
+        # Cursor propio: la conexión puede seguir usándose mientras se recorre
+        cursor = self._conexion.execute(
+            "SELECT j.id, j.nombre, j.saldo_inicial, j.saldo_actual, j.version, "
+            "h.juego, h.apuesta, h.pago, h.resultado, h.detalle, h.saldo, h.fecha "
+            "FROM jugadores j LEFT JOIN historial h ON h.jugador_id = j.id "
+            "ORDER BY j.rowid, h.secuencia")
+        for datos, filas in groupby(cursor, key=lambda fila: fila[:5]):
+            historial = [Evento(*fila[5:]) for fila in filas if fila[5] is not None]
+            yield self._crear_jugador(datos, historial)
+
+    def existe(self, id):
+        fila = self._conexion.execute("SELECT 1 FROM jugadores WHERE id = ?", (id,)).fetchone()
+        return fila is not None
+
+    def obtener(self, id):
+        fila = self._conexion.execute(
+            "SELECT id, nombre, saldo_inicial, saldo_actual, version FROM jugadores WHERE id = ?",
+            (id,)).fetchone()
+        if fila is None:
+            return None
+        return self._crear_jugador(fila, self._historial_de(id))
+
+    def agregar(self, jugador):
+        try:
+            with self._conexion:
+                self._conexion.execute(
+                    "INSERT INTO jugadores (id, nombre, saldo_inicial, saldo_actual, version) VALUES (?, ?, ?, ?, ?)",
+                    (jugador.id, jugador.nombre, jugador.saldo_inicial, jugador.saldo_actual, jugador.version))
+                self._escribir_historial(jugador)
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def agregar_varios(self, jugadores):
+        """Agrega varios jugadores nuevos en una sola transacción. Devuelve los IDs que ya existían"""
+        jugadores = list(jugadores)
+        with self._conexion:
+            existentes = set()
+            ids = [j.id for j in jugadores]
+            for inicio in range(0, len(ids), 500):  # SQLite limita la cantidad de parámetros por consulta
+                lote = ids[inicio:inicio + 500]
+                existentes.update(fila[0] for fila in self._conexion.execute(
+                    f"SELECT id FROM jugadores WHERE id IN ({', '.join('?' * len(lote))})", lote))
+            nuevos = [j for j in jugadores if j.id not in existentes]
+            self._conexion.executemany(
+                "INSERT INTO jugadores (id, nombre, saldo_inicial, saldo_actual, version) VALUES (?, ?, ?, ?, ?)",
+                [(j.id, j.nombre, j.saldo_inicial, j.saldo_actual, j.version) for j in nuevos])
+            self._conexion.executemany(
+                f"INSERT INTO historial (jugador_id, {COLUMNAS_EVENTO}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(j.id,) + self._fila_evento(e) for j in nuevos for e in j.historial])
+        return existentes
+
+    def actualizar(self, jugador):
+        with self._conexion:
+            cursor = self._conexion.execute(
+                "UPDATE jugadores SET nombre = ?, saldo_actual = ?, version = version + 1 "
+                "WHERE id = ? AND version = ?",
+                (jugador.nombre, jugador.saldo_actual, jugador.id, jugador.version))
+            if cursor.rowcount == 0:
+                if self.existe(jugador.id):
+                    raise ConflictoVersion(f"El jugador {jugador.id} fue modificado por otro proceso")
+                return False
+            self._escribir_historial(jugador)
+        jugador.version += 1
+        return True
+
+    def modificar_varios(self, cambios, reintentos=50):
+        """Aplica los cambios en una sola transacción (un solo commit para todos)"""
+        faltantes = set()
+        with self._conexion:
+            # Con BEGIN IMMEDIATE nadie más escribe hasta el commit: no puede haber conflictos de versión
+            self._conexion.execute("BEGIN IMMEDIATE")
+            for id, cambio in cambios.items():
+                jugador = self.obtener(id)
+                if jugador is None:
+                    faltantes.add(id)
+                    continue
+                cambio(jugador)
+                self._conexion.execute(
+                    "UPDATE jugadores SET nombre = ?, saldo_actual = ?, version = version + 1 WHERE id = ?",
+                    (jugador.nombre, jugador.saldo_actual, id))
+                jugador.version += 1  # igual que en la fila, para quien siga usando el jugador
+                self._escribir_historial(jugador)
+        return faltantes
+
+    def eliminar(self, id):
+        with self._conexion:
+            cursor = self._conexion.execute("DELETE FROM jugadores WHERE id = ?", (id,))
+        return cursor.rowcount > 0
+
+    def reemplazar_todos(self, jugadores):
+        with self._conexion:
+            self._conexion.execute("DELETE FROM historial")
+            self._conexion.execute("DELETE FROM jugadores")
+            self._conexion.executemany(
+                "INSERT INTO jugadores (id, nombre, saldo_inicial, saldo_actual, version) VALUES (?, ?, ?, ?, ?)",
+                [(j.id, j.nombre, j.saldo_inicial, j.saldo_actual, j.version) for j in jugadores])
+            self._conexion.executemany(
+                f"INSERT INTO historial (jugador_id, {COLUMNAS_EVENTO}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(j.id,) + self._fila_evento(e) for j in jugadores for e in j.historial])
+
+    def resumen_saldos(self):
+        cantidad, total = self._conexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(saldo_actual), 0) FROM jugadores").fetchone()
+        return cantidad, total
+
+    def ranking_saldos(self, limite=None):
+        return self._conexion.execute(
+            "SELECT nombre, id, saldo_actual FROM jugadores ORDER BY saldo_actual DESC LIMIT ?",
+            (limite or -1,)).fetchall()
+
+    def ranking_ganancias(self, limite=None):
+        return self._conexion.execute(
+            "SELECT nombre, id, saldo_actual - saldo_inicial FROM jugadores "
+            "ORDER BY saldo_actual - saldo_inicial DESC LIMIT ?",
+            (limite or -1,)).fetchall()
+
+    def conteo_resultados(self):
+        # Igual que la versión genérica: las apuestas simuladas no cuentan
+        return self._conexion.execute(
+            "SELECT j.nombre, j.id, SUM(h.resultado = ?), SUM(h.resultado = ?) "
+            "FROM historial h JOIN jugadores j ON j.id = h.jugador_id "
+            "WHERE h.resultado IN (?, ?) AND h.juego != ? GROUP BY h.jugador_id",
+            (GANA, PIERDE, GANA, PIERDE, SIMULACION)).fetchall()
+
+    def participacion_juegos(self):
+        marcadores = ", ".join("?" * len(RESULTADOS_JUGADA))
+        filas = self._conexion.execute(
+            f"SELECT juego, COUNT(*), COUNT(DISTINCT jugador_id) FROM historial "
+            f"WHERE resultado IN ({marcadores}) GROUP BY juego", RESULTADOS_JUGADA)
+        return {juego: (jugadas, jugadores) for juego, jugadas, jugadores in filas}
+
+
+def migrar_desde_json(archivo_json, archivo_db, forzar=False):
+    """
+    Copia los jugadores del almacenamiento JSON (snapshot + journal) a SQLite.
+    No hace nada si la base ya tiene jugadores, salvo que se indique forzar=True.
+    Devuelve el número de jugadores migrados.
+    """
+    destino = RepositorioSQLite(archivo_db)
+    try:
+        cantidad, _ = destino.resumen_saldos()
+        if cantidad and not forzar:
+            print(f"La base {archivo_db} ya tiene {cantidad} jugadores. Usa forzar=True para reemplazarlos.")
+            return 0
+        jugadores = RepositorioJSON(archivo_json).todos()
+        destino.reemplazar_todos(jugadores)
+        return len(jugadores)
+    finally:
+        destino.cerrar()
+
+
+if __name__ == "__main__":
+    # Migración única: python persistencia/repositorio_sqlite.py [--forzar]
+    migrados = migrar_desde_json(os.path.join("data", "jugadores.json"),
+                                 os.path.join("data", "jugadores.db"),
+                                 forzar="--forzar" in sys.argv)
+    print(f"✅ {migrados} jugadores migrados a SQLite.")
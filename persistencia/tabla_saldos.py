@@ -0,0 +1,251 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from persistencia.bloqueo import bloquear, intentar_bloquear, desbloquear
+
+MAGICO = b"SALDOS02"
+CABECERA = struct.Struct("<8sI")  # mágico, capacidad (en ranuras)
+TAMANO_CABECERA = 64
+# Ranura de 64 bytes: estado, id (utf-8 rellenado con ceros), saldo_inicial, saldo guardado en el
+# almacenamiento, jugadas todavía sin guardar (suma de sus netos) y versión del jugador en el almacenamiento
+RANURA = struct.Struct("<B31sdddQ")
+LARGO_ID = 31
+# Solo los valores de la ranura (desde el byte 1 + LARGO_ID). Las búsquedas leen el estado y el id sin
+# bloqueo y pack_into pone en cero lo que va a escribir antes de escribirlo: por eso al actualizar
+# se escriben solo los valores, y al agregar el estado va último
+VALORES = struct.Struct("<dddQ")
+# Cada proceso que tiene la tabla abierta mantiene bloqueado uno de estos bytes (más allá del final
+# del archivo, donde no molestan a las ranuras): así se sabe si hay alguien más usándola
+PRESENCIA = 1 << 40
+PROCESOS = 256
+
+VACIA = 0
+OCUPADA = 1
+BORRADA = 2  # lápida: la búsqueda sigue de largo, una inserción puede reutilizarla
+
+
+class TablaLlena(Exception):
+    """No quedan ranuras libres en la tabla de saldos"""
+
+
+class TablaSaldos:
+    """
+    Tabla de saldos en un archivo binario de ranuras de ancho fijo, mapeado
+    en memoria (mmap) y compartido por todos los procesos de juego.
+
+    Cada jugador ocupa una ranura elegida por un hash estable de su ID
+    (crc32) con sondeo lineal, así que leer o actualizar un saldo es O(1)
+    y no requiere cargar el almacenamiento de jugadores.
+
+    Es una caché del almacenamiento, no una segunda fuente de verdad: cada
+    ranura guarda el saldo y la versión del jugador tal como están en el
+    almacenamiento, más la suma de las jugadas que los procesos ya
+    registraron pero todavía no guardaron (pendiente). El saldo al día es
+    guardado + pendiente. Al guardarse unas jugadas (confirmar) pasan de
+    pendiente a guardado. cargar() compara la ranura con el almacenamiento y
+    la corrige si este cambió por otro lado (migración, copia restaurada...).
+    Si un proceso muere con jugadas sin guardar, estas se pierden del
+    almacenamiento pero seguirían en pendiente: por eso el primer proceso
+    que abre la tabla sin que nadie más la tenga abierta la vacía.
+
+    Cuando no quedan ranuras libres se liberan las que no tienen jugadas
+    pendientes (se vuelven a cargar del almacenamiento al usarlas).
+
+    Las actualizaciones se hacen en el lugar con el rango de bytes de la
+    ranura bloqueado (bloqueo por ranura entre procesos); las altas y bajas
+    bloquean además la cabecera.
+
+    Como los bloqueos de fcntl pertenecen al proceso, cada proceso debe
+    usar una sola instancia por archivo.
+    """
+
+    def __init__(self, archivo, capacidad=1 << 16):
+        self.archivo = archivo
+        carpeta = os.path.dirname(archivo)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self._hilos = threading.RLock()  # los bloqueos de fcntl no excluyen hilos del mismo proceso
+        self._archivo = os.fdopen(os.open(archivo, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        with self._bloqueo(0, TAMANO_CABECERA):
+            if self._registrar_presencia():
+                # Nadie más la tiene abierta: lo que haya quedado no se puede confirmar contra el almacenamiento
+                self._archivo.truncate(0)
+                self._archivo.truncate(TAMANO_CABECERA + capacidad * RANURA.size)
+                self._archivo.seek(0)
+                self._archivo.write(CABECERA.pack(MAGICO, capacidad))
+                self._archivo.flush()
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0)
+        magico, self.capacidad = CABECERA.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"{archivo} no es una tabla de saldos")
+
+    def _registrar_presencia(self):
+        """Bloquea un byte de presencia para este proceso. Devuelve True si no hay otro proceso presente"""
+        self._presencia = None
+        solo = True
+        for i in range(PROCESOS):
+            if not intentar_bloquear(self._archivo, PRESENCIA + i, 1):
+                solo = False
+            elif self._presencia is None:
+                self._presencia = PRESENCIA + i
+            else:
+                desbloquear(self._archivo, PRESENCIA + i, 1)
+        return solo
+
+    @contextmanager
+    def _bloqueo(self, inicio, largo):
+        with self._hilos:
+            bloquear(self._archivo, inicio, largo)
+            try:
+                yield
+            finally:
+                desbloquear(self._archivo, inicio, largo)
+
+    @staticmethod
+    def _clave(id):
+        clave = str(id).encode("utf-8")
+        if len(clave) > LARGO_ID:
+            # IDs largos: se guarda un resumen de su mismo tamaño (la colisión es despreciable)
+            return hashlib.blake2b(clave, digest_size=LARGO_ID).digest()
+        return clave.ljust(LARGO_ID, b"\0")
+
+    def _buscar(self, clave):
+        """Devuelve (posición de la ranura con esa clave o None, primera posición libre o None)"""
+        n = zlib.crc32(clave) % self.capacidad
+        libre = None
+        for _ in range(self.capacidad):
+            posicion = TAMANO_CABECERA + n * RANURA.size
+            estado = self._mapa[posicion]
+            if estado == VACIA:
+                return None, posicion if libre is None else libre
+            if estado == BORRADA:
+                if libre is None:
+                    libre = posicion
+            elif self._mapa[posicion + 1:posicion + 1 + LARGO_ID] == clave:
+                return posicion, libre
+            n = (n + 1) % self.capacidad
+        return None, libre
+
+    def _leer(self, posicion, clave):
+        # Entre la búsqueda y el bloqueo la ranura pudo cambiar de dueño: se comprueba de nuevo
+        estado, guardada, inicial, guardado, pendiente, version = RANURA.unpack_from(self._mapa, posicion)
+        if estado != OCUPADA or guardada != clave:
+            return None
+        return inicial, guardado, pendiente, version
+
+    def obtener(self, id):
+        """Devuelve (saldo_inicial, saldo guardado, pendiente, versión) o None si el jugador no está en la tabla"""
+        clave = self._clave(id)
+        posicion, _ = self._buscar(clave)
+        if posicion is None:
+            return None
+        with self._bloqueo(posicion, RANURA.size):
+            return self._leer(posicion, clave)
+
+    def saldo(self, id):
+        """Saldo al día (guardado + pendiente) o None si el jugador no está en la tabla"""
+        datos = self.obtener(id)
+        return datos[1] + datos[2] if datos else None
+
+    def cargar(self, id, leer):
+        """
+        Agrega un jugador o lo compara con el almacenamiento, y devuelve su saldo al día.
+        leer() devuelve (saldo_inicial, saldo guardado, versión) del almacenamiento, o None
+        si el jugador no existe; se llama con la ranura bloqueada, así que ninguna jugada
+        se confirma entretanto. Si la ranura no coincide con lo leído se corrige (sin
+        tocar lo pendiente de otros procesos). Lanza TablaLlena si no hay lugar.
+        """
+        clave = self._clave(id)
+        with self._bloqueo(0, TAMANO_CABECERA):
+            posicion, libre = self._buscar(clave)
+            if posicion is None and libre is None:
+                self._liberar()
+                posicion, libre = self._buscar(clave)
+                if libre is None:
+                    raise TablaLlena(f"La tabla de saldos {self.archivo} está llena ({self.capacidad} jugadores "
+                                     f"con jugadas sin guardar)")
+            with self._bloqueo(posicion or libre, RANURA.size):
+                datos = leer()
+                if datos is None:
+                    if posicion is not None:
+                        self._mapa[posicion] = BORRADA
+                    return None
+                inicial, guardado, version = datos
+                if posicion is None:
+                    self._mapa[libre + 1:libre + 1 + LARGO_ID] = clave
+                    VALORES.pack_into(self._mapa, libre + 1 + LARGO_ID, inicial, guardado, 0.0, version)
+                    self._mapa[libre] = OCUPADA
+                    return guardado
+                _, en_tabla, pendiente, version_tabla = self._leer(posicion, clave)
+                if (en_tabla, version_tabla) != (guardado, version):
+                    VALORES.pack_into(self._mapa, posicion + 1 + LARGO_ID, inicial, guardado, pendiente, version)
+        return guardado + pendiente
+
+    def _liberar(self):
+        """
+        Tabla llena: quita las ranuras sin jugadas pendientes (su saldo ya está en el
+        almacenamiento) y vuelve a ubicar las demás. Se llama con la cabecera bloqueada.
+        """
+        with self._bloqueo(TAMANO_CABECERA, self.capacidad * RANURA.size):
+            quedan = []
+            for n in range(self.capacidad):
+                ranura = RANURA.unpack_from(self._mapa, TAMANO_CABECERA + n * RANURA.size)
+                if ranura[0] == OCUPADA and ranura[4] != 0:
+                    quedan.append(ranura)
+            self._mapa[TAMANO_CABECERA:] = bytes(self.capacidad * RANURA.size)
+            for ranura in quedan:
+                _, libre = self._buscar(ranura[1])
+                RANURA.pack_into(self._mapa, libre, *ranura)
+
+    def _actualizar(self, id, delta, guardado=None, version=None):
+        clave = self._clave(id)
+        posicion, _ = self._buscar(clave)
+        if posicion is None:
+            return None
+        with self._bloqueo(posicion, RANURA.size):
+            datos = self._leer(posicion, clave)
+            if datos is None:
+                return None
+            inicial, en_tabla, pendiente, version_tabla = datos
+            pendiente += delta
+            if version is not None and version > version_tabla:
+                en_tabla, version_tabla = guardado, version
+            VALORES.pack_into(self._mapa, posicion + 1 + LARGO_ID, inicial, en_tabla, pendiente, version_tabla)
+        return en_tabla + pendiente
+
+    def sumar(self, id, delta):
+        """Suma delta (jugadas todavía sin guardar) de forma atómica. Devuelve el nuevo saldo o None si no está"""
+        return self._actualizar(id, delta)
+
+    def confirmar(self, id, delta, guardado, version):
+        """
+        Avisa que se guardaron en el almacenamiento jugadas que sumaban delta (0 si se
+        guardó un cambio que no pasó por sumar), quedando el jugador con ese saldo
+        guardado y esa versión. Devuelve el saldo al día o None si no está.
+        """
+        return self._actualizar(id, -delta, guardado, version)
+
+    def eliminar(self, id):
+        """Quita un jugador de la tabla. Devuelve False si no estaba"""
+        clave = self._clave(id)
+        with self._bloqueo(0, TAMANO_CABECERA):
+            posicion, _ = self._buscar(clave)
+            if posicion is None:
+                return False
+            with self._bloqueo(posicion, RANURA.size):
+                self._mapa[posicion] = BORRADA
+        return True
+
+    def vaciar(self):
+        """Quita todos los jugadores (se vuelven a cargar del almacenamiento al usarlos)"""
+        with self._bloqueo(0, TAMANO_CABECERA):
+            with self._bloqueo(TAMANO_CABECERA, self.capacidad * RANURA.size):
+                self._mapa[TAMANO_CABECERA:] = bytes(self.capacidad * RANURA.size)
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()  # libera también el byte de presencia
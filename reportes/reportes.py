@@ -4,11 +4,12 @@ from collections import Counter, defaultdict
 from datetime import datetime
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from controller.jugador_controller import cargar_jugadores
+from controller.jugador_controller import obtener_repositorio, vaciar_pendientes
+from model.evento import BLACKJACK, TRAGAMONEDAS, SIMULACION, GANA, PIERDE, EMPATE
 
 class GeneradorReportes:
     def __init__(self):
-        self.jugadores = cargar_jugadores()
+        self.repositorio = obtener_repositorio()
 
     def reporte_jugadores_mayor_saldo(self):
         """1. Jugadores con mayor saldo actual"""
@@ -16,26 +17,27 @@ class GeneradorReportes:
         print("📊 REPORTE 1: JUGADORES CON MAYOR SALDO")
         print("=" * 60)
         
-        if not self.jugadores:
+        cantidad, total_saldo = self.repositorio.resumen_saldos()
+        if not cantidad:
             print("❌ No hay jugadores registrados.")
             return
         
-        # Ordenar jugadores por saldo actual (descendente)
-        jugadores_ordenados = sorted(self.jugadores, key=lambda x: x.saldo_actual, reverse=True)
+        # Jugadores ordenados por saldo actual (descendente)
+        jugadores_ordenados = self.repositorio.ranking_saldos()
         
         print(f"{'POSICIÓN':<10} {'NOMBRE':<25} {'ID':<10} {'SALDO ACTUAL':<15}")
         print("-" * 60)
         
-        for i, jugador in enumerate(jugadores_ordenados, 1):
-            print(f"{i:<10} {jugador.nombre[:24]:<25} {jugador.id:<10} ${jugador.saldo_actual:<14.2f}")
+        for i, (nombre, id, saldo_actual) in enumerate(jugadores_ordenados, 1):
+            print(f"{i:<10} {nombre[:24]:<25} {id:<10} ${saldo_actual:<14.2f}")
         
         # Estadísticas adicionales
         print("\n📈 ESTADÍSTICAS:")
-        total_saldo = sum(j.saldo_actual for j in self.jugadores)
-        promedio_saldo = total_saldo / len(self.jugadores)
+        promedio_saldo = total_saldo / cantidad
+        nombre_top, _, saldo_top = jugadores_ordenados[0]
         print(f"💰 Saldo total en el casino: ${total_saldo:.2f}")
         print(f"📊 Saldo promedio por jugador: ${promedio_saldo:.2f}")
-        print(f"🏆 Jugador con más dinero: {jugadores_ordenados[0].nombre} (${jugadores_ordenados[0].saldo_actual:.2f})")
+        print(f"🏆 Jugador con más dinero: {nombre_top} (${saldo_top:.2f})")
         print("=" * 60)
     
     
@@ -47,16 +49,18 @@ class GeneradorReportes:
         
         print("\n🔍 ANÁLISIS DEL HISTORIAL:")
         
-        # Contar juegos jugados
-        juegos_blackjack = sum(1 for actividad in jugador.historial if "Blackjack" in actividad)
-        juegos_tragamonedas = sum(1 for actividad in jugador.historial if any(simbolo in actividad for simbolo in ["🍒", "🍋", "7️⃣", "🔔", "BAR"]))
+        # Contar juegos jugados (las apuestas simuladas de BotConsejos no son victorias ni derrotas,
+        # como en conteo_resultados)
+        jugadas = [e for e in jugador.historial if e.resultado in (GANA, PIERDE, EMPATE) and e.juego != SIMULACION]
+        juegos_blackjack = sum(1 for e in jugadas if e.juego == BLACKJACK)
+        juegos_tragamonedas = sum(1 for e in jugadas if e.juego == TRAGAMONEDAS)
         
         print(f"🃏 Partidas de Blackjack: {juegos_blackjack}")
         print(f"🎰 Jugadas de Tragamonedas: {juegos_tragamonedas}")
         
         # Contar victorias y derrotas
-        victorias = sum(1 for actividad in jugador.historial if "Ganó" in actividad)
-        derrotas = sum(1 for actividad in jugador.historial if "Perdió" in actividad)
+        victorias = sum(1 for e in jugadas if e.resultado == GANA)
+        derrotas = sum(1 for e in jugadas if e.resultado == PIERDE)
         
         if victorias + derrotas > 0:
             porcentaje_victoria = (victorias / (victorias + derrotas)) * 100
@@ -70,30 +74,24 @@ class GeneradorReportes:
         print("📊 REPORTE 3: RANKING DE MEJORES JUGADORES")
         print("=" * 60)
         
-        if not self.jugadores:
+        # Ganancia/pérdida de cada jugador, ordenada de mayor a menor
+        jugadores_con_ganancia = self.repositorio.ranking_ganancias()
+        
+        if not jugadores_con_ganancia:
             print("❌ No hay jugadores registrados.")
             return
         
-        # Calcular ganancia/pérdida de cada jugador
-        jugadores_con_ganancia = []
-        for jugador in self.jugadores:
-            ganancia = jugador.saldo_actual - jugador.saldo_inicial
-            jugadores_con_ganancia.append((jugador, ganancia))
-        
-        # Ordenar por ganancia (descendente)
-        jugadores_con_ganancia.sort(key=lambda x: x[1], reverse=True)
-        
         print(f"{'RANK':<6} {'NOMBRE':<25} {'ID':<10} {'GANANCIA/PÉRDIDA':<18} {'ESTADO':<10}")
         print("-" * 70)
         
-        for i, (jugador, ganancia) in enumerate(jugadores_con_ganancia, 1):
+        for i, (nombre, id, ganancia) in enumerate(jugadores_con_ganancia, 1):
             estado = "🏆 GANADOR" if ganancia > 0 else "💸 PERDEDOR" if ganancia < 0 else "🤝 EMPATE"
             signo = "+" if ganancia >= 0 else ""
-            print(f"{i:<6} {jugador.nombre[:24]:<25} {jugador.id:<10} {signo}${ganancia:<17.2f} {estado}")
+            print(f"{i:<6} {nombre[:24]:<25} {id:<10} {signo}${ganancia:<17.2f} {estado}")
         
         # Estadísticas del ranking
-        ganadores = sum(1 for _, ganancia in jugadores_con_ganancia if ganancia > 0)
-        perdedores = sum(1 for _, ganancia in jugadores_con_ganancia if ganancia < 0)
+        ganadores = sum(1 for _, _, ganancia in jugadores_con_ganancia if ganancia > 0)
+        perdedores = sum(1 for _, _, ganancia in jugadores_con_ganancia if ganancia < 0)
         empates = len(jugadores_con_ganancia) - ganadores - perdedores
         
         print(f"\n📈 ESTADÍSTICAS DEL RANKING:")
@@ -102,8 +100,8 @@ class GeneradorReportes:
         print(f"🤝 Sin cambios: {empates}")
         
         if jugadores_con_ganancia:
-            mejor_jugador, mejor_ganancia = jugadores_con_ganancia[0]
-            print(f"👑 Mejor jugador: {mejor_jugador.nombre} (+${mejor_ganancia:.2f})")
+            mejor_nombre, _, mejor_ganancia = jugadores_con_ganancia[0]
+            print(f"👑 Mejor jugador: {mejor_nombre} (+${mejor_ganancia:.2f})")
         
         print("=" * 60)
     
@@ -113,23 +111,19 @@ class GeneradorReportes:
         print("📊 REPORTE 4: JUGADORES CON MÁS DERROTAS")
         print("=" * 60)
         
-        if not self.jugadores:
+        cantidad, _ = self.repositorio.resumen_saldos()
+        if not cantidad:
             print("❌ No hay jugadores registrados.")
             return
         
-        # Contar derrotas por jugador
+        # Derrotas y victorias por jugador (se cuentan por el código de resultado de cada evento)
         jugadores_derrotas = []
-        for jugador in self.jugadores:
-            derrotas = sum(1 for actividad in jugador.historial if "Perdió" in actividad)
-            victorias = sum(1 for actividad in jugador.historial if "Ganó" in actividad)
-            total_juegos = derrotas + victorias
-            
-            if total_juegos > 0:
-                porcentaje_derrotas = (derrotas / total_juegos) * 100
-                jugadores_derrotas.append((jugador, derrotas, victorias, porcentaje_derrotas))
+        for nombre, id, victorias, derrotas in self.repositorio.conteo_resultados():
+            porcentaje_derrotas = (derrotas / (derrotas + victorias)) * 100
+            jugadores_derrotas.append((nombre, id, derrotas, victorias, porcentaje_derrotas))
         
         # Ordenar por número de derrotas (descendente)
-        jugadores_derrotas.sort(key=lambda x: x[1], reverse=True)
+        jugadores_derrotas.sort(key=lambda x: x[2], reverse=True)
         
         if not jugadores_derrotas:
             print("📋 No hay jugadores con historial de juegos.")
@@ -138,20 +132,20 @@ class GeneradorReportes:
         print(f"{'NOMBRE':<25} {'ID':<10} {'DERROTAS':<10} {'VICTORIAS':<10} {'% DERROTAS':<12}")
         print("-" * 70)
         
-        for jugador, derrotas, victorias, porcentaje in jugadores_derrotas:
-            print(f"{jugador.nombre[:24]:<25} {jugador.id:<10} {derrotas:<10} {victorias:<10} {porcentaje:<11.1f}%")
+        for nombre, id, derrotas, victorias, porcentaje in jugadores_derrotas:
+            print(f"{nombre[:24]:<25} {id:<10} {derrotas:<10} {victorias:<10} {porcentaje:<11.1f}%")
         
         # Estadísticas adicionales
         print(f"\n💸 ESTADÍSTICAS DE DERROTAS:")
-        total_derrotas = sum(derrotas for _, derrotas, _, _ in jugadores_derrotas)
-        total_victorias = sum(victorias for _, _, victorias, _ in jugadores_derrotas)
+        total_derrotas = sum(derrotas for _, _, derrotas, _, _ in jugadores_derrotas)
+        total_victorias = sum(victorias for _, _, _, victorias, _ in jugadores_derrotas)
         
         print(f"📊 Total de derrotas en el casino: {total_derrotas}")
         print(f"🏆 Total de victorias en el casino: {total_victorias}")
         
         if jugadores_derrotas:
             peor_jugador = jugadores_derrotas[0]
-            print(f"💔 Jugador con más derrotas: {peor_jugador[0].nombre} ({peor_jugador[1]} derrotas)")
+            print(f"💔 Jugador con más derrotas: {peor_jugador[0]} ({peor_jugador[2]} derrotas)")
         
         print("=" * 60)
     
@@ -161,42 +155,26 @@ class GeneradorReportes:
         print("📊 REPORTE 5: JUEGOS CON MAYOR PARTICIPACIÓN")
         print("=" * 60)
         
-        if not self.jugadores:
+        cantidad, _ = self.repositorio.resumen_saldos()
+        if not cantidad:
             print("❌ No hay jugadores registrados.")
             return
         
-        # Contar participaciones por juego
-        blackjack_partidas = 0
-        tragamonedas_jugadas = 0
-        
-        # Análisis detallado por jugador
-        jugadores_blackjack = set()
-        jugadores_tragamonedas = set()
-        
-        for jugador in self.jugadores:
-            blackjack_jugador = 0
-            tragamonedas_jugador = 0
-            
-            for actividad in jugador.historial:
-                if "Blackjack" in actividad:
-                    blackjack_partidas += 1
-                    blackjack_jugador += 1
-                    jugadores_blackjack.add(jugador.id)
-                elif any(simbolo in actividad for simbolo in ["🍒", "🍋", "7️⃣", "🔔", "BAR"]):
-                    tragamonedas_jugadas += 1
-                    tragamonedas_jugador += 1
-                    jugadores_tragamonedas.add(jugador.id)
+        # Jugadas y jugadores distintos por juego
+        participacion = self.repositorio.participacion_juegos()
+        blackjack_partidas, jugadores_blackjack = participacion.get(BLACKJACK, (0, 0))
+        tragamonedas_jugadas, jugadores_tragamonedas = participacion.get(TRAGAMONEDAS, (0, 0))
         
         print("🎮 ESTADÍSTICAS DE PARTICIPACIÓN:")
         print(f"🃏 Blackjack:")
         print(f"   • Partidas totales: {blackjack_partidas}")
-        print(f"   • Jugadores únicos: {len(jugadores_blackjack)}")
-        print(f"   • Promedio partidas/jugador: {blackjack_partidas/len(jugadores_blackjack) if jugadores_blackjack else 0:.1f}")
+        print(f"   • Jugadores únicos: {jugadores_blackjack}")
+        print(f"   • Promedio partidas/jugador: {blackjack_partidas/jugadores_blackjack if jugadores_blackjack else 0:.1f}")
         
         print(f"\n🎰 Tragamonedas:")
         print(f"   • Jugadas totales: {tragamonedas_jugadas}")
-        print(f"   • Jugadores únicos: {len(jugadores_tragamonedas)}")
-        print(f"   • Promedio jugadas/jugador: {tragamonedas_jugadas/len(jugadores_tragamonedas) if jugadores_tragamonedas else 0:.1f}")
+        print(f"   • Jugadores únicos: {jugadores_tragamonedas}")
+        print(f"   • Promedio jugadas/jugador: {tragamonedas_jugadas/jugadores_tragamonedas if jugadores_tragamonedas else 0:.1f}")
         
         # Determinar juego más popular
         total_actividades = blackjack_partidas + tragamonedas_jugadas
@@ -215,6 +193,7 @@ class GeneradorReportes:
     
 def menu_reportes():
     """Menú principal del sistema de reportes"""
+    vaciar_pendientes()  # los reportes leen del almacenamiento: primero guardar las jugadas pendientes
     generador = GeneradorReportes()
     
     while True:
@@ -6,7 +6,9 @@ def menu_jugadores():
     print("3. Buscar jugador")  
     print("4. Modificar jugador")
     print("5. Eliminar jugador")
-    print("6. Salir")
+    print("6. Importar jugadores (CSV/JSONL)")
+    print("7. Exportar jugadores (CSV/JSONL)")
+    print("8. Salir")
 
 def menu_principal():
     print("\n=== 🎰CASINO TECNICAS DE PROGRAMACION🎰 ===")